@@ -0,0 +1,127 @@
+"""
+Load benchmark comparing the WSGI and the ASGI deployment modes.
+
+Requests to slow switches (--slow-ms per request) and to fast switches
+(--fast-ms per request) are sent concurrently, the slow ones first. In WSGI
+mode they are served by a fixed number of worker threads, as by a threaded WSGI
+server. In ASGI mode they are served by the event loop, with the views
+offloaded to the managed view pool by orca_backend.async_views.async_view. The
+switch latency is simulated with a sleep, so that no device is needed.
+
+Reports the throughput and the latency of the fast requests, which shows if
+slow switches starve unrelated requests.
+
+Usage:
+    python -m benchmarks.bench_asgi [--slow 32] [--fast 256] [--slow-ms 2000]
+        [--fast-ms 10] [--wsgi-threads 16] [--pool-size 64]
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import setup_django
+
+setup_django()
+
+from django.http import JsonResponse  # noqa: E402
+from django.test import AsyncClient, Client, override_settings  # noqa: E402
+from django.urls import clear_url_caches, path  # noqa: E402
+
+from orca_backend.async_views import async_urlpatterns  # noqa: E402
+
+LATENCY = {"slow": 2.0, "fast": 0.01}
+
+
+def switch_view(request, speed):
+    time.sleep(LATENCY[speed])
+    return JsonResponse({"speed": speed})
+
+
+def _urlpatterns():
+    return [path("<str:speed>", switch_view)]
+
+
+urlpatterns = _urlpatterns()
+
+MIDDLEWARE = [
+    "django.middleware.common.CommonMiddleware",
+    "state_manager.middleware.BlockPutMiddleware",
+    "network.middleware.CacheInvalidationMiddleware",
+]
+
+
+def run_wsgi(paths, threads: int):
+    local = threading.local()
+
+    def _get(url):
+        if not hasattr(local, "client"):
+            local.client = Client()
+        start = time.perf_counter()
+        local.client.get(url)
+        return url, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(_get, paths))
+
+
+async def run_asgi(paths):
+    client = AsyncClient()
+
+    async def _get(url):
+        start = time.perf_counter()
+        await client.get(url)
+        return url, time.perf_counter() - start
+
+    return await asyncio.gather(*(_get(url) for url in paths))
+
+
+def report(mode: str, results, elapsed: float):
+    fast = sorted(t * 1000 for url, t in results if url == "/fast")
+    p95 = fast[int(len(fast) * 0.95) - 1] if fast else 0
+    print(
+        f"{mode:>5} {elapsed:>8.2f} {len(results) / elapsed:>8.1f} "
+        f"{statistics.median(fast) if fast else 0:>12.1f} {p95:>12.1f}"
+    )
+
+
+def run(args):
+    global urlpatterns
+    LATENCY["slow"] = args.slow_ms / 1000
+    LATENCY["fast"] = args.fast_ms / 1000
+    paths = ["/slow"] * args.slow + ["/fast"] * args.fast
+    print(
+        f"{args.slow} requests of {args.slow_ms} ms and {args.fast} of {args.fast_ms} ms, "
+        f"{args.wsgi_threads} WSGI threads, ASGI view pool of {args.pool_size}"
+    )
+    print(f"{'mode':>5} {'total s':>8} {'req/s':>8} {'fast p50 ms':>12} {'fast p95 ms':>12}")
+    with override_settings(
+        ROOT_URLCONF=__name__,
+        MIDDLEWARE=MIDDLEWARE,
+        ALLOWED_HOSTS=["*"],
+        ORCA_ASYNC_VIEW_MAX_WORKERS=args.pool_size,
+    ):
+        urlpatterns = _urlpatterns()
+        clear_url_caches()
+        start = time.perf_counter()
+        results = run_wsgi(paths, args.wsgi_threads)
+        report("WSGI", results, time.perf_counter() - start)
+
+        urlpatterns = async_urlpatterns(_urlpatterns())
+        clear_url_caches()
+        start = time.perf_counter()
+        results = asyncio.run(run_asgi(paths))
+        report("ASGI", results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slow", type=int, default=32)
+    parser.add_argument("--fast", type=int, default=256)
+    parser.add_argument("--slow-ms", type=float, default=2000)
+    parser.add_argument("--fast-ms", type=float, default=10)
+    parser.add_argument("--wsgi-threads", type=int, default=16)
+    parser.add_argument("--pool-size", type=int, default=64)
+    run(parser.parse_args())
@@ -0,0 +1,93 @@
+"""
+Benchmark for provisioning BGP neighbors with their address families.
+
+Compares the per-item path, one nbrs request and one nbrs_af request per
+neighbor as sent by the UI, with one nbrs_bulk request. The gNMI calls and the
+request log writes are simulated with a fixed latency, so that the benchmark
+runs without a device and without a database.
+
+Usage:
+    python -m benchmarks.bench_bgp_bulk [--devices 4] [--neighbors 200]
+        [--gnmi-ms 5] [--log-ms 2]
+"""
+import argparse
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from benchmarks.common import RoundTripCounter, setup_django
+
+setup_django()
+
+from rest_framework.test import APIRequestFactory, force_authenticate  # noqa: E402
+
+from log_manager import decorators  # noqa: E402
+from network import bgp  # noqa: E402
+
+USER = SimpleNamespace(is_authenticated=True, is_active=True)
+
+
+def _neighbors(devices: int, count: int):
+    return [
+        {
+            "mgt_ip": f"10.10.10.{d + 1}",
+            "neighbor_ip": f"10.1.{i // 256}.{i % 256}",
+            "remote_asn": 65000 + i,
+            "vrf_name": "default",
+        }
+        for d in range(devices)
+        for i in range(count)
+    ]
+
+
+def _put(view, path, body):
+    request = APIRequestFactory().put(path, body, format="json")
+    force_authenticate(request, user=USER)
+    return view(request)
+
+
+def per_item(neighbors):
+    for nbr in neighbors:
+        _put(bgp.bgp_nbr_config, "/nbrs", nbr)
+        _put(bgp.bgp_neighbor_af, "/nbrs_af", {**nbr, "afi_safi": "ipv4_unicast"})
+
+
+def bulk(neighbors):
+    response = _put(
+        bgp.bgp_nbr_bulk_config, "/nbrs_bulk", [{**nbr, "afi_safi": ["ipv4_unicast"]} for nbr in neighbors]
+    )
+    assert response.status_code == 200, response.data
+
+
+def run(args):
+    neighbors = _neighbors(args.devices, args.neighbors)
+    print(
+        f"{args.devices} devices x {args.neighbors} neighbors, gNMI {args.gnmi_ms} ms, "
+        f"log write {args.log_ms} ms"
+    )
+    print(f"{'path':>9} {'gNMI calls':>11} {'log rows':>9} {'seconds':>8}")
+    for name, func in (("per-item", per_item), ("bulk", bulk)):
+        config_nbr = RoundTripCounter(lambda **_: None, args.gnmi_ms / 1000)
+        config_af = RoundTripCounter(lambda **_: None, args.gnmi_ms / 1000)
+        log_write = RoundTripCounter(lambda: None, args.log_ms / 1000)
+        serializer = mock.Mock()
+        serializer.return_value.is_valid.return_value = True
+        serializer.return_value.save.side_effect = log_write
+        with mock.patch.object(bgp, "config_bgp_neighbors", config_nbr), mock.patch.object(
+            bgp, "config_bgp_neighbor_af", config_af
+        ), mock.patch.object(decorators, "LogSerializer", serializer):
+            start = time.perf_counter()
+            func(neighbors)
+            elapsed = time.perf_counter() - start
+        print(
+            f"{name:>9} {config_nbr.calls + config_af.calls:>11} {log_write.calls:>9} {elapsed:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--devices", type=int, default=4)
+    parser.add_argument("--neighbors", type=int, default=200)
+    parser.add_argument("--gnmi-ms", type=float, default=5)
+    parser.add_argument("--log-ms", type=float, default=2)
+    run(parser.parse_args())
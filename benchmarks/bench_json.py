@@ -0,0 +1,106 @@
+"""
+Benchmark for JSON rendering and parsing.
+
+Compares the DRF JSONRenderer and JSONParser with orca_backend.fast_json on a
+payload of 500 interfaces, and the PUT body handling before and after the body
+is shared between the middlewares and the view (parsed twice vs once).
+
+Usage:
+    python -m benchmarks.bench_json [--interfaces 500] [--repeat 20]
+"""
+import argparse
+import io
+import json
+
+from benchmarks.common import setup_django, timed
+
+setup_django()
+
+from django.test import RequestFactory  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from orca_backend.fast_json import (  # noqa: E402
+    FastJSONParser,
+    FastJSONRenderer,
+    orjson,
+    parse_request_body,
+)
+
+
+def _interfaces(count: int):
+    return [
+        {
+            "name": f"Ethernet{i}",
+            "alias": f"Eth1/{i // 4 + 1}/{i % 4 + 1}",
+            "mgt_ip": "10.10.10.10",
+            "enabled": i % 3 != 0,
+            "mtu": 9100,
+            "fec": "FEC_RS",
+            "speed": "SPEED_100GB",
+            "oper_sts": "UP" if i % 5 else "DOWN",
+            "admin_sts": "UP",
+            "autoneg": "off",
+            "link_training": "off",
+            "description": f"uplink to spine {i % 8}",
+            "last_chng": 1716000000000000000 + i,
+            "mac_addr": f"0c:29:ef:cf:{i // 256:02x}:{i % 256:02x}",
+            "lanes": ",".join(str(i * 4 + lane) for lane in range(4)),
+            "valid_speeds": "100000,40000",
+            "ipv4_addr": None,
+        }
+        for i in range(count)
+    ]
+
+
+def run(count: int, repeat: int):
+    data = _interfaces(count)
+    body = json.dumps(data).encode()
+    factory = RequestFactory()
+
+    def parse_twice():
+        request = factory.put("/interfaces", body, content_type="application/json")
+        json.loads(request.body)  # BlockPutMiddleware
+        json.loads(request.body)  # CacheInvalidationMiddleware
+        JSONParser().parse(io.BytesIO(request.body))  # view
+
+    def parse_once():
+        request = factory.put("/interfaces", body, content_type="application/json")
+        parse_request_body(request)
+        parse_request_body(request)
+        FastJSONParser().parse(
+            io.BytesIO(request.body), parser_context={"request": _DRFRequest(request)}
+        )
+
+    rows = [
+        ("render", lambda: JSONRenderer().render(data), lambda: FastJSONRenderer().render(data)),
+        (
+            "parse",
+            lambda: JSONParser().parse(io.BytesIO(body)),
+            lambda: FastJSONParser().parse(io.BytesIO(body)),
+        ),
+        ("PUT body", parse_twice, parse_once),
+    ]
+    print(f"{count} interfaces, {len(body)} bytes, orjson {'installed' if orjson else 'not installed'}")
+    print(f"{'':>10} {'DRF ms':>8} {'fast ms':>8} {'speedup':>8}")
+    for name, baseline, fast in rows:
+        baseline_ms = timed(baseline, repeat)
+        fast_ms = timed(fast, repeat)
+        print(f"{name:>10} {baseline_ms:>8.2f} {fast_ms:>8.2f} {baseline_ms / fast_ms:>7.1f}x")
+
+
+class _DRFRequest:
+    """
+    Stand-in for the DRF Request passed in the parser context.
+    """
+
+    def __init__(self, request):
+        self._request = request
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--interfaces", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.interfaces, args.repeat)
@@ -0,0 +1,75 @@
+"""
+Benchmark for the port channel list GET.
+
+Compares the previous per port channel members lookup (N+1 graph DB round trips)
+with the bulk members lookup used by network.port_chnl.get_port_chnl_list.
+Graph DB round trips are simulated with a fixed latency so that the benchmark
+can run without a device or a Neo4j instance.
+
+Usage:
+    python -m benchmarks.bench_port_chnl_members [--latency-ms 2]
+"""
+import argparse
+from unittest import mock
+
+from benchmarks.common import RoundTripCounter, setup_django, timed
+
+setup_django()
+
+from network import port_chnl  # noqa: E402
+
+DEVICE_IP = "10.10.10.10"
+
+
+def _port_chnls(count: int):
+    return [
+        {"lag_name": f"PortChannel{i}", "mtu": 9100, "admin_sts": "up"}
+        for i in range(count)
+    ]
+
+
+def _members(lag_name: str):
+    idx = int(lag_name.replace("PortChannel", ""))
+    return [{"name": f"Ethernet{idx * 2}"}, {"name": f"Ethernet{idx * 2 + 1}"}]
+
+
+def legacy_port_chnl_list(get_chnls, get_members):
+    data = get_chnls(DEVICE_IP, "")
+    for chnl in data:
+        chnl["members"] = [
+            intf["name"] for intf in get_members(DEVICE_IP, chnl["lag_name"])
+        ]
+    return data
+
+
+def run(lag_counts, latency: float):
+    print(f"{'LAGs':>6} {'legacy trips':>13} {'legacy ms':>10} {'bulk trips':>11} {'bulk ms':>8}")
+    for count in lag_counts:
+        get_chnls = RoundTripCounter(lambda *_: _port_chnls(count), latency)
+        get_members = RoundTripCounter(lambda _, name: _members(name), latency)
+        legacy_ms = timed(lambda: legacy_port_chnl_list(get_chnls, get_members))
+        legacy_trips = (get_chnls.calls + get_members.calls) // 5
+
+        get_chnls = RoundTripCounter(lambda *_: _port_chnls(count), latency)
+        get_map = RoundTripCounter(
+            lambda *_: {
+                f"PortChannel{i}": [m["name"] for m in _members(f"PortChannel{i}")]
+                for i in range(count)
+            },
+            latency,
+        )
+        with mock.patch.object(port_chnl, "get_port_chnl", get_chnls), mock.patch.object(
+            port_chnl, "get_port_chnl_members_map", get_map
+        ):
+            # __wrapped__ bypasses the response cache, every run hits the graph DB.
+            bulk_ms = timed(lambda: port_chnl.get_port_chnl_list.__wrapped__(DEVICE_IP, ""))
+        bulk_trips = (get_chnls.calls + get_map.calls) // 5
+
+        print(f"{count:>6} {legacy_trips:>13} {legacy_ms:>10.1f} {bulk_trips:>11} {bulk_ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    run([1, 8, 16, 32, 48, 64, 128], args.latency_ms / 1000)
@@ -0,0 +1,45 @@
+""" Shared helpers for the benchmark scripts. """
+import os
+import statistics
+import time
+
+import django
+
+
+def setup_django():
+    """
+    Configures Django so that views and models can be imported by a benchmark script.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orca_backend.settings")
+    django.setup()
+
+
+class RoundTripCounter:
+    """
+    Wraps a function to simulate a graph DB or gNMI round trip.
+
+    Every call sleeps for `latency` seconds and is counted, so that a benchmark
+    can report both the number of round trips and the wall clock time.
+    """
+
+    def __init__(self, func, latency: float):
+        self.func = func
+        self.latency = latency
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        return self.func(*args, **kwargs)
+
+
+def timed(func, repeat: int = 5):
+    """
+    Runs func `repeat` times and returns the median wall clock time in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
@@ -1,3 +1,5 @@
+import json
+
 from log_manager.serializers import LogSerializer
 from log_manager.test.test_common import TestCommon
 
@@ -56,3 +58,30 @@ class TestGetLogs(TestCommon):
 
 
 
+
+    def test_get_logs_ndjson(self):
+        for i in range(3):
+            serializer = LogSerializer(
+                data={
+                    "timestamp": f"2024-01-0{i + 1} 00:00:00",
+                    "request_json": {"key": "value"},
+                    "processing_time": 0,
+                    "status": "success",
+                    "response": {"key": "value"},
+                    "http_method": "POST",
+                    "status_code": 200
+                }
+            )
+            if serializer.is_valid():
+                serializer.save()
+        response = self.client.get(
+            "/logs/all/1?size=1000",
+            HTTP_AUTHORIZATION=self.tkn,
+            HTTP_ACCEPT="application/x-ndjson"
+        )
+        assert response.status_code == 200
+        assert response.streaming
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        timestamps = [i["timestamp"] for i in rows]
+        assert timestamps == sorted(timestamps, reverse=True)
+        assert "2024-01-03 00:00:00" in timestamps
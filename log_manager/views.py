@@ -1,23 +1,26 @@
 import ast
 import datetime
+import heapq
 import json
 
 from celery import states
 from django.core.paginator import Paginator, EmptyPage
 from django_celery_results.models import TaskResult
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 from log_manager.logger import get_backend_logger
 from log_manager.models import Logs
-from orca_backend.celery import cancel_task
+from orca_backend.celery import INTERNAL_TASKS, cancel_task
+from orca_backend.streaming import STREAMING_RENDERERS, ndjson_response, wants_ndjson
 
 _logger = get_backend_logger()
 
 
 @api_view(['get'])
+@renderer_classes(STREAMING_RENDERERS)
 def get_logs(request: Request, **kwargs):
     """
     function to get logs save logs
@@ -27,6 +30,8 @@ def get_logs(request: Request, **kwargs):
 
     Returns:
     - If successful, returns a JSON response with logs list and 200 ok status.
+      If requested with "Accept: application/x-ndjson", streams one log per line,
+      merged with the celery tasks by timestamp.
     - If fails returns a JSON response with 500 status.
     """
     try:
@@ -35,6 +40,16 @@ def get_logs(request: Request, **kwargs):
         items = Logs.objects.all().order_by("-timestamp")
         paginator = Paginator(items, query_params.get("size", 10))  # sizeof return list
         logs_result = paginator.page(kwargs["page"])  # page no
+        if wants_ndjson(request):
+            tasks = TaskResult.objects.exclude(task_name__in=INTERNAL_TASKS).order_by("-date_created")
+            return ndjson_response(
+                heapq.merge(
+                    logs_result.object_list.values().iterator(),
+                    iter_celery_tasks_data(tasks.iterator()),
+                    key=lambda x: x["timestamp"],
+                    reverse=True,
+                )
+            )
         final_result.extend(logs_result.object_list.values())  # add logs
         final_result.extend(get_celery_tasks_data())  # add celery task data
 
@@ -95,28 +110,35 @@ def get_celery_tasks_data() -> list:
     Returns:
         - list: celery tasks data
     """
-    task_results = TaskResult.objects.all()
-    result_data = []
+    return list(iter_celery_tasks_data(TaskResult.objects.exclude(task_name__in=INTERNAL_TASKS)))
+
+
+def iter_celery_tasks_data(task_results):
+    """
+    function to convert celery task results to log entries one at a time
+
+    Parameters:
+        - task_results: iterable of TaskResult objects
+    Yields:
+        - dict: celery task data
+    """
     for result in task_results:
         try:
             task_kwargs = ast.literal_eval(result.task_kwargs.strip('\"')) if result.task_kwargs else {}
         except ValueError:
             task_kwargs = {"result": result.task_kwargs}
         http_path = task_kwargs.pop("http_path", "")
-        result_data.append(
-            {
-                "status": result.status,
-                "timestamp": result.date_created.strftime("%Y-%m-%d %H:%M:%S"),
-                "status_code": 200,
-                "http_method": "PUT",
-                "processing_time": (result.date_done - result.date_created).total_seconds(),
-                "response": json.loads(result.result),
-                "request_json": task_kwargs,
-                "http_path": http_path,
-                "task_id": result.task_id,
-            }
-        )
-    return result_data
+        yield {
+            "status": result.status,
+            "timestamp": result.date_created.strftime("%Y-%m-%d %H:%M:%S"),
+            "status_code": 200,
+            "http_method": "PUT",
+            "processing_time": (result.date_done - result.date_created).total_seconds(),
+            "response": json.loads(result.result),
+            "request_json": task_kwargs,
+            "http_path": http_path,
+            "task_id": result.task_id,
+        }
 
 
 def delete_celery_tasks_data(task_ids: list = None) -> None:
@@ -7,9 +7,7 @@ class NetworkConfig(AppConfig):
     name = "network"
 
     def ready(self):
-        if 'runserver' in sys.argv:
-            from network.models import ReDiscoveryConfig
-            from network.scheduler import add_scheduler
-            objs = ReDiscoveryConfig.objects.all()
-            for obj in objs:
-                add_scheduler(obj.device_ip, obj.interval)
+        from django.conf import settings
+        if 'runserver' in sys.argv or settings.ORCA_REDISCOVERY["AUTOSTART"]:
+            from network.scheduler import start_scheduler
+            start_scheduler()
@@ -1,4 +1,7 @@
 """ BGP API views. """
+import ipaddress
+import time
+
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
 from rest_framework import status
@@ -22,6 +25,11 @@ from orca_nw_lib.bgp import (
 
 from log_manager.decorators import log_request
 from log_manager.logger import get_backend_logger
+from network.bulk_db import get_bgp_neighbor_details_map
+from network.cache import cached_read
+from network.etag import conditional_get
+from network.executor import run_per_device
+from network.fleet import fleet_response, is_fleet_request
 from network.util import (
     add_msg_to_list,
     get_failure_msg,
@@ -30,9 +38,48 @@ from network.util import (
 
 _logger = get_backend_logger()
 
+get_bgp_global_cached = cached_read("bgp")(get_bgp_global)
+
+# Neighbors of one device configured per batch of the bulk neighbor endpoint.
+BGP_NBR_BATCH_SIZE = 50
+
+
+def get_bgp_neighbor_details(device_ip: str, neighbor_ip: str = None):
+    """
+    Returns the BGP neighbors of a device, each joined with its address
+    families, local and remote BGP instance and subinterface.
+
+    The details of all neighbors are fetched in one graph DB query, instead of
+    the nbrs_af, nbrs_local_bgp, nbrs_remote_bgp and nbrs_subinterface reads per
+    neighbor. The result is not kept in the response cache, as the remote BGP
+    belongs to other devices, whose changes do not invalidate this device.
+
+    Args:
+        device_ip (str): The IP address of the device.
+        neighbor_ip (str, optional): The IP address of the neighbor.
+
+    Returns:
+        list: The neighbors with "afs", "local_bgp", "remote_bgp" and
+        "subinterface" added. The remote BGP has the "mgt_ip" of its device.
+    """
+    data = get_bgp_neighbors(device_ip=device_ip, neighbor_ip=neighbor_ip or None)
+    if not data:
+        return []
+    neighbors = data if isinstance(data, list) else [data]
+    details = get_bgp_neighbor_details_map(device_ip, {nbr.get("neighbor_ip") for nbr in neighbors})
+    for nbr in neighbors:
+        detail = details.get((nbr.get("vrf_name"), nbr.get("neighbor_ip")), {})
+        remote_bgp = detail.get("remote_bgp")
+        nbr["afs"] = detail.get("afs", [])
+        nbr["local_bgp"] = detail.get("local_bgp")
+        nbr["remote_bgp"] = {"mgt_ip": remote_bgp[0], **remote_bgp[1]} if remote_bgp else None
+        nbr["subinterface"] = next(iter(detail.get("subinterfaces", [])), None)
+    return neighbors
+
 
 @api_view(["GET", "PUT", "DELETE"])
 @log_request
+@conditional_get
 def device_bgp_global(request):
     """
     A view function that handles GET, PUT, and DELETE requests for device BGP global settings.
@@ -64,6 +111,11 @@ def device_bgp_global(request):
     result = []
     http_status = True
     if request.method == "GET":
+        vrf_name = request.GET.get("vrf_name", None)
+        if is_fleet_request(request):
+            return fleet_response(
+                request, lambda ip: get_bgp_global_cached(ip, vrf_name)
+            )
         device_ip = request.GET.get("mgt_ip", "")
         if not device_ip:
             _logger.error("Required field device mgt_ip not found.")
@@ -71,7 +123,7 @@ def device_bgp_global(request):
                 {"result": "Required field device mgt_ip not found."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        data = get_bgp_global(device_ip, request.GET.get("vrf_name", None))
+        data = get_bgp_global_cached(device_ip, vrf_name)
         return (
             Response(data, status.HTTP_200_OK)
             if data
@@ -149,6 +201,7 @@ def device_bgp_global(request):
 
 @api_view(["GET", "PUT", "DELETE"])
 @log_request
+@conditional_get
 def bgp_nbr_config(request):
     """
     A view function that handles GET, PUT, and DELETE requests for BGP neighbor configuration.
@@ -220,24 +273,7 @@ def bgp_nbr_config(request):
                     {"result": "Required field remote_vrf not found."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-
-            try:
-                config_bgp_neighbors(
-                    device_ip=device_ip,
-                    remote_asn=remote_asn,
-                    neighbor_ip=neighbor_ip,
-                    vrf_name=vrf_name,
-                    local_asn=req_data.get("local_asn", None),
-                    admin_status=req_data.get("admin_status", None),
-                )
-                add_msg_to_list(result, get_success_msg(request))
-                _logger.info(f"Configured BGP neighbor on {device_ip}.")
-            except Exception as err:
-                _logger.error("Failed to configure BGP neighbor on %s: %s", device_ip, err)
-                import traceback
-                print(traceback.format_exc())
-                add_msg_to_list(result, get_failure_msg(err, request))
-                http_status = http_status and False
+        result, http_status = run_per_device(request, req_data_list, _config_bgp_neighbor)
     elif request.method == "DELETE":
         req_data_list = (
             request.data if isinstance(request.data, list) else [request.data]
@@ -257,18 +293,7 @@ def bgp_nbr_config(request):
                     {"result": "Required field neighbor_ip not found."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            try:
-                delete_bgp_neighbor(
-                    device_ip=device_ip,
-                    neighbor_ip=neighbor_ip,
-                    vrf_name=req_data.get("vrf_name", ""),
-                )
-                add_msg_to_list(result, get_success_msg(request))
-                _logger.info(f"Deleted BGP neighbor on {device_ip}.")
-            except Exception as err:
-                _logger.error("Failed to delete BGP neighbor on %s: %s", device_ip, err)
-                add_msg_to_list(result, get_failure_msg(err, request))
-                http_status = http_status and False
+        result, http_status = run_per_device(request, req_data_list, _delete_bgp_neighbor)
 
     return Response(
         {"result": result},
@@ -278,8 +303,291 @@ def bgp_nbr_config(request):
     )
 
 
+def _config_bgp_neighbor(request, req_data, result) -> bool:
+    """
+    Configures the BGP neighbor of one validated PUT request item.
+
+    Args:
+        request (Request): The request object.
+        req_data (dict): The request item.
+        result (list): The list the messages of the item are added to.
+
+    Returns:
+        bool: True if the neighbor was configured.
+    """
+    device_ip = req_data.get("mgt_ip")
+    try:
+        config_bgp_neighbors(
+            device_ip=device_ip,
+            remote_asn=req_data.get("remote_asn"),
+            neighbor_ip=req_data.get("neighbor_ip"),
+            vrf_name=req_data.get("vrf_name"),
+            local_asn=req_data.get("local_asn", None),
+            admin_status=req_data.get("admin_status", None),
+        )
+        add_msg_to_list(result, get_success_msg(request))
+        _logger.info(f"Configured BGP neighbor on {device_ip}.")
+        return True
+    except Exception as err:
+        _logger.error("Failed to configure BGP neighbor on %s: %s", device_ip, err)
+        add_msg_to_list(result, get_failure_msg(err, request))
+        return False
+
+
+def _delete_bgp_neighbor(request, req_data, result) -> bool:
+    """
+    Deletes the BGP neighbor of one validated DELETE request item.
+
+    Args:
+        request (Request): The request object.
+        req_data (dict): The request item.
+        result (list): The list the messages of the item are added to.
+
+    Returns:
+        bool: True if the neighbor was deleted.
+    """
+    device_ip = req_data.get("mgt_ip")
+    try:
+        delete_bgp_neighbor(
+            device_ip=device_ip,
+            neighbor_ip=req_data.get("neighbor_ip"),
+            vrf_name=req_data.get("vrf_name", ""),
+        )
+        add_msg_to_list(result, get_success_msg(request))
+        _logger.info(f"Deleted BGP neighbor on {device_ip}.")
+        return True
+    except Exception as err:
+        _logger.error("Failed to delete BGP neighbor on %s: %s", device_ip, err)
+        add_msg_to_list(result, get_failure_msg(err, request))
+        return False
+
+
+@api_view(["GET"])
+@log_request
+@conditional_get(versioned=False)
+def bgp_nbr_details(request):
+    """
+    A view function that returns all BGP neighbors of a device with their
+    address families, local and remote BGP instance and subinterface joined.
+
+    Parameters:
+    - request: The request object, with mgt_ip and optionally neighbor_ip.
+
+    Returns:
+    - A Response object with the list of neighbors, or an empty dictionary with
+      a status code of 204 (No Content) if the device has no neighbors.
+    """
+    neighbor_ip = request.GET.get("neighbor_ip", None)
+    if is_fleet_request(request):
+        return fleet_response(
+            request, lambda ip: get_bgp_neighbor_details(ip, neighbor_ip)
+        )
+    device_ip = request.GET.get("mgt_ip", "")
+    if not device_ip:
+        _logger.error("Required field device mgt_ip not found.")
+        return Response(
+            {"result": "Required field device mgt_ip not found."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    data = get_bgp_neighbor_details(device_ip, neighbor_ip)
+    return (
+        Response(data, status.HTTP_200_OK)
+        if data
+        else Response({}, status.HTTP_204_NO_CONTENT)
+    )
+
+
+def _get_nbr_afs(req_data) -> list:
+    """
+    Returns the address families of a bulk neighbor item as a list of
+    (afi_safi, admin_status). "afi_safi" is a name, or a list of names or of
+    dicts with afi_safi and admin_status.
+    """
+    afs = req_data.get("afi_safi") or []
+    afs = afs if isinstance(afs, list) else [afs]
+    return [
+        (af.get("afi_safi"), af.get("admin_status", True)) if isinstance(af, dict) else (af, True)
+        for af in afs
+    ]
+
+
+def validate_bgp_neighbors(req_data_list: list) -> list:
+    """
+    Validates the items of a bulk neighbor request.
+
+    Args:
+        req_data_list (list): The neighbors, each with mgt_ip, neighbor_ip,
+            remote_asn and vrf_name, and optionally local_asn, admin_status and
+            afi_safi.
+
+    Returns:
+        list: The error messages, empty if all neighbors are valid.
+    """
+    errors = []
+    seen = set()
+    for index, req_data in enumerate(req_data_list):
+        if not isinstance(req_data, dict):
+            errors.append(f"Item {index} is not an object.")
+            continue
+        missing = [
+            field for field in ("mgt_ip", "neighbor_ip", "remote_asn", "vrf_name")
+            if not req_data.get(field)
+        ]
+        if missing:
+            errors.append(f"Required fields {', '.join(missing)} not found in item {index}.")
+            continue
+        neighbor_ip = req_data["neighbor_ip"]
+        try:
+            ipaddress.ip_address(neighbor_ip)
+        except ValueError:
+            errors.append(f"Invalid neighbor_ip {neighbor_ip} in item {index}.")
+        for field in ("remote_asn", "local_asn"):
+            if field in req_data and req_data[field] is not None:
+                try:
+                    if int(req_data[field]) <= 0:
+                        raise ValueError
+                except (TypeError, ValueError):
+                    errors.append(f"Invalid {field} for neighbor {neighbor_ip} in item {index}.")
+        if not all(afi_safi for afi_safi, _ in _get_nbr_afs(req_data)):
+            errors.append(f"Invalid afi_safi for neighbor {neighbor_ip} in item {index}.")
+        key = (req_data["mgt_ip"], req_data["vrf_name"], neighbor_ip)
+        if key in seen:
+            errors.append(f"Duplicate neighbor {neighbor_ip} in VRF {key[1]} on {key[0]}.")
+        seen.add(key)
+    return errors
+
+
+def make_bgp_neighbor_batches(req_data_list: list, batch_size: int = BGP_NBR_BATCH_SIZE) -> list:
+    """
+    Splits the neighbors of every device into batches, in request order.
+
+    Returns:
+        list: The batches, each a dict with mgt_ip and the list of neighbors.
+    """
+    per_device = {}
+    for req_data in req_data_list:
+        per_device.setdefault(req_data["mgt_ip"], []).append(req_data)
+    return [
+        {"mgt_ip": device_ip, "neighbors": neighbors[start:start + batch_size]}
+        for device_ip, neighbors in per_device.items()
+        for start in range(0, len(neighbors), batch_size)
+    ]
+
+
+@api_view(["PUT"])
+@log_request
+def bgp_nbr_bulk_config(request):
+    """
+    A view function that configures many BGP neighbors with their address
+    families in one request.
+
+    All neighbors are validated before any is configured. The neighbors of a
+    device are configured in batches, devices in parallel. Every neighbor is
+    configured before its address families, and the address families of a
+    failed neighbor are skipped.
+
+    Parameters:
+    - request: The request object, with a list of neighbors in the format of the
+      bgp_nbr_config PUT request, each with an optional afi_safi.
+
+    Returns:
+    - A Response object with one result per batch and a summary of the
+      configured and failed neighbors, or 400 with the list of errors if any
+      neighbor is invalid.
+    """
+    req_data_list = request.data if isinstance(request.data, list) else [request.data]
+    errors = validate_bgp_neighbors(req_data_list)
+    if errors:
+        _logger.error("Invalid BGP neighbors: %s", errors)
+        return Response(
+            {"status": "Invalid BGP neighbors.", "errors": errors},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    start = time.monotonic()
+    batches = make_bgp_neighbor_batches(req_data_list)
+    result, http_status = run_per_device(request, batches, _config_bgp_neighbor_batch)
+    # add_msg_to_list separates the messages with "\n".
+    msgs = [msg for msg in result if msg != "\n"]
+    summary = {
+        "devices": len({batch["mgt_ip"] for batch in batches}),
+        "batches": len(batches),
+        "neighbors": sum(msg.get("neighbors", 0) for msg in msgs),
+        "address_families": sum(msg.get("address_families", 0) for msg in msgs),
+        "failed": [failure for msg in msgs for failure in msg.get("failed", [])],
+        "elapsed_ms": round((time.monotonic() - start) * 1000, 1),
+    }
+    _logger.info(
+        "Configured %s of %s BGP neighbors in %s batches.",
+        summary["neighbors"], len(req_data_list), len(batches),
+    )
+    return Response(
+        {"result": result, "summary": summary},
+        status=status.HTTP_200_OK
+        if http_status
+        else status.HTTP_500_INTERNAL_SERVER_ERROR,
+    )
+
+
+def _config_bgp_neighbor_batch(request, batch, result) -> bool:
+    """
+    Configures a batch of neighbors of one device with their address families.
+
+    Args:
+        request (Request): The request object.
+        batch (dict): The batch, with mgt_ip and the list of neighbors.
+        result (list): The list the message of the batch is added to.
+
+    Returns:
+        bool: True if all neighbors and address families were configured.
+    """
+    device_ip = batch["mgt_ip"]
+    neighbors = 0
+    afs = 0
+    failed = []
+    for req_data in batch["neighbors"]:
+        neighbor_ip = req_data["neighbor_ip"]
+        try:
+            config_bgp_neighbors(
+                device_ip=device_ip,
+                remote_asn=req_data.get("remote_asn"),
+                neighbor_ip=neighbor_ip,
+                vrf_name=req_data.get("vrf_name"),
+                local_asn=req_data.get("local_asn", None),
+                admin_status=req_data.get("admin_status", None),
+            )
+            neighbors += 1
+        except Exception as err:
+            failed.append(
+                {"neighbor_ip": neighbor_ip, **get_failure_msg(err, request)}
+            )
+            continue
+        for afi_safi, admin_status in _get_nbr_afs(req_data):
+            try:
+                config_bgp_neighbor_af(
+                    device_ip=device_ip,
+                    afi_safi=afi_safi,
+                    vrf=req_data.get("vrf_name"),
+                    neighbor_ip=neighbor_ip,
+                    admin_status=admin_status,
+                )
+                afs += 1
+            except Exception as err:
+                failed.append(
+                    {"neighbor_ip": neighbor_ip, "afi_safi": afi_safi, **get_failure_msg(err, request)}
+                )
+    msg = get_failure_msg(Exception(f"{len(failed)} failures"), request) if failed else get_success_msg(request)
+    msg.update(mgt_ip=device_ip, neighbors=neighbors, address_families=afs, failed=failed)
+    add_msg_to_list(result, msg)
+    if failed:
+        _logger.error("Failed to configure %s BGP neighbor items on %s.", len(failed), device_ip)
+    else:
+        _logger.info("Configured %s BGP neighbors on %s.", neighbors, device_ip)
+    return not failed
+
+
 @api_view(["GET", "PUT", "DELETE"])
 @log_request
+@conditional_get
 def bgp_af(request):
     """
     A view function that handles GET, PUT, and DELETE requests for BGP neighbor configuration.
@@ -391,6 +699,7 @@ def bgp_af(request):
 
 @api_view(["GET", "PUT", "DELETE"])
 @log_request
+@conditional_get
 def bgp_af_network(request):
     """
     A view function that handles GET, PUT, and DELETE requests for BGP neighbor configuration.
@@ -503,6 +812,7 @@ def bgp_af_network(request):
 
 @api_view(["GET", "PUT", "DELETE"])
 @log_request
+@conditional_get
 def bgp_af_aggregate_addr(request):
     """
     A view function that handles GET, PUT, and DELETE requests for BGP neighbor configuration.
@@ -614,6 +924,7 @@ def bgp_af_aggregate_addr(request):
 
 @api_view(["GET", "PUT", "DELETE"])
 @log_request
+@conditional_get
 def bgp_neighbor_af(request):
     """
     A view function that handles GET, PUT, and DELETE requests for BGP neighbor configuration.
@@ -731,6 +1042,7 @@ def bgp_neighbor_af(request):
 
 @api_view(["GET"])
 @log_request
+@conditional_get
 def bgp_neighbor_sub_interface(request):
     result = []
     http_status = True
@@ -769,6 +1081,7 @@ def bgp_neighbor_sub_interface(request):
 
 @api_view(["GET"])
 @log_request
+@conditional_get(versioned=False)
 def bgp_neighbor_remote_bgp(request):
     result = []
     http_status = True
@@ -808,6 +1121,7 @@ def bgp_neighbor_remote_bgp(request):
 
 @api_view(["GET"])
 @log_request
+@conditional_get
 def bgp_neighbor_local_bgp(request):
     result = []
     http_status = True
@@ -0,0 +1,137 @@
+""" Bulk graph DB reads used by the network list views. """
+from neomodel import db
+
+
+def get_port_chnl_members_map(device_ip: str, lag_name: str = None) -> dict:
+    """
+    Fetches all port channels of a device together with their member interfaces
+    in a single graph DB query.
+
+    Args:
+        device_ip (str): The IP address of the device.
+        lag_name (str, optional): Restrict the result to one port channel.
+
+    Returns:
+        dict: A dictionary with lag_name as key and the list of member interface names as value.
+    """
+    query = """
+        MATCH (:Device {mgt_ip: $device_ip})-->(chnl:PortChannel)
+        WHERE $lag_name IS NULL OR chnl.lag_name = $lag_name
+        OPTIONAL MATCH (chnl)-->(intf:Interface)
+        RETURN chnl.lag_name, collect(intf.name)
+    """
+    rows, _ = db.cypher_query(
+        query, {"device_ip": device_ip, "lag_name": lag_name or None}
+    )
+    return {name: members for name, members in rows}
+
+
+def get_vlan_members_map(device_ip: str, vlan_name: str = None) -> dict:
+    """
+    Fetches all VLANs of a device together with their member interfaces and
+    tagging modes in a single graph DB query.
+
+    Args:
+        device_ip (str): The IP address of the device.
+        vlan_name (str, optional): Restrict the result to one VLAN.
+
+    Returns:
+        dict: A dictionary with VLAN name as key and a dictionary of
+        member name to tagging mode string as value.
+    """
+    query = """
+        MATCH (:Device {mgt_ip: $device_ip})-->(vlan:Vlan)
+        WHERE $vlan_name IS NULL OR vlan.name = $vlan_name
+        OPTIONAL MATCH (vlan)-[mem]->(intf)
+        WHERE intf:Interface OR intf:PortChannel
+        RETURN vlan.name, collect(
+            CASE WHEN intf IS NULL THEN NULL
+            ELSE [coalesce(intf.name, intf.lag_name), mem.tagging_mode] END
+        )
+    """
+    rows, _ = db.cypher_query(
+        query, {"device_ip": device_ip, "vlan_name": vlan_name or None}
+    )
+    return {
+        name: {mem_if: str(mode) for mem_if, mode in members}
+        for name, members in rows
+    }
+
+
+def get_mclag_members_map(device_ip: str, domain_id=None) -> dict:
+    """
+    Fetches all MCLAG domains of a device together with their member port channels
+    in a single graph DB query. Members are related as MCLAG.intfs in
+    orca_nw_lib, (MCLAG)-[:MEM_IF]->(PortChannel); the peer link has its own
+    relationship and is not reported as a member.
+
+    Args:
+        device_ip (str): The IP address of the device.
+        domain_id (int or str, optional): Restrict the result to one MCLAG domain.
+
+    Returns:
+        dict: A dictionary with the domain_id (as string) as key and the list
+        of member port channel names as value.
+    """
+    query = """
+        MATCH (:Device {mgt_ip: $device_ip})-->(mclag:MCLAG)
+        WHERE $domain_id IS NULL OR toString(mclag.domain_id) = $domain_id
+        OPTIONAL MATCH (mclag)-[:MEM_IF]->(chnl:PortChannel)
+        RETURN toString(mclag.domain_id), collect(DISTINCT chnl.lag_name)
+    """
+    rows, _ = db.cypher_query(
+        query,
+        {
+            "device_ip": device_ip,
+            "domain_id": str(domain_id) if domain_id not in (None, "") else None,
+        },
+    )
+    return {dom_id: members for dom_id, members in rows}
+
+
+def get_bgp_neighbor_details_map(device_ip: str, neighbor_ips: list) -> dict:
+    """
+    Fetches the address families, the local and remote BGP instances and the
+    subinterface of all given BGP neighbors of a device in a single graph DB
+    query.
+
+    The relationships are followed as defined by the orca_nw_lib graph model:
+    (Device)-[:HAS]->(BGP)-[:BGP_NEIGHBOR]->(BGPNeighbor), and from the neighbor
+    [:HAS] to its BGPNeighborAF and SubInterface nodes and [:REMOTE_BGP] to the
+    BGP instance of the peer device.
+
+    Args:
+        device_ip (str): The IP address of the device.
+        neighbor_ips (list): The neighbor IPs.
+
+    Returns:
+        dict: A dictionary with (vrf_name, neighbor_ip) of the neighbor node as
+        key and a dictionary with "afs" (list of neighbor AF properties),
+        "local_bgp" (BGP properties), "remote_bgp" ([device IP, BGP properties]
+        or None) and "subinterfaces" (list of subinterface properties) as value.
+    """
+    query = """
+        MATCH (:Device {mgt_ip: $device_ip})-[:HAS]->(bgp:BGP)-[:BGP_NEIGHBOR]->(nbr:BGPNeighbor)
+        WHERE nbr.neighbor_ip IN $neighbor_ips
+        OPTIONAL MATCH (nbr)-[:HAS]->(af:BGPNeighborAF)
+        WITH bgp, nbr, collect(DISTINCT properties(af)) AS afs
+        OPTIONAL MATCH (nbr)-[:REMOTE_BGP]->(remote:BGP)<-[:HAS]-(remote_device:Device)
+        WITH bgp, nbr, afs, head(collect(
+            CASE WHEN remote IS NULL THEN NULL ELSE [remote_device.mgt_ip, properties(remote)] END
+        )) AS remote_bgp
+        OPTIONAL MATCH (nbr)-[:HAS]->(sub:SubInterface)
+        RETURN bgp.vrf_name, nbr.neighbor_ip, properties(bgp), afs, remote_bgp,
+            collect(DISTINCT properties(sub))
+    """
+    rows, _ = db.cypher_query(
+        query, {"device_ip": device_ip, "neighbor_ips": list(neighbor_ips)}
+    )
+    return {
+        (vrf_name, neighbor_ip): {
+            "afs": afs,
+            "local_bgp": local_bgp,
+            "remote_bgp": remote_bgp,
+            "subinterfaces": subinterfaces,
+        }
+        for vrf_name, neighbor_ip, local_bgp, afs, remote_bgp, subinterfaces in rows
+    }
@@ -0,0 +1,218 @@
+"""
+Read-through cache for the per-device network reads.
+
+Entries are keyed by (endpoint, device IP, query parameters). Every device has a
+version number which is part of the key; invalidating a device bumps its version,
+so that all its entries become unreachable at once and age out of the backend.
+
+Device data in the graph DB is updated by the gNMI subscription shortly after a
+write, hence after an invalidation the cache is bypassed for the device during a
+settle period, to avoid caching the state from before the subscription update.
+
+Reads carrying oper state, e.g. of interfaces, port channels and MCLAGs, are not
+cached, as it changes through gNMI without a write or discovery.
+"""
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+
+from log_manager.logger import get_backend_logger
+
+_logger = get_backend_logger()
+
+ALL_DEVICES = "__all__"
+
+
+class MemoryCacheBackend:
+    """
+    In-process cache backend with LRU and TTL eviction. Values are copied in
+    and out, so that callers cannot modify the cached values. Only for a single
+    web process without celery workers, whose invalidations it does not see.
+    """
+
+    def __init__(self, max_entries: int, ttl: int, settle_time: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.settle_time = settle_time
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._settle_until = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+        return True, copy.deepcopy(value)
+
+    def set(self, key: str, value):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_version(self, device_ip: str) -> str:
+        with self._lock:
+            return f"{self._versions.get(ALL_DEVICES, 0)}.{self._versions.get(device_ip, 0)}"
+
+    def is_settling(self, device_ip: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            return (
+                self._settle_until.get(device_ip, 0) > now
+                or self._settle_until.get(ALL_DEVICES, 0) > now
+            )
+
+    def invalidate(self, device_ip: str):
+        with self._lock:
+            self._versions[device_ip] = self._versions.get(device_ip, 0) + 1
+            self._settle_until[device_ip] = time.monotonic() + self.settle_time
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCacheBackend:
+    """
+    Redis cache backend, shared by all web and celery worker processes.
+    Entries expire after the TTL; LRU eviction is left to the Redis
+    maxmemory-policy of the server.
+    """
+
+    def __init__(self, url: str, ttl: int, settle_time: int, prefix: str = "orca_cache"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.settle_time = settle_time
+        self.prefix = prefix
+
+    def get(self, key: str):
+        value = self.client.get(f"{self.prefix}:data:{key}")
+        if value is None:
+            return False, None
+        return True, json.loads(value)
+
+    def set(self, key: str, value):
+        self.client.set(f"{self.prefix}:data:{key}", json.dumps(value), ex=self.ttl)
+
+    def get_version(self, device_ip: str) -> str:
+        all_version, version = self.client.mget(
+            f"{self.prefix}:version:{ALL_DEVICES}", f"{self.prefix}:version:{device_ip}"
+        )
+        return f"{int(all_version or 0)}.{int(version or 0)}"
+
+    def is_settling(self, device_ip: str) -> bool:
+        return bool(
+            self.client.exists(
+                f"{self.prefix}:settle:{device_ip}", f"{self.prefix}:settle:{ALL_DEVICES}"
+            )
+        )
+
+    def invalidate(self, device_ip: str):
+        pipe = self.client.pipeline()
+        pipe.incr(f"{self.prefix}:version:{device_ip}")
+        pipe.set(f"{self.prefix}:settle:{device_ip}", 1, ex=self.settle_time)
+        pipe.execute()
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}:data:*"):
+            self.client.delete(key)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_cache_backend():
+    """
+    Returns the cache backend configured by settings.ORCA_RESPONSE_CACHE,
+    or None if the cache is disabled.
+    """
+    global _backend
+    config = settings.ORCA_RESPONSE_CACHE
+    if config["BACKEND"] == "none":
+        return None
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if config["BACKEND"] == "redis":
+                    _backend = RedisCacheBackend(
+                        config["REDIS_URL"], config["TTL"], config["SETTLE_TIME"]
+                    )
+                else:
+                    _backend = MemoryCacheBackend(
+                        config["MAX_ENTRIES"], config["TTL"], config["SETTLE_TIME"]
+                    )
+    return _backend
+
+
+def make_cache_key(endpoint: str, device_ip: str, version: str, params) -> str:
+    return f"{endpoint}:{device_ip}:{version}:{json.dumps(params, sort_keys=True, default=str)}"
+
+
+def cached_read(endpoint: str):
+    """
+    Decorator for a read function taking the device IP as first argument.
+    The remaining arguments are treated as the query parameters of the read.
+
+    Args:
+        endpoint (str): Name of the endpoint, used as part of the cache key.
+    """
+
+    def decorator(read_fn):
+        @wraps(read_fn)
+        def _wrapper(device_ip, *args, **kwargs):
+            backend = get_cache_backend()
+            try:
+                if backend is None or backend.is_settling(device_ip):
+                    return read_fn(device_ip, *args, **kwargs)
+                key = make_cache_key(
+                    endpoint, device_ip, backend.get_version(device_ip), [args, kwargs]
+                )
+                hit, value = backend.get(key)
+            except Exception as err:
+                _logger.error("Response cache lookup failed: %s", err)
+                return read_fn(device_ip, *args, **kwargs)
+            if hit:
+                return value
+            value = read_fn(device_ip, *args, **kwargs)
+            try:
+                backend.set(key, value)
+            except Exception as err:
+                _logger.error("Response cache update failed: %s", err)
+            return value
+
+        return _wrapper
+
+    return decorator
+
+
+def invalidate_device(device_ip: str = None):
+    """
+    Invalidates the cached reads of a device, or of all devices if device_ip is not given.
+
+    Args:
+        device_ip (str, optional): The IP address of the device.
+    """
+    backend = get_cache_backend()
+    if backend is None:
+        return
+    try:
+        backend.invalidate(device_ip or ALL_DEVICES)
+    except Exception as err:
+        _logger.error("Response cache invalidation failed: %s", err)
@@ -0,0 +1,217 @@
+"""
+Discovery of several network features of a device, with independent features
+discovered concurrently.
+
+Features are discovered in waves. A feature runs once all features it depends
+on, e.g. the interfaces for the port channel members, which were requested
+together with it are discovered, so that the graph DB relations between them
+are created as by a full discovery.
+
+Discoveries go through network.single_flight, keyed by device, or by device
+and feature, so that a discovery started while the same one is running joins
+it instead of discovering the device again.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from orca_nw_lib.common import DiscoveryFeature
+from orca_nw_lib.discovery import discover_device, discover_nw_features
+
+from log_manager.logger import get_backend_logger
+from network.single_flight import get_single_flight, single_flight
+
+_logger = get_backend_logger()
+_pool = None
+_pool_lock = threading.Lock()
+
+# Feature sets which can be requested by name instead of a list of features.
+# Features unknown to the installed orca_nw_lib are left out.
+FEATURE_PRESETS = {
+    "l2": ("interface", "port_channel", "vlan", "mclag", "mclag_gw_mac", "stp", "stp_port", "stp_vlan"),
+    "l3": ("interface", "port_channel", "vlan", "bgp", "bgp_neighbors"),
+}
+
+# Features which have to be discovered before a feature, if requested together.
+FEATURE_DEPENDENCIES = {
+    "port_channel": ("interface",),
+    "port_group": ("interface",),
+    "vlan": ("interface", "port_channel"),
+    "mclag": ("interface", "port_channel"),
+    "mclag_gw_mac": ("mclag",),
+    "bgp_neighbors": ("bgp", "interface", "vlan"),
+    "stp_port": ("stp", "interface", "port_channel"),
+    "stp_vlan": ("stp", "vlan"),
+}
+
+
+class FeatureError(ValueError):
+    """
+    Raised for an unknown feature or preset.
+    """
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """
+    Returns the worker pool shared by all feature discoveries, so that the
+    number of concurrent feature discoveries is bounded for the whole process.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.ORCA_DISCOVERY_MAX_WORKERS,
+                    thread_name_prefix="orca_discovery",
+                )
+    return _pool
+
+
+def resolve_features(value) -> list:
+    """
+    Resolves the requested features.
+
+    Args:
+        value (str or list): A feature or preset name, or a list of them.
+
+    Returns:
+        list: The feature names, without duplicates, in request order.
+
+    Raises:
+        FeatureError: If a name is neither a feature nor a preset.
+    """
+    names = value if isinstance(value, list) else [value]
+    features = []
+    for name in names:
+        if not isinstance(name, str) or not name:
+            raise FeatureError(f"Invalid feature {name}.")
+        if name.lower() in FEATURE_PRESETS:
+            features.extend(
+                feature for feature in FEATURE_PRESETS[name.lower()]
+                if DiscoveryFeature.get_enum_from_str(feature)
+            )
+        elif DiscoveryFeature.get_enum_from_str(name):
+            features.append(name)
+        else:
+            raise FeatureError(f"Invalid feature {name}.")
+    return list(dict.fromkeys(features))
+
+
+def plan_feature_waves(features: list) -> list:
+    """
+    Orders the features into waves of features which can be discovered
+    concurrently.
+
+    Args:
+        features (list): The feature names.
+
+    Returns:
+        list: The waves, each a list of feature names.
+    """
+    remaining = list(features)
+    done = set()
+    waves = []
+    while remaining:
+        wave = [
+            feature for feature in remaining
+            if all(dep in done or dep not in remaining for dep in FEATURE_DEPENDENCIES.get(feature, ()))
+        ]
+        # Features depending on each other in a cycle are discovered together.
+        wave = wave or list(remaining)
+        waves.append(wave)
+        done.update(wave)
+        remaining = [feature for feature in remaining if feature not in done]
+    return waves
+
+
+def discover_devices(device_ips: list):
+    """
+    Discovers the devices with a single discover_device call, as orca_nw_lib
+    discovers the links between the devices of a call. Devices whose discovery
+    is already running are joined instead of being discovered again.
+
+    Args:
+        device_ips (list): The IP addresses of the devices. Without addresses,
+            discover_device is called as is, without joining.
+
+    Returns:
+        The reports of orca_nw_lib of the failed discoveries, empty if all
+        devices were discovered.
+    """
+    if not device_ips or not all(device_ips):
+        report = discover_device(device_ips=device_ips)
+        return [report] if report else []
+    keys = {f"discovery:{device_ip}": device_ip for device_ip in device_ips}
+    reports = get_single_flight().do_many(
+        list(keys), lambda free: discover_device(device_ips=[keys[key] for key in free])
+    )
+    return [report for report in reports if report]
+
+
+def discover_feature(device_ip: str, feature: str) -> dict:
+    """
+    Discovers one feature of a device.
+
+    Returns:
+        dict: The status, the error if failed and the elapsed time in milliseconds.
+    """
+    start = time.monotonic()
+    try:
+        # A running discovery of the whole device covers the feature.
+        joined, device_report = get_single_flight().join(f"discovery:{device_ip}")
+        if joined:
+            if device_report:
+                raise Exception(f"Discovery of device {device_ip} failed: {device_report}")
+        else:
+            single_flight(
+                f"discovery:{device_ip}:{feature}",
+                lambda: discover_nw_features(device_ip, DiscoveryFeature.get_enum_from_str(feature)),
+            )
+        report = {"status": "success"}
+        _logger.info("Discovered %s of device %s.", feature, device_ip)
+    except Exception as err:
+        report = {"status": "failed", "error": str(err)}
+        _logger.error("Failed to discover %s of device %s: %s", feature, device_ip, err)
+    report["elapsed_ms"] = round((time.monotonic() - start) * 1000, 1)
+    return report
+
+
+def _discover_feature_in_worker(device_ip: str, feature: str) -> dict:
+    try:
+        return discover_feature(device_ip, feature)
+    finally:
+        # Worker threads are reused, their DB connections are not closed by
+        # the request cycle.
+        connections.close_all()
+
+
+def discover_device_features(device_ip: str, features: list) -> dict:
+    """
+    Discovers the features of a device, independent features concurrently.
+
+    Args:
+        device_ip (str): The IP address of the device.
+        features (list): The feature names, as returned by resolve_features.
+
+    Returns:
+        dict: "features" with the report of every feature, and the total
+        "elapsed_ms".
+    """
+    start = time.monotonic()
+    reports = {}
+    for wave in plan_feature_waves(features):
+        if len(wave) == 1:
+            reports[wave[0]] = discover_feature(device_ip, wave[0])
+            continue
+        futures = {
+            feature: _get_pool().submit(_discover_feature_in_worker, device_ip, feature)
+            for feature in wave
+        }
+        for feature, future in futures.items():
+            reports[feature] = future.result()
+    return {
+        "features": {feature: reports[feature] for feature in features},
+        "elapsed_ms": round((time.monotonic() - start) * 1000, 1),
+    }
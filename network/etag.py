@@ -0,0 +1,123 @@
+"""
+ETag / If-None-Match support for the network GET endpoints.
+
+The ETag is a hash of the response data. For requests targeting one device, the
+ETag is also stored under the device version of the response cache, so that a
+matching If-None-Match is answered with 304 before the data is read or serialized.
+
+The device version only changes on writes through the API and on discoveries.
+Endpoints returning oper state, which changes through gNMI, or data of other
+devices are therefore declared with versioned=False and always compare the
+ETag of the current data.
+"""
+import hashlib
+from functools import wraps
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from log_manager.logger import get_backend_logger
+from network.cache import get_cache_backend, make_cache_key
+from network.fleet import is_fleet_request
+from orca_backend.fast_json import dumps
+
+_logger = get_backend_logger()
+
+
+def compute_etag(data) -> str:
+    """
+    Returns a stable content hash of the response data, as quoted ETag value.
+    """
+    return f'"{hashlib.sha1(dumps(data, sort_keys=True)).hexdigest()}"'
+
+
+def _strip_timings(data):
+    """
+    Returns the data without the read times of fleet and snapshot responses,
+    which differ on every request and are not part of the content.
+    """
+    if isinstance(data, dict):
+        return {k: _strip_timings(v) for k, v in data.items() if k != "elapsed_ms"}
+    if isinstance(data, list):
+        return [_strip_timings(i) for i in data]
+    return data
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Checks if the If-None-Match header value matches the given ETag.
+    """
+    if not if_none_match or not etag:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def _get_version_key(request):
+    """
+    Returns the cache key under which the ETag of the request is stored, or None
+    if the request does not target exactly one device or the device is settling.
+    """
+    mgt_ips = request.GET.getlist("mgt_ip")
+    if len(mgt_ips) != 1 or is_fleet_request(request):
+        return None
+    backend = get_cache_backend()
+    if backend is None or backend.is_settling(mgt_ips[0]):
+        return None
+    params = sorted((k, v) for k, v in request.GET.lists() if k != "mgt_ip")
+    return "etag:" + make_cache_key(
+        request.path,
+        mgt_ips[0],
+        backend.get_version(mgt_ips[0]),
+        params,
+    )
+
+
+def conditional_get(view=None, *, versioned: bool = True):
+    """
+    Decorator adding ETag and If-None-Match handling to the GET requests of a view.
+
+    Args:
+        view (callable): The view, when used without arguments.
+        versioned (bool): Whether a stored ETag of the device version may answer
+            the request without calling the view.
+    """
+    if view is None:
+        return lambda v: conditional_get(v, versioned=versioned)
+
+    @wraps(view)
+    def _wrapper(request, *args, **kwargs):
+        if request.method != "GET":
+            return view(request, *args, **kwargs)
+
+        if_none_match = request.headers.get("If-None-Match")
+        try:
+            version_key = _get_version_key(request) if versioned else None
+            if version_key and if_none_match:
+                hit, etag = get_cache_backend().get(version_key)
+                if hit and etag_matches(if_none_match, etag):
+                    return not_modified(etag)
+        except Exception as err:
+            _logger.error("ETag lookup failed: %s", err)
+            version_key = None
+
+        response = view(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK or not hasattr(response, "data"):
+            return response
+
+        etag = compute_etag(_strip_timings(response.data))
+        if version_key:
+            try:
+                get_cache_backend().set(version_key, etag)
+            except Exception as err:
+                _logger.error("ETag update failed: %s", err)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        response["ETag"] = etag
+        return response
+
+    return _wrapper
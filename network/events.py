@@ -0,0 +1,276 @@
+"""
+Change events of device state, pushed to clients as server-sent events.
+
+orca_nw_lib updates the graph DB from the gNMI subscription but does not notify
+about the updates, hence a watcher per device compares the watched features in
+the graph DB at a short interval and publishes the differences. Watchers only
+run for devices with at least one connected client, and are shared by all
+clients of the device.
+
+With the redis backend, events are published over redis pubsub so that clients
+of every web process receive them, and a redis lease makes sure that only one
+process watches a device.
+"""
+import itertools
+import json
+import queue
+import threading
+import uuid
+
+from django.conf import settings
+from orca_nw_lib.bgp import get_bgp_neighbors
+from orca_nw_lib.interface import get_interface
+
+from log_manager.logger import get_backend_logger
+from network.bulk_db import get_port_chnl_members_map
+from network.cache import invalidate_device
+
+_logger = get_backend_logger()
+
+# Renews the lease if it is still held by the caller.
+_RENEW_LEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def _get_interface_state(device_ip):
+    return {
+        intf.get("name"): intf.get("oper_sts")
+        for intf in get_interface(device_ip) or []
+    }
+
+
+def _get_port_chnl_state(device_ip):
+    return {name: sorted(members) for name, members in get_port_chnl_members_map(device_ip).items()}
+
+
+def _get_bgp_neighbor_state(device_ip):
+    nbrs = get_bgp_neighbors(device_ip=device_ip) or []
+    return {nbr.get("neighbor_ip"): nbr for nbr in (nbrs if isinstance(nbrs, list) else [nbrs])}
+
+
+# Watched features, with a function returning the state of a device as a
+# dictionary of item name and value.
+FEATURES = {
+    "interface": _get_interface_state,
+    "port_chnl": _get_port_chnl_state,
+    "bgp_neighbor": _get_bgp_neighbor_state,
+}
+
+
+def diff_state(device_ip: str, feature: str, old: dict, new: dict) -> list:
+    """
+    Returns the change events between two states of a feature.
+
+    Args:
+        device_ip (str): The IP address of the device.
+        feature (str): The feature name.
+        old (dict): The previous state.
+        new (dict): The current state.
+
+    Returns:
+        list: The events, each with mgt_ip, feature, name, change and value.
+    """
+    events = []
+    for name in old.keys() | new.keys():
+        if name not in new:
+            change = "removed"
+        elif name not in old:
+            change = "added"
+        elif old[name] != new[name]:
+            change = "modified"
+        else:
+            continue
+        events.append(
+            {
+                "mgt_ip": device_ip,
+                "feature": feature,
+                "name": name,
+                "change": change,
+                "value": new.get(name),
+            }
+        )
+    return events
+
+
+class Subscription:
+    """
+    Queue of the events of one client, filtered by devices and features.
+    """
+
+    def __init__(self, device_ips: set, features: set, max_size: int):
+        self.device_ips = device_ips
+        self.features = features
+        self.queue = queue.Queue(maxsize=max_size)
+
+    def matches(self, event: dict) -> bool:
+        return event["mgt_ip"] in self.device_ips and event["feature"] in self.features
+
+    def put(self, event: dict):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            # A client not reading its events must not block the others.
+            _logger.warning("Event queue full, dropping event for %s.", event["mgt_ip"])
+
+    def get(self, timeout: float):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class DeviceWatcher(threading.Thread):
+    """
+    Thread publishing the state changes of one device.
+    """
+
+    def __init__(self, bus, device_ip: str, interval: float):
+        super().__init__(name=f"orca_events_{device_ip}", daemon=True)
+        self.bus = bus
+        self.device_ip = device_ip
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.states = {}
+
+    def poll(self):
+        changed = False
+        for feature, get_state in FEATURES.items():
+            try:
+                state = get_state(self.device_ip)
+            except Exception as err:
+                _logger.error("Failed to read %s of device %s: %s", feature, self.device_ip, err)
+                continue
+            if feature in self.states:
+                for event in diff_state(self.device_ip, feature, self.states[feature], state):
+                    self.bus.publish(event)
+                    changed = True
+            self.states[feature] = state
+        if changed:
+            # The cached reads and ETags of the device are stale.
+            invalidate_device(self.device_ip)
+
+    def run(self):
+        while not self.stopped.is_set():
+            if self.bus.acquire_lease(self.device_ip, self.interval):
+                self.poll()
+            else:
+                # Another process watches the device, start over when it takes over.
+                self.states.clear()
+            self.stopped.wait(self.interval)
+
+
+class EventBus:
+    """
+    Dispatches events to the subscriptions of this process and manages the
+    device watchers.
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.subscriptions = set()
+        self.watchers = {}
+        self.lock = threading.Lock()
+        self.redis = None
+        self.token = uuid.uuid4().hex
+        if config["BACKEND"] == "redis":
+            import redis
+
+            self.redis = redis.Redis.from_url(config["REDIS_URL"])
+            threading.Thread(target=self._listen, name="orca_events", daemon=True).start()
+
+    def _listen(self):
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.config["CHANNEL"])
+        for message in pubsub.listen():
+            try:
+                self._dispatch(json.loads(message["data"]))
+            except Exception as err:
+                _logger.error("Failed to dispatch event: %s", err)
+
+    def _dispatch(self, event: dict):
+        with self.lock:
+            subscriptions = [s for s in self.subscriptions if s.matches(event)]
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    def publish(self, event: dict):
+        if self.redis is not None:
+            self.redis.publish(self.config["CHANNEL"], json.dumps(event, default=str))
+        else:
+            self._dispatch(event)
+
+    def acquire_lease(self, device_ip: str, interval: float) -> bool:
+        """
+        Takes or renews the lease to watch a device. Always succeeds without redis.
+        """
+        if self.redis is None:
+            return True
+        key = f"{self.config['CHANNEL']}:lease:{device_ip}"
+        ttl = max(int(interval * 3), 1)
+        if self.redis.set(key, self.token, nx=True, ex=ttl):
+            return True
+        return bool(self.redis.eval(_RENEW_LEASE, 1, key, self.token, ttl))
+
+    def subscribe(self, device_ips, features) -> Subscription:
+        subscription = Subscription(set(device_ips), set(features), self.config["QUEUE_SIZE"])
+        with self.lock:
+            self.subscriptions.add(subscription)
+            for device_ip in subscription.device_ips:
+                if device_ip not in self.watchers:
+                    watcher = DeviceWatcher(self, device_ip, self.config["POLL_INTERVAL"])
+                    self.watchers[device_ip] = watcher
+                    watcher.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.lock:
+            self.subscriptions.discard(subscription)
+            watched = set(itertools.chain.from_iterable(s.device_ips for s in self.subscriptions))
+            for device_ip in list(self.watchers):
+                if device_ip not in watched:
+                    self.watchers.pop(device_ip).stopped.set()
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """
+    Returns the event bus of the process, configured by settings.ORCA_EVENTS.
+    """
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = EventBus(settings.ORCA_EVENTS)
+    return _bus
+
+
+def format_sse(event: dict, event_id: int) -> str:
+    """
+    Formats an event as server-sent event message.
+    """
+    return f"id: {event_id}\nevent: {event['feature']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def iter_sse(device_ips, features, keepalive: float):
+    """
+    Subscribes to the events of the devices and features and yields them as
+    server-sent event messages, and a comment line when idle so that proxies
+    keep the connection open. Unsubscribes when the client disconnects and the
+    generator is closed.
+    """
+    bus = get_event_bus()
+    subscription = bus.subscribe(device_ips, features)
+    try:
+        yield "retry: 5000\n\n"
+        for event_id in itertools.count(1):
+            event = subscription.get(keepalive)
+            yield format_sse(event, event_id) if event else ": keepalive\n\n"
+    finally:
+        bus.unsubscribe(subscription)
@@ -0,0 +1,105 @@
+"""
+Execution of list-bodied write requests, with the items of different devices
+applied in parallel and the items of one device applied in request order.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+from log_manager.logger import get_backend_logger
+from network.util import add_msg_to_list, get_failure_msg
+
+_logger = get_backend_logger()
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """
+    Returns the worker pool shared by all write requests, so that the number of
+    devices configured concurrently is bounded for the whole process.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.ORCA_WRITE_MAX_WORKERS,
+                    thread_name_prefix="orca_write",
+                )
+    return _pool
+
+
+def group_by_device(req_data_list: list, key: str = "mgt_ip") -> dict:
+    """
+    Groups the request items by device.
+
+    Args:
+        req_data_list (list): The request items.
+        key (str): The field holding the device IP.
+
+    Returns:
+        dict: Device IP as key and the list of (index, item) of the device, in
+        request order, as value.
+    """
+    groups = {}
+    for index, req_data in enumerate(req_data_list):
+        groups.setdefault(req_data.get(key), []).append((index, req_data))
+    return groups
+
+
+def run_per_device(request, req_data_list: list, apply_fn, key: str = "mgt_ip"):
+    """
+    Applies every request item with apply_fn. Items of different devices are
+    applied in parallel on the shared worker pool, items of the same device one
+    after the other in request order. Items have to be validated beforehand.
+
+    Args:
+        request (Request): The request object.
+        req_data_list (list): The request items.
+        apply_fn (callable): Function taking the request, an item and a message
+            list. It adds the messages of the item to the list with
+            add_msg_to_list and returns False if the item failed.
+        key (str): The field holding the device IP.
+
+    Returns:
+        tuple: The messages of all items in request order, and True if all items succeeded.
+    """
+    outcomes = [None] * len(req_data_list)
+
+    def _apply_device(entries):
+        for index, req_data in entries:
+            msgs = []
+            try:
+                succeeded = apply_fn(request, req_data, msgs)
+            except Exception as err:
+                _logger.error("Failed to apply request item %s: %s", req_data, err)
+                add_msg_to_list(msgs, get_failure_msg(err, request))
+                succeeded = False
+            outcomes[index] = (msgs, succeeded)
+
+    def _apply_device_in_worker(entries):
+        try:
+            _apply_device(entries)
+        finally:
+            # Worker threads are reused, their DB connections are not closed by
+            # the request cycle.
+            connections.close_all()
+
+    groups = group_by_device(req_data_list, key)
+    if len(groups) > 1:
+        list(_get_pool().map(_apply_device_in_worker, groups.values()))
+    else:
+        for entries in groups.values():
+            _apply_device(entries)
+
+    result = []
+    http_status = True
+    for msgs, succeeded in outcomes:
+        for msg in msgs:
+            if msg != "\n":
+                add_msg_to_list(result, msg)
+        http_status = http_status and bool(succeeded)
+    return result, http_status
@@ -0,0 +1,113 @@
+""" Fan-out of per-device reads over several devices. """
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from grpc import RpcError
+from orca_nw_lib.device import get_device_details
+from rest_framework import status
+from rest_framework.response import Response
+
+from log_manager.logger import get_backend_logger
+
+_logger = get_backend_logger()
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """
+    Returns the worker pool shared by all fleet requests, so that the number of
+    concurrent device reads is bounded for the whole process and not per request.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.ORCA_FLEET_MAX_WORKERS,
+                    thread_name_prefix="orca_fleet",
+                )
+    return _pool
+
+
+def is_fleet_request(request) -> bool:
+    """
+    Checks if a GET request asks for more than one device, i.e. mgt_ip is given
+    more than once, as a comma separated list or as "all".
+
+    Args:
+        request (Request): The request object.
+
+    Returns:
+        bool: True if the request targets several devices.
+    """
+    mgt_ips = request.GET.getlist("mgt_ip")
+    return len(mgt_ips) > 1 or any("," in ip or ip == "all" for ip in mgt_ips)
+
+
+def get_device_ips(request) -> list:
+    """
+    Returns the device IPs requested by the mgt_ip query parameter.
+    "all" expands to all discovered devices.
+
+    Args:
+        request (Request): The request object.
+
+    Returns:
+        list: The list of unique device IPs, in request order.
+    """
+    device_ips = []
+    for value in request.GET.getlist("mgt_ip"):
+        device_ips.extend(ip.strip() for ip in value.split(",") if ip.strip())
+    if "all" in device_ips:
+        devices = get_device_details() or []
+        return [
+            device["mgt_ip"]
+            for device in (devices if isinstance(devices, list) else [devices])
+        ]
+    return list(dict.fromkeys(device_ips))
+
+
+def fan_out(device_ips: list, read_fn) -> dict:
+    """
+    Calls read_fn for every device concurrently on the shared worker pool.
+
+    Args:
+        device_ips (list): The list of device IPs.
+        read_fn (callable): Function taking a device IP and returning its data.
+
+    Returns:
+        dict: A dictionary with device IP as key and a dictionary with either
+        "data" or "error", and "elapsed_ms" as value.
+    """
+
+    def _read(device_ip):
+        start = time.perf_counter()
+        try:
+            entry = {"data": read_fn(device_ip)}
+        except Exception as err:
+            _logger.error("Failed to read data of device %s: %s", device_ip, err)
+            entry = {"error": err.details() if isinstance(err, RpcError) else str(err)}
+        entry["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return device_ip, entry
+
+    return dict(_get_pool().map(_read, device_ips))
+
+
+def fleet_response(request, read_fn) -> Response:
+    """
+    Builds the response of a GET request targeting several devices.
+
+    Args:
+        request (Request): The request object.
+        read_fn (callable): Function taking a device IP and returning its data.
+
+    Returns:
+        Response: Results keyed by device IP, or 204 if no device matched.
+    """
+    device_ips = get_device_ips(request)
+    if not device_ips:
+        return Response({}, status=status.HTTP_204_NO_CONTENT)
+    return Response(fan_out(device_ips, read_fn), status=status.HTTP_200_OK)
@@ -1,5 +1,7 @@
 """ Interface view. """
 import ipaddress
+import threading
+from functools import partial
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.decorators import api_view
@@ -15,14 +17,41 @@ from orca_nw_lib.common import Speed, PortFec, IFMode
 
 from log_manager.decorators import log_request
 from log_manager.logger import get_backend_logger
+from network.executor import run_per_device
+from network.fleet import fleet_response, is_fleet_request
+from network.list_query import ListQueryError, apply_list_query, validate_list_query
+from network.noop import FORCE_FIELD, apply_changed_fields, is_forced
+from network.ranges import RangeExpressionError, expand_request_items, has_interface_expression
 from network.util import add_msg_to_list, get_failure_msg, get_success_msg
 from network.models import IPAvailability
+from network.etag import conditional_get
 
 _logger = get_backend_logger()
 
 
+# Config fields compared with the interface state before a PUT is applied.
+INTERFACE_COMPARED_FIELDS = (
+    "enabled",
+    "mtu",
+    "description",
+    "fec",
+    "speed",
+    "autoneg",
+    "link_training",
+    "adv_speeds",
+)
+
+INTERFACE_FILTERS = {
+    "name_prefix": lambda intf, value: str(intf.get("name", "")).startswith(value),
+    "enabled": lambda intf, value: str(intf.get("enabled")).lower() == value.lower(),
+    "oper_sts": lambda intf, value: str(intf.get("oper_sts")).lower() == value.lower(),
+    "speed": lambda intf, value: str(intf.get("speed")).lower() == value.lower(),
+}
+
+
 @api_view(["GET", "PUT", "DELETE"])
 @log_request
+@conditional_get(versioned=False)
 def device_interfaces_list(request):
     """
     This function handles the API view for listing and updating device interfaces.
@@ -36,6 +65,19 @@ def device_interfaces_list(request):
     result = []
     http_status = True
     if request.method == "GET":
+        intfc_name = request.GET.get("name", "")
+        if is_fleet_request(request):
+            try:
+                validate_list_query(request.GET)
+            except ListQueryError as err:
+                _logger.error(str(err))
+                return Response({"status": str(err)}, status=status.HTTP_400_BAD_REQUEST)
+            return fleet_response(
+                request,
+                lambda ip: apply_list_query(
+                    get_interface(ip, intfc_name), request.GET, INTERFACE_FILTERS
+                ),
+            )
         device_ip = request.GET.get("mgt_ip", "")
         if not device_ip:
             _logger.error("Required field device mgt_ip not found.")
@@ -43,8 +85,13 @@ def device_interfaces_list(request):
                 {"status": "Required field device mgt_ip not found."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        intfc_name = request.GET.get("name", "")
-        data = get_interface(device_ip, intfc_name)
+        try:
+            data = apply_list_query(
+                get_interface(device_ip, intfc_name), request.GET, INTERFACE_FILTERS
+            )
+        except ListQueryError as err:
+            _logger.error(str(err))
+            return Response({"status": str(err)}, status=status.HTTP_400_BAD_REQUEST)
         return (
             Response(data, status.HTTP_200_OK)
             if data
@@ -80,68 +127,11 @@ def device_interfaces_list(request):
                         {"status": str(e)},
                         status=status.HTTP_400_BAD_REQUEST,
                     )
-            try:
-                config_interface(
-                    device_ip=device_ip,
-                    if_name=name,
-                    enable=(
-                        True
-                        if str(req_data.get("enabled")).lower() == "true"
-                        else (
-                            False
-                            if str(req_data.get("enabled")).lower() == "false"
-                            else None
-                        )
-                    ),
-                    mtu=int(req_data.get("mtu")) if "mtu" in req_data else None,
-                    description=req_data.get("description"),
-                    fec=PortFec.get_enum_from_str(req_data.get("fec")),
-                    speed=Speed.get_enum_from_str(req_data.get("speed")),
-                    autoneg=(
-                        True
-                        if str(req_data.get("autoneg")).lower() == "on"
-                        else (
-                            False
-                            if str(req_data.get("autoneg")).lower() == "off"
-                            else None
-                        )
-                    ),
-                    link_training=(
-                        True
-                        if str(req_data.get("link_training")).lower() == "on"
-                        else (
-                            False
-                            if str(req_data.get("link_training")).lower() == "off"
-                            else None
-                        )
-                    ),
-                    adv_speeds=req_data.get("adv_speeds"),
-                    ip_with_prefix=ip_with_prefix,
-                    secondary=req_data.get("secondary", False),
-                )
-                # checking if ip with given interface is already in use.
-                # if it in use the get data from neo4j and update it.
-                # else add new ip usage.
-                if ip_with_prefix:
-                    if IPAvailability.objects.filter(used_in=name, device_ip=device_ip).exists():
-                        IPAvailability.remove_usage_by_device_ip_and_used_in(
-                            device_ip=device_ip, used_in=name
-                        )
-                        sub_intfc = get_subinterfaces(device_ip, name)
-                        for i in sub_intfc:
-                            IPAvailability.add_ip_usage(
-                                ip=i.get("ip_address"), device_ip=device_ip, used_in=name
-                            )
-                    else: 
-                    # add new ip usage
-                        IPAvailability.add_ip_usage(ip=ip_with_prefix, device_ip=device_ip, used_in=name)
-                add_msg_to_list(result, get_success_msg(request))
-                http_status = http_status and True
-                _logger.info("Interface %s config updated successfully.", req_data.get("name"))
-            except Exception as err:
-                add_msg_to_list(result, get_failure_msg(err, request))
-                http_status = http_status and False
-                _logger.error("Failed to configure interface %s.", req_data.get("name"))
+        if has_interface_expression(req_data_list):
+            return _apply_interface_changes(request, req_data_list)
+        result, http_status = run_per_device(
+            request, req_data_list, partial(_config_interface, states=_InterfaceStates())
+        )
     elif request.method == "DELETE":
         req_data_list = (
             request.data if isinstance(request.data, list) else [request.data]
@@ -161,20 +151,347 @@ def device_interfaces_list(request):
                     {"status": "Required field name not found."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            try:
-                remove_vlan(
-                    device_ip=device_ip,
-                    intfc_name=req_data.get("name"),
-                    if_mode=if_mode if (if_mode := IFMode.get_enum_from_str(req_data.get("if_mode"))) else None
+        result, http_status = run_per_device(request, req_data_list, _remove_interface_vlan)
+
+    return Response(
+        {"result": result},
+        status=(
+            status.HTTP_200_OK if http_status else status.HTTP_500_INTERNAL_SERVER_ERROR
+        ),
+    )
+
+
+class _InterfaceStates:
+    """
+    Reads the interfaces of each device of a request at most once, for the
+    comparison of the interface changes with the current state. The state of an
+    interface is handed out once; a further change of the same interface reads
+    the interface again, as the first change may have modified it.
+    """
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def get(self, req_data: dict):
+        device_ip = req_data.get("mgt_ip")
+        name = req_data.get("name")
+        with self._lock:
+            loaded = device_ip in self._states
+        if not loaded:
+            # Items of a device are applied one after the other, so the device
+            # is read by one thread only.
+            interfaces = {intf.get("name"): intf for intf in get_interface(device_ip) or []}
+            with self._lock:
+                self._states.setdefault(device_ip, interfaces)
+        with self._lock:
+            state = self._states[device_ip].pop(name, None)
+        if state is None:
+            return get_interface(device_ip, name)
+        return state
+
+
+def _config_interface(request, req_data, result, states: _InterfaceStates = None) -> bool:
+    """
+    Applies the interface config of one validated PUT request item, without the
+    fields the interface already has.
+
+    Args:
+        request (Request): The request object.
+        req_data (dict): The request item.
+        result (list): The list the messages of the item are added to.
+        states (_InterfaceStates): The interface states of the request, the
+            interface is read on its own without them.
+
+    Returns:
+        bool: True if the interface was configured or had no changes.
+    """
+    return apply_changed_fields(
+        request,
+        req_data,
+        result,
+        states.get if states else lambda item: get_interface(item.get("mgt_ip"), item.get("name")),
+        INTERFACE_COMPARED_FIELDS,
+        _set_interface_config,
+    )
+
+
+def _set_interface_config(request, req_data, result) -> bool:
+    """
+    Applies the interface config of one request item.
+
+    Args:
+        request (Request): The request object.
+        req_data (dict): The request item.
+        result (list): The list the messages of the item are added to.
+
+    Returns:
+        bool: True if the interface was configured.
+    """
+    device_ip = req_data.get("mgt_ip")
+    name = req_data.get("name")
+    ip_with_prefix = req_data.get("ip_address")
+    try:
+        config_interface(
+            device_ip=device_ip,
+            if_name=name,
+            enable=(
+                True
+                if str(req_data.get("enabled")).lower() == "true"
+                else (
+                    False
+                    if str(req_data.get("enabled")).lower() == "false"
+                    else None
                 )
-                add_msg_to_list(result, get_success_msg(request))
-                http_status = http_status and True
-                _logger.info("Interface %s removed successfully.", req_data.get("name"))
-            except Exception as err:
-                add_msg_to_list(result, get_failure_msg(err, request))
-                http_status = http_status and False
-                _logger.error("Failed to remove interface %s.", req_data.get("name"))
+            ),
+            mtu=int(req_data.get("mtu")) if "mtu" in req_data else None,
+            description=req_data.get("description"),
+            fec=PortFec.get_enum_from_str(req_data.get("fec")),
+            speed=Speed.get_enum_from_str(req_data.get("speed")),
+            autoneg=(
+                True
+                if str(req_data.get("autoneg")).lower() == "on"
+                else (
+                    False
+                    if str(req_data.get("autoneg")).lower() == "off"
+                    else None
+                )
+            ),
+            link_training=(
+                True
+                if str(req_data.get("link_training")).lower() == "on"
+                else (
+                    False
+                    if str(req_data.get("link_training")).lower() == "off"
+                    else None
+                )
+            ),
+            adv_speeds=req_data.get("adv_speeds"),
+            ip_with_prefix=ip_with_prefix,
+            secondary=req_data.get("secondary", False),
+        )
+        # checking if ip with given interface is already in use.
+        # if it in use the get data from neo4j and update it.
+        # else add new ip usage.
+        if ip_with_prefix:
+            if IPAvailability.objects.filter(used_in=name, device_ip=device_ip).exists():
+                IPAvailability.remove_usage_by_device_ip_and_used_in(
+                    device_ip=device_ip, used_in=name
+                )
+                sub_intfc = get_subinterfaces(device_ip, name)
+                for i in sub_intfc:
+                    IPAvailability.add_ip_usage(
+                        ip=i.get("ip_address"), device_ip=device_ip, used_in=name
+                    )
+            else: 
+            # add new ip usage
+                IPAvailability.add_ip_usage(ip=ip_with_prefix, device_ip=device_ip, used_in=name)
+        add_msg_to_list(result, get_success_msg(request))
+        _logger.info("Interface %s config updated successfully.", req_data.get("name"))
+        return True
+    except Exception as err:
+        add_msg_to_list(result, get_failure_msg(err, request))
+        _logger.error("Failed to configure interface %s.", req_data.get("name"))
+        return False
+
+
+def _remove_interface_vlan(request, req_data, result) -> bool:
+    """
+    Removes the VLAN membership of the interface of one validated DELETE request item.
+
+    Args:
+        request (Request): The request object.
+        req_data (dict): The request item.
+        result (list): The list the messages of the item are added to.
+
+    Returns:
+        bool: True if the VLAN membership was removed.
+    """
+    device_ip = req_data.get("mgt_ip")
+    try:
+        remove_vlan(
+            device_ip=device_ip,
+            intfc_name=req_data.get("name"),
+            if_mode=if_mode if (if_mode := IFMode.get_enum_from_str(req_data.get("if_mode"))) else None
+        )
+        add_msg_to_list(result, get_success_msg(request))
+        _logger.info("Interface %s removed successfully.", req_data.get("name"))
+        return True
+    except Exception as err:
+        add_msg_to_list(result, get_failure_msg(err, request))
+        _logger.error("Failed to remove interface %s.", req_data.get("name"))
+        return False
+
+
+INTERFACE_CONFIG_FIELDS = (
+    "enabled",
+    "mtu",
+    "description",
+    "fec",
+    "speed",
+    "autoneg",
+    "link_training",
+    "adv_speeds",
+    "ip_address",
+    "secondary",
+)
+# Fields of an IP address of an interface, which can have several.
+INTERFACE_IP_FIELDS = ("ip_address", "secondary")
+
+
+def _validate_interface_change(req_data) -> list:
+    """
+    Validates the config values of one interface change.
+
+    Args:
+        req_data (dict): The interface change.
+
+    Returns:
+        list: The error messages, empty if the change is valid.
+    """
+    errors = []
+    if_name = req_data.get("name")
+    if str(req_data.get("enabled", "true")).lower() not in ("true", "false"):
+        errors.append(f"Invalid value of enabled for {if_name}.")
+    for field in ("autoneg", "link_training"):
+        if str(req_data.get(field, "on")).lower() not in ("on", "off"):
+            errors.append(f"Invalid value of {field} for {if_name}.")
+    if "mtu" in req_data:
+        try:
+            int(req_data["mtu"])
+        except (TypeError, ValueError):
+            errors.append(f"Invalid value of mtu for {if_name}.")
+    if req_data.get("fec") and not PortFec.get_enum_from_str(req_data["fec"]):
+        errors.append(f"Invalid value of fec for {if_name}.")
+    if req_data.get("speed") and not Speed.get_enum_from_str(req_data["speed"]):
+        errors.append(f"Invalid value of speed for {if_name}.")
+    if ip_with_prefix := req_data.get("ip_address"):
+        try:
+            ipaddress.ip_network(ip_with_prefix, strict=False)
+        except ValueError as e:
+            errors.append(f"Invalid IP address for {if_name}: {e}")
+    return errors
+
 
+def merge_interface_changes(req_data_list: list):
+    """
+    Merges the changes of the same interface into one change per interface, and
+    validates all merged changes.
+
+    IP addresses are not merged, as an interface can have several, e.g. a
+    primary and a secondary one: the first IP address of an interface is part of
+    its change, every further distinct IP address, by ip_address and secondary,
+    becomes an extra change of the interface applied after it. An interface
+    change is forced if any of its request items has force=true.
+
+    Args:
+        req_data_list (list): The interface changes, each with mgt_ip, name and
+            any of INTERFACE_CONFIG_FIELDS.
+
+    Returns:
+        tuple: The list of merged changes, in order of the first change of each
+        interface, and the list of error messages. Setting the same field of an
+        interface to different values is an error.
+    """
+    merged = {}
+    ip_changes = {}
+    errors = []
+    for req_data in req_data_list:
+        device_ip = req_data.get("mgt_ip")
+        if_name = req_data.get("name")
+        if not device_ip or not if_name:
+            errors.append("Required fields mgt_ip and name not found.")
+            continue
+        change = merged.setdefault((device_ip, if_name), {"mgt_ip": device_ip, "name": if_name})
+        for field in INTERFACE_CONFIG_FIELDS:
+            if field not in req_data or field in INTERFACE_IP_FIELDS:
+                continue
+            if field in change and change[field] != req_data[field]:
+                errors.append(f"Conflicting values of {field} for {if_name} on {device_ip}.")
+            change[field] = req_data[field]
+        if is_forced(None, req_data):
+            change[FORCE_FIELD] = True
+        if "ip_address" in req_data:
+            ip_change = {field: req_data[field] for field in INTERFACE_IP_FIELDS if field in req_data}
+            ip_changes.setdefault((device_ip, if_name), {}).setdefault(
+                (req_data["ip_address"], str(req_data.get("secondary", False)).lower()), ip_change
+            )
+    changes = []
+    for key, change in merged.items():
+        first, *others = ip_changes.get(key, {}).values() or [{}]
+        change.update(first)
+        changes.append(change)
+        for ip_change in others:
+            extra = {"mgt_ip": change["mgt_ip"], "name": change["name"], **ip_change}
+            if FORCE_FIELD in change:
+                extra[FORCE_FIELD] = True
+            changes.append(extra)
+    for change in changes:
+        errors.extend(_validate_interface_change(change))
+    return changes, errors
+
+
+@api_view(["PUT"])
+@log_request
+def interface_bulk_config(request):
+    """
+    This function handles the API view for configuring many interfaces at once.
+
+    The changes of the same interface are merged into one config call and all
+    merged changes are validated before any is applied. Devices are configured
+    in parallel. The name of a change may be an interface range or selector
+    expression, e.g. "Ethernet0-Ethernet124 step 4" or "all 100G ports", which is
+    expanded against the interface list of the device (see network.ranges).
+
+    Parameters:
+    - request: The HTTP request object, with a list of interface changes in the
+      format of the device_interfaces_list PUT request.
+
+    Returns:
+    - The HTTP response object with one result per configured interface, or 400
+      with the list of errors if any change is invalid.
+    """
+    req_data_list = request.data if isinstance(request.data, list) else [request.data]
+    return _apply_interface_changes(request, req_data_list)
+
+
+def get_device_interfaces(device_ip: str) -> list:
+    """
+    Returns all interfaces of the device, against which the interface
+    expressions of the requests are expanded.
+    """
+    return get_interface(device_ip, "")
+
+
+def _apply_interface_changes(request, req_data_list: list):
+    """
+    Expands the interface expressions of the changes, merges and validates the
+    expanded changes and applies them.
+
+    Args:
+        request (Request): The request object.
+        req_data_list (list): The interface changes.
+
+    Returns:
+        Response: The response with one result per configured interface, or 400
+        if an expression or a change is invalid.
+    """
+    try:
+        expanded = expand_request_items(req_data_list, get_device_interfaces)
+    except RangeExpressionError as err:
+        _logger.error(str(err))
+        return Response({"status": str(err)}, status=status.HTTP_400_BAD_REQUEST)
+    changes, errors = merge_interface_changes(expanded)
+    if errors:
+        _logger.error("Invalid interface changes: %s", errors)
+        return Response(
+            {"status": "Invalid interface changes.", "errors": errors},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    result, http_status = run_per_device(
+        request, changes, partial(_config_interface, states=_InterfaceStates())
+    )
+    _logger.info("Configured %s interfaces from %s changes.", len(changes), len(req_data_list))
     return Response(
         {"result": result},
         status=(
@@ -184,6 +501,7 @@ def device_interfaces_list(request):
 
 
 @api_view(["GET"])
+@conditional_get
 def interface_pg(request):
     """
     A view for listing device interfaces. It takes a GET request and retrieves the device IP and interface name from the request parameters. If the required parameters are not found, it returns a 400 Bad Request response. It then fetches the page of the interface from the device and returns a 200 OK response with the data if it exists, otherwise it returns a 204 No Content response.
@@ -246,6 +564,7 @@ def interface_resync(request):
 
 @api_view(["GET", "PUT", "DELETE"])
 @log_request
+@conditional_get
 def interface_subinterface_config(request):
     """
         Generates the function comment for the given function body.
@@ -1,13 +1,14 @@
 import ipaddress
 from django.forms import model_to_dict
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.response import Response
 
 from log_manager.decorators import log_request
 from log_manager.logger import get_backend_logger
 from network.models import IPAvailability, IPRange
 from network.util import add_msg_to_list, get_failure_msg, get_success_msg
+from orca_backend.streaming import STREAMING_RENDERERS, ndjson_response, wants_ndjson
 
 
 _logger = get_backend_logger()
@@ -59,27 +60,44 @@ def ip_range(request):
     )
     
     
+def _get_ip_availability_rows(ip_range=None):
+    """
+    Yields the IPAvailability rows, reading them from the database in chunks.
+
+    Args:
+        ip_range (str, optional): The range to filter by.
+
+    Yields:
+        dict: The IP address, its usage and its ranges.
+    """
+    if ip_range is None:
+        ip_availability_list = IPAvailability.objects.all()
+    else:
+        ip_availability_list = IPAvailability.objects.filter(range=ip_range)
+    for ip in ip_availability_list.prefetch_related("range").iterator(chunk_size=1000):
+        yield {
+            "ip": ip.ip,
+            "used_in": ip.used_in,
+            "device_ip": ip.device_ip,
+            "range": [ip_range.range for ip_range in ip.range.all()]
+        }
+
+
 @api_view(["GET"])
+@renderer_classes(STREAMING_RENDERERS)
 @log_request
 def ip_availability(request):
-    """ Get All IP address from the IPAvailability table. """
+    """
+    Get All IP address from the IPAvailability table.
+    Streams one IP address per line if requested with "Accept: application/x-ndjson".
+    """
     result = []
     http_status = True
     if request.method == "GET":
         ip_range = request.GET.get("range")
-        if ip_range is None:
-            ip_availability_list = IPAvailability.objects.all()
-        else:
-            ip_availability_list = IPAvailability.objects.filter(range=ip_range)
-        for ip in ip_availability_list:
-            result.append(
-                {
-                    "ip": ip.ip, 
-                    "used_in": ip.used_in,
-                    "device_ip": ip.device_ip,
-                    "range": [ip_range.range for ip_range in ip.range.all()]
-                }
-            )
+        if wants_ndjson(request):
+            return ndjson_response(_get_ip_availability_rows(ip_range))
+        result = list(_get_ip_availability_rows(ip_range))
         return (
             Response(result, status=status.HTTP_200_OK)
             if result
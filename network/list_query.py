@@ -0,0 +1,159 @@
+"""
+Filtering, sparse field selection and paging of list GET responses.
+
+Everything here builds new lists and dictionaries, the input data may come
+from the response cache and must not be modified.
+"""
+import base64
+import re
+
+
+class ListQueryError(ValueError):
+    """
+    Raised for an invalid filter, field selection or paging parameter.
+    """
+
+
+def natural_key(name: str):
+    """
+    Sort key ordering interface names the way they are numbered on the device,
+    i.e. Ethernet4 before Ethernet12 and Ethernet0.1 before Ethernet0.10.
+    """
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name or "")]
+
+
+def encode_cursor(name: str) -> str:
+    return base64.urlsafe_b64encode(name.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor.encode()).decode()
+    except Exception:
+        raise ListQueryError("Invalid value of cursor.")
+
+
+def _get_int_param(params, name: str):
+    value = params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        value = int(value)
+    except ValueError:
+        raise ListQueryError(f"Invalid value of {name}.")
+    if value < 0:
+        raise ListQueryError(f"Invalid value of {name}.")
+    return value
+
+
+def filter_items(items: list, params, filters: dict) -> list:
+    """
+    Returns the items matching all filters given in the query parameters.
+
+    Args:
+        items (list): The list of items.
+        params (QueryDict): The query parameters.
+        filters (dict): Filter name as key and a function taking an item and the
+            filter value and returning True for matching items as value.
+
+    Returns:
+        list: The matching items.
+    """
+    active = [(fn, params.get(name)) for name, fn in filters.items() if params.get(name)]
+    if not active:
+        return items
+    return [item for item in items if all(fn(item, value) for fn, value in active)]
+
+
+def project_items(items: list, fields) -> list:
+    """
+    Returns copies of the items with only the given fields.
+
+    Args:
+        items (list): The list of items.
+        fields (str): Comma separated list of field names, all fields if empty.
+
+    Returns:
+        list: The projected items.
+    """
+    if not fields:
+        return items
+    names = [field.strip() for field in fields.split(",") if field.strip()]
+    return [{name: item[name] for name in names if name in item} for item in items]
+
+
+def paginate_items(items: list, params, key: str = "name"):
+    """
+    Returns a page of the items, ordered by the natural order of the key field.
+    Either limit and offset, or limit and cursor can be given. The cursor is
+    returned as "next" and points after the last item of the page, so paging
+    with it is stable when items are added or removed between requests.
+
+    Args:
+        items (list): The list of items.
+        params (QueryDict): The query parameters.
+        key (str): The field the items are ordered and the cursor is built by.
+
+    Returns:
+        dict: The page with "count", "next" and "results", or the items unchanged
+        if no paging parameter is given.
+    """
+    limit = _get_int_param(params, "limit")
+    offset = _get_int_param(params, "offset")
+    cursor = params.get("cursor")
+    if limit is None and offset is None and not cursor:
+        return items
+    if offset is not None and cursor:
+        raise ListQueryError("Only one of offset and cursor can be given.")
+
+    ordered = sorted(items, key=lambda item: natural_key(item.get(key)))
+    start = offset or 0
+    if cursor:
+        after = natural_key(decode_cursor(cursor))
+        start = next(
+            (i for i, item in enumerate(ordered) if natural_key(item.get(key)) > after),
+            len(ordered),
+        )
+    end = len(ordered) if limit is None else start + limit
+    page = ordered[start:end]
+    return {
+        "count": len(ordered),
+        "next": encode_cursor(page[-1].get(key)) if page and end < len(ordered) else None,
+        "results": page,
+    }
+
+
+def validate_list_query(params):
+    """
+    Checks the paging parameters without any items, e.g. before the items of
+    several devices are read.
+
+    Args:
+        params (QueryDict): The query parameters.
+
+    Raises:
+        ListQueryError: If a paging parameter is invalid.
+    """
+    paginate_items([], params)
+
+
+def apply_list_query(items, params, filters: dict, key: str = "name"):
+    """
+    Applies filters, paging and field selection given in the query parameters.
+    Paging runs on the unprojected items, so that the key field is always available.
+
+    Args:
+        items (list): The list of items.
+        params (QueryDict): The query parameters.
+        filters (dict): See filter_items.
+        key (str): See paginate_items.
+
+    Returns:
+        list or dict: The items, or the page if paging parameters are given.
+    """
+    if not isinstance(items, list):
+        return project_items([items], params.get("fields"))[0] if items else items
+    result = paginate_items(filter_items(items, params, filters), params, key)
+    if isinstance(result, dict):
+        return {**result, "results": project_items(result["results"], params.get("fields"))}
+    return project_items(result, params.get("fields"))
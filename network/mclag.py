@@ -11,7 +11,6 @@ from orca_nw_lib.mclag import (
     get_mclag_gw_mac,
     del_mclag_gw_mac,
     config_mclag_gw_mac,
-    get_mclag_mem_portchnls,
     config_mclag_mem_portchnl,
     del_mclag_member,
     remove_mclag_domain_fast_convergence,
@@ -20,6 +19,9 @@ from orca_nw_lib.mclag import (
 
 from log_manager.decorators import log_request
 from log_manager.logger import get_backend_logger
+from network.bulk_db import get_mclag_members_map
+from network.etag import conditional_get
+from network.fleet import fleet_response, is_fleet_request
 from network.util import (
     add_msg_to_list,
     get_failure_msg,
@@ -29,8 +31,36 @@ from network.util import (
 _logger = get_backend_logger()
 
 
+def get_mclag_snapshot(device_ip: str, domain_id=None):
+    """
+    Returns the MCLAG domains of a device with their member port channels and
+    the gateway MAC.
+
+    The gateway MAC is fetched once per device and the members of all domains
+    are fetched in one graph DB query, then joined to the domains by domain_id.
+
+    Args:
+        device_ip (str): The IP address of the device.
+        domain_id (int or str, optional): The MCLAG domain ID.
+
+    Returns:
+        list or dict: MCLAG details, same shape as returned by get_mclags.
+    """
+    data = get_mclags(device_ip, domain_id)
+    if not data:
+        return data
+    members = get_mclag_members_map(device_ip, domain_id)
+    gw_macs = get_mclag_gw_mac(device_ip)
+    for mclag in data if isinstance(data, list) else [data]:
+        mclag["mclag_members"] = members.get(str(mclag["domain_id"]), [])
+        if gw_macs:
+            mclag["gateway_mac"] = gw_macs[0].get("gateway_mac")
+    return data
+
+
 @api_view(["GET", "PUT", "DELETE"])
 @log_request
+@conditional_get(versioned=False)
 def device_mclag_list(request):
     """
     Retrieves a list of device MCLAGs.
@@ -47,6 +77,11 @@ def device_mclag_list(request):
     result = []
     http_status = True
     if request.method == "GET":
+        domain_id = request.GET.get("domain_id", None)
+        if is_fleet_request(request):
+            return fleet_response(
+                request, lambda ip: get_mclag_snapshot(ip, domain_id)
+            )
         device_ip = request.GET.get("mgt_ip", "")
         if not device_ip:
             _logger.error("Required field device mgt_ip not found.")
@@ -54,19 +89,7 @@ def device_mclag_list(request):
                 {"status": "Required field device mgt_ip not found."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        domain_id = request.GET.get("domain_id", None)
-        data = get_mclags(device_ip, domain_id)
-
-        mclag_gateway_mac_details = get_mclag_gw_mac(device_ip)
-
-        if data:
-            for i in data if isinstance(data, list) else [data]:
-                i["mclag_members"] = [
-                    mem["lag_name"]
-                    for mem in get_mclag_mem_portchnls(device_ip, i["domain_id"])
-                ]
-                if len(mclag_gateway_mac_details):
-                    i["gateway_mac"] = mclag_gateway_mac_details[0].get("gateway_mac")
+        data = get_mclag_snapshot(device_ip, domain_id)
         return (
             Response(data, status=status.HTTP_200_OK)
             if data
@@ -179,6 +202,7 @@ def device_mclag_list(request):
 
 @api_view(["GET", "PUT", "DELETE"])
 @log_request
+@conditional_get
 def mclag_gateway_mac(request):
     """
     Retrieves or configures the MCLAG gateway MAC address.
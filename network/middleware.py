@@ -0,0 +1,81 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.urls import Resolver404, resolve
+
+from network.cache import invalidate_device
+from orca_backend.fast_json import parse_request_body
+
+MUTATING_METHODS = ("PUT", "POST", "PATCH", "DELETE")
+
+
+class CacheInvalidationMiddleware:
+    """
+    Middleware to invalidate the cached network reads of every device targeted
+    by a mutating request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.method not in MUTATING_METHODS:
+            return self.get_response(request)
+
+        # Body has to be read before the view, DRF consumes the stream otherwise.
+        device_ips = self._get_device_ips(request)
+        response = self.get_response(request)
+        self._invalidate(request, device_ips)
+        return response
+
+    async def __acall__(self, request):
+        if request.method not in MUTATING_METHODS:
+            return await self.get_response(request)
+        device_ips = self._get_device_ips(request)
+        response = await self.get_response(request)
+        await sync_to_async(self._invalidate, thread_sensitive=False)(request, device_ips)
+        return response
+
+    def _invalidate(self, request, device_ips):
+        if device_ips:
+            for device_ip in device_ips:
+                invalidate_device(device_ip)
+        elif self._is_network_request(request):
+            invalidate_device()
+
+    @staticmethod
+    def _is_network_request(request):
+        try:
+            return resolve(request.path_info).func.__module__.startswith("network.")
+        except Resolver404:
+            return False
+
+    @staticmethod
+    def _get_device_ips(request):
+        """
+        Returns the device IPs found in the request body.
+
+        Parameters:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            set: The set of device IPs.
+        """
+        try:
+            body = parse_request_body(request) or []
+        except ValueError:
+            return set()
+        device_ips = set()
+        for i in body if isinstance(body, list) else [body]:
+            if not isinstance(i, dict):
+                continue
+            for key in ("mgt_ip", "address", "device_ips"):
+                value = i.get(key)
+                if value:
+                    device_ips.update(value if isinstance(value, list) else [value])
+        return device_ips
@@ -8,6 +8,14 @@ class ReDiscoveryConfig(models.Model):
     device_ip = models.CharField(max_length=64, primary_key=True)
     interval = models.IntegerField()
     last_discovered = models.DateTimeField(null=True)
+    # Bounds of the adaptive interval in minutes, the interval is fixed without them.
+    min_interval = models.IntegerField(null=True)
+    max_interval = models.IntegerField(null=True)
+    # Interval in minutes adapted to the changes found by the rediscoveries.
+    effective_interval = models.FloatField(null=True)
+    # Checksum of the discovered data, and whether the last rediscovery changed it.
+    last_checksum = models.CharField(max_length=64, null=True)
+    changed = models.BooleanField(null=True)
 
     objects = models.Manager()
 
@@ -0,0 +1,144 @@
+"""
+Suppression of configuration writes which would not change the device.
+
+Before an item of a PUT request is applied, its fields are compared with the
+current state of the object in the graph DB. Unchanged fields are left out of
+the config call and an item without any changed field is not applied at all, so
+that re-sent values, e.g. when a whole form is saved, cost no gNMI Set and no
+subscription round trip. The check is skipped with force=true, as query
+parameter or as field of the item.
+
+Only fields named the same in the request and in the state are compared, all
+others are always applied.
+"""
+from log_manager.logger import get_backend_logger
+from network.util import add_msg_to_list, get_success_msg
+
+_logger = get_backend_logger()
+
+FORCE_FIELD = "force"
+
+
+def is_forced(request, req_data: dict = None) -> bool:
+    """
+    Returns True if the request, if given, or the request item has force=true.
+    """
+    value = (request.GET.get(FORCE_FIELD) if request is not None else None) or (
+        (req_data or {}).get(FORCE_FIELD)
+    )
+    return str(value).lower() == "true"
+
+
+def _normalize(value):
+    """
+    Normalizes a value for comparison, as values in requests are often strings
+    of the values in the state, e.g. "true" for True and "9100" for 9100.
+    """
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, (int, float)):
+        return str(int(value)) if float(value).is_integer() else str(value)
+    if isinstance(value, str):
+        value = value.strip()
+        if value.lower() in ("true", "false"):
+            return value.lower()
+        try:
+            return _normalize(float(value))
+        except ValueError:
+            return value
+    if isinstance(value, (list, tuple, set)):
+        return sorted((_normalize(item) for item in value), key=str)
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    return value
+
+
+def values_equal(requested, current) -> bool:
+    return _normalize(requested) == _normalize(current)
+
+
+def diff_item(req_data: dict, current: dict, compared_fields, key_fields=("mgt_ip", "name")):
+    """
+    Splits the fields of a request item into the fields to apply and the fields
+    which already have the requested value.
+
+    Args:
+        req_data (dict): The request item.
+        current (dict): The current state of the object, None if it does not exist.
+        compared_fields (iterable): The fields compared with the state.
+        key_fields (iterable): The fields identifying the object, always kept.
+
+    Returns:
+        tuple: The request item without the unchanged fields, the list of
+        applied fields and the list of skipped fields.
+    """
+    item = {}
+    applied = []
+    skipped = []
+    for field, value in req_data.items():
+        if field == FORCE_FIELD:
+            continue
+        if field in key_fields or value is None:
+            item[field] = value
+        elif (
+            current
+            and field in compared_fields
+            and field in current
+            and values_equal(value, current[field])
+        ):
+            skipped.append(field)
+        else:
+            item[field] = value
+            applied.append(field)
+    return item, applied, skipped
+
+
+def _get_current(get_state, req_data: dict):
+    try:
+        current = get_state(req_data)
+    except Exception as err:
+        # Without the state every field is applied, as without the check.
+        _logger.error("Failed to read the state of %s: %s", req_data, err)
+        return None
+    if isinstance(current, list):
+        return current[0] if len(current) == 1 else None
+    return current or None
+
+
+def apply_changed_fields(request, req_data: dict, result: list, get_state, compared_fields,
+                         apply_fn, key_fields=("mgt_ip", "name")) -> bool:
+    """
+    Applies a request item with apply_fn, without its unchanged fields. An item
+    without changed fields is not applied. The applied and skipped fields are
+    added to the first message of the item.
+
+    Args:
+        request (Request): The request object.
+        req_data (dict): The validated request item.
+        result (list): The list the messages of the item are added to.
+        get_state (callable): Returns the current state of the object of an item.
+        compared_fields (iterable): The fields compared with the state.
+        apply_fn (callable): The helper applying an item, as passed to run_per_device.
+        key_fields (iterable): The fields identifying the object.
+
+    Returns:
+        bool: The result of apply_fn, True if the item was skipped.
+    """
+    if is_forced(request, req_data):
+        item = {field: value for field, value in req_data.items() if field != FORCE_FIELD}
+        applied = [field for field, value in item.items() if field not in key_fields and value is not None]
+        skipped = []
+    else:
+        item, applied, skipped = diff_item(
+            req_data, _get_current(get_state, req_data), compared_fields, key_fields
+        )
+        if skipped and not applied:
+            msg = get_success_msg(request)
+            msg["message"] = f"{request.method} request skipped, no changes"
+            msg.update(applied=[], skipped=skipped)
+            add_msg_to_list(result, msg)
+            return True
+    succeeded = apply_fn(request, item, result)
+    if msg := next((msg for msg in result if isinstance(msg, dict)), None):
+        msg.update(applied=applied, skipped=skipped)
+    return succeeded
@@ -8,7 +8,6 @@ from orca_nw_lib.port_chnl import (
     get_port_chnl,
     add_port_chnl,
     del_port_chnl,
-    get_port_chnl_members,
     add_port_chnl_mem,
     del_port_chnl_mem,
     remove_port_chnl_ip,
@@ -17,15 +16,58 @@ from orca_nw_lib.port_chnl import (
 )
 from log_manager.decorators import log_request
 from log_manager.logger import get_backend_logger
+from network.bulk_db import get_port_chnl_members_map
+from network.executor import run_per_device
+from network.fleet import fleet_response, is_fleet_request
+from network.noop import apply_changed_fields
 from network.util import add_msg_to_list, get_failure_msg, get_success_msg
 from orca_nw_lib.port_chnl import add_port_chnl_vlan_members
 from network.models import IPAvailability
+from network.etag import conditional_get
 
 _logger = get_backend_logger()
 
+# Config fields compared with the port channel state before a PUT is applied.
+# Members and VLAN members are always applied.
+PORT_CHNL_COMPARED_FIELDS = (
+    "admin_sts",
+    "mtu",
+    "static",
+    "min_links",
+    "fast_rate",
+    "description",
+    "fallback",
+    "graceful_shutdown_mode",
+    "ip_address",
+)
+
+
+def get_port_chnl_list(device_ip: str, port_chnl_name: str = None):
+    """
+    Returns the port channels of a device with their member interfaces.
+
+    Members of all port channels are fetched in one graph DB query and joined
+    in memory, instead of one members query per port channel.
+
+    Args:
+        device_ip (str): The IP address of the device.
+        port_chnl_name (str, optional): The name of the port channel.
+
+    Returns:
+        list or dict: Port channel details, same shape as returned by get_port_chnl.
+    """
+    data = get_port_chnl(device_ip, port_chnl_name)
+    if not data:
+        return data
+    members = get_port_chnl_members_map(device_ip, port_chnl_name)
+    for chnl in data if isinstance(data, list) else [data]:
+        chnl["members"] = members.get(chnl["lag_name"], [])
+    return data
+
 
 @api_view(["GET", "PUT", "DELETE"])
 @log_request
+@conditional_get(versioned=False)
 def device_port_chnl_list(request):
     """
     Handles the device port channel list API.
@@ -49,6 +91,11 @@ def device_port_chnl_list(request):
     result = []
     http_status = True
     if request.method == "GET":
+        port_chnl_name = request.GET.get("lag_name", "")
+        if is_fleet_request(request):
+            return fleet_response(
+                request, lambda ip: get_port_chnl_list(ip, port_chnl_name)
+            )
         device_ip = request.GET.get("mgt_ip", "")
         if not device_ip:
             _logger.error("Required field device mgt_ip not found.")
@@ -56,14 +103,7 @@ def device_port_chnl_list(request):
                 {"status": "Required field device mgt_ip not found."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        port_chnl_name = request.GET.get("lag_name", "")
-        data = get_port_chnl(device_ip, port_chnl_name)
-
-        for chnl in data if isinstance(data, list) else [data] if data else []:
-            chnl["members"] = [
-                intf["name"]
-                for intf in get_port_chnl_members(device_ip, chnl["lag_name"])
-            ]
+        data = get_port_chnl_list(device_ip, port_chnl_name)
         return (
             Response(data, status=status.HTTP_200_OK)
             if data
@@ -98,72 +138,7 @@ def device_port_chnl_list(request):
                         {"status": str(e)},
                         status=status.HTTP_400_BAD_REQUEST,
                     )
-            try:
-                add_port_chnl(
-                    device_ip,
-                    req_data.get("lag_name"),
-                    admin_status=req_data.get("admin_sts"),
-                    mtu=int(req_data.get("mtu")) if "mtu" in req_data else None,
-                    static=req_data.get("static", None),
-                    min_links=(
-                        int(req_data.get("min_links"))
-                        if "min_links" in req_data
-                        else None
-                    ),
-                    fast_rate=req_data.get("fast_rate", None),
-                    description=req_data.get("description", None),
-                    fallback=req_data.get("fallback", None),
-                    graceful_shutdown_mode=req_data.get("graceful_shutdown_mode", None),
-                    ip_addr_with_prefix=ip_with_prefix,
-                )
-                if ip_with_prefix:
-                    # removing ip usage for the port channel if already exists
-                    IPAvailability.remove_usage_by_device_ip_and_used_in(
-                        device_ip=device_ip, used_in=req_data.get("lag_name")
-                    )
-                    
-                    # adding ip usage
-                    IPAvailability.add_ip_usage(
-                        ip=ip_with_prefix, device_ip=device_ip, used_in=req_data.get("lag_name")
-                    )
-                add_msg_to_list(result, get_success_msg(request))
-                _logger.info("Added port channel: %s", req_data.get("lag_name"))
-            except Exception as err:
-                add_msg_to_list(result, get_failure_msg(err, request))
-                http_status = http_status and False
-                _logger.error("Failed to add port channel: %s", req_data.get("lag_name"))
-
-            try:
-                if members := req_data.get("members"):
-                    add_port_chnl_mem(
-                        device_ip,
-                        req_data.get("lag_name"),
-                        members,
-                    )
-                    add_msg_to_list(result, get_success_msg(request))
-                    _logger.info("Added port channel members: %s", members)
-            except Exception as err:
-                add_msg_to_list(result, get_failure_msg(err, request))
-                http_status = http_status and False
-                _logger.error(f"Failed to add port channel members: {err}",)
-
-            # some time add port channel vlan members might fail due to L3 configuration etc.
-            # hence try catch block and send additional failure message if it fails.
-            try:
-                if vlan_member := req_data.get("vlan_members"):
-                    if_mode = IFMode.get_enum_from_str(vlan_member.get("if_mode"))
-                    vlan_ids = vlan_member.get("vlan_ids")
-                    add_port_chnl_vlan_members(
-                        device_ip=device_ip,
-                        chnl_name=req_data.get("lag_name"),
-                        if_mode=if_mode,
-                        vlan_ids=vlan_ids,
-                    )
-                    _logger.info("Added port channel vlan members: %s", vlan_ids)
-            except Exception as err:
-                add_msg_to_list(result, get_failure_msg(err, request))
-                http_status = http_status and False
-                _logger.error(f"Failed to add port channel vlan members: {err}",)
+        result, http_status = run_per_device(request, req_data_list, _config_port_chnl)
 
     elif request.method == "DELETE":
         req_data_list = (
@@ -177,15 +152,7 @@ def device_port_chnl_list(request):
                     {"status": "Required field device mgt_ip not found."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-
-            try:
-                del_port_chnl(device_ip, req_data.get("lag_name"))
-                add_msg_to_list(result, get_success_msg(request))
-                _logger.info("Deleted port channel: %s", req_data.get("lag_name"))
-            except Exception as err:
-                add_msg_to_list(result, get_failure_msg(err, request))
-                http_status = http_status and False
-                _logger.error("Failed to delete port channel: %s", req_data.get("lag_name"))
+        result, http_status = run_per_device(request, req_data_list, _delete_port_chnl)
 
     return Response(
         {"result": result},
@@ -195,6 +162,137 @@ def device_port_chnl_list(request):
     )
 
 
+def _config_port_chnl(request, req_data, result) -> bool:
+    """
+    Applies the port channel config, members and VLAN members of one validated
+    PUT request item, without the fields the port channel already has.
+
+    Args:
+        request (Request): The request object.
+        req_data (dict): The request item.
+        result (list): The list the messages of the item are added to.
+
+    Returns:
+        bool: True if all parts of the item were applied or it had no changes.
+    """
+    return apply_changed_fields(
+        request,
+        req_data,
+        result,
+        lambda item: get_port_chnl(item.get("mgt_ip"), item.get("lag_name")),
+        PORT_CHNL_COMPARED_FIELDS,
+        _set_port_chnl_config,
+        key_fields=("mgt_ip", "lag_name"),
+    )
+
+
+def _set_port_chnl_config(request, req_data, result) -> bool:
+    """
+    Applies the port channel config, members and VLAN members of one request item.
+
+    Args:
+        request (Request): The request object.
+        req_data (dict): The request item.
+        result (list): The list the messages of the item are added to.
+
+    Returns:
+        bool: True if all parts of the item were applied.
+    """
+    device_ip = req_data.get("mgt_ip")
+    ip_with_prefix = req_data.get("ip_address", None)
+    succeeded = True
+    try:
+        add_port_chnl(
+            device_ip,
+            req_data.get("lag_name"),
+            admin_status=req_data.get("admin_sts"),
+            mtu=int(req_data.get("mtu")) if "mtu" in req_data else None,
+            static=req_data.get("static", None),
+            min_links=(
+                int(req_data.get("min_links"))
+                if "min_links" in req_data
+                else None
+            ),
+            fast_rate=req_data.get("fast_rate", None),
+            description=req_data.get("description", None),
+            fallback=req_data.get("fallback", None),
+            graceful_shutdown_mode=req_data.get("graceful_shutdown_mode", None),
+            ip_addr_with_prefix=ip_with_prefix,
+        )
+        if ip_with_prefix:
+            # removing ip usage for the port channel if already exists
+            IPAvailability.remove_usage_by_device_ip_and_used_in(
+                device_ip=device_ip, used_in=req_data.get("lag_name")
+            )
+
+            # adding ip usage
+            IPAvailability.add_ip_usage(
+                ip=ip_with_prefix, device_ip=device_ip, used_in=req_data.get("lag_name")
+            )
+        add_msg_to_list(result, get_success_msg(request))
+        _logger.info("Added port channel: %s", req_data.get("lag_name"))
+    except Exception as err:
+        add_msg_to_list(result, get_failure_msg(err, request))
+        succeeded = False
+        _logger.error("Failed to add port channel: %s", req_data.get("lag_name"))
+
+    try:
+        if members := req_data.get("members"):
+            add_port_chnl_mem(
+                device_ip,
+                req_data.get("lag_name"),
+                members,
+            )
+            add_msg_to_list(result, get_success_msg(request))
+            _logger.info("Added port channel members: %s", members)
+    except Exception as err:
+        add_msg_to_list(result, get_failure_msg(err, request))
+        succeeded = False
+        _logger.error(f"Failed to add port channel members: {err}",)
+
+    # some time add port channel vlan members might fail due to L3 configuration etc.
+    # hence try catch block and send additional failure message if it fails.
+    try:
+        if vlan_member := req_data.get("vlan_members"):
+            if_mode = IFMode.get_enum_from_str(vlan_member.get("if_mode"))
+            vlan_ids = vlan_member.get("vlan_ids")
+            add_port_chnl_vlan_members(
+                device_ip=device_ip,
+                chnl_name=req_data.get("lag_name"),
+                if_mode=if_mode,
+                vlan_ids=vlan_ids,
+            )
+            _logger.info("Added port channel vlan members: %s", vlan_ids)
+    except Exception as err:
+        add_msg_to_list(result, get_failure_msg(err, request))
+        succeeded = False
+        _logger.error(f"Failed to add port channel vlan members: {err}",)
+    return succeeded
+
+
+def _delete_port_chnl(request, req_data, result) -> bool:
+    """
+    Deletes the port channel of one validated DELETE request item.
+
+    Args:
+        request (Request): The request object.
+        req_data (dict): The request item.
+        result (list): The list the messages of the item are added to.
+
+    Returns:
+        bool: True if the port channel was deleted.
+    """
+    try:
+        del_port_chnl(req_data.get("mgt_ip"), req_data.get("lag_name"))
+        add_msg_to_list(result, get_success_msg(request))
+        _logger.info("Deleted port channel: %s", req_data.get("lag_name"))
+        return True
+    except Exception as err:
+        add_msg_to_list(result, get_failure_msg(err, request))
+        _logger.error("Failed to delete port channel: %s", req_data.get("lag_name"))
+        return False
+
+
 @api_view(["PUT", "DELETE"])
 @log_request
 def port_chnl_mem_ethernet(request):
@@ -11,6 +11,9 @@ from orca_nw_lib.portgroup import (
 
 from log_manager.decorators import log_request
 from log_manager.logger import get_backend_logger
+from network.cache import cached_read
+from network.etag import conditional_get
+from network.fleet import fleet_response, is_fleet_request
 from network.util import (
     add_msg_to_list,
     get_failure_msg,
@@ -19,9 +22,12 @@ from network.util import (
 
 _logger = get_backend_logger()
 
+get_port_groups_cached = cached_read("groups")(get_port_groups)
+
 
 @api_view(["GET", "PUT"])
 @log_request
+@conditional_get
 def port_groups(request):
     """
     This function handles the API view for listing and updating port groups.
@@ -33,6 +39,11 @@ def port_groups(request):
     - The HTTP response object containing the result of the operation.
     """
     if request.method == "GET":
+        port_group_id = request.GET.get("port_group_id", None)
+        if is_fleet_request(request):
+            return fleet_response(
+                request, lambda ip: get_port_groups_cached(ip, port_group_id)
+            )
         device_ip = request.GET.get("mgt_ip", "")
         if not device_ip:
             _logger.error("Required field device mgt_ip not found.")
@@ -40,8 +51,7 @@ def port_groups(request):
                 {"status": "Required field device mgt_ip not found."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        port_group_id = request.GET.get("port_group_id", None)
-        data = get_port_groups(device_ip, port_group_id)
+        data = get_port_groups_cached(device_ip, port_group_id)
         return (
             Response(data, status.HTTP_200_OK)
             if data
@@ -98,6 +108,7 @@ def port_groups(request):
         "GET",
     ]
 )
+@conditional_get
 def port_group_members(request):
     """
     This function handles the API view for listing port group members.
@@ -133,6 +144,7 @@ def port_group_members(request):
         "GET",
     ]
 )
+@conditional_get
 def port_group_from_intfc_name(request):
     """
     This function handles the API view for listing port group members.
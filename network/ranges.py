@@ -0,0 +1,215 @@
+"""
+Range and selector expressions for interface names in configuration requests.
+
+Instead of a single interface name, the interface fields of PUT request items
+accept an expression, which is expanded against the interface list of the
+device:
+
+- ``Ethernet0-Ethernet124`` or ``Ethernet0-124``: all interfaces with the
+  prefix and a number in the range, bounds included.
+- ``Ethernet0-Ethernet124 step 4``: every 4th interface of the range, counted
+  from the first bound.
+- ``all`` or ``all ports``: all interfaces of the device, without sub-interfaces.
+- ``all 100G ports`` or ``all 100G``: all interfaces of the speed, given in G or M.
+- A comma separated list of the above and of plain interface names.
+
+Names that are no expression are passed unchanged, so that requests with plain
+interface names behave as before.
+"""
+import re
+
+from network.list_query import natural_key
+
+_RANGE = re.compile(
+    r"^(?P<prefix>[A-Za-z]+)(?P<start>\d+)\s*-\s*(?:(?P<end_prefix>[A-Za-z]+))?(?P<end>\d+)"
+    r"(?:\s+step\s+(?P<step>\d+))?$",
+    re.IGNORECASE,
+)
+_SELECTOR = re.compile(
+    r"^all(?:\s+(?P<speed>\d+(?:\.\d+)?)\s*(?P<unit>[GM])(?:B|bps)?)?(?:\s+ports?)?$",
+    re.IGNORECASE,
+)
+_NAME = re.compile(r"^(?P<prefix>[A-Za-z]+)(?P<number>\d+)$")
+
+
+class RangeExpressionError(ValueError):
+    """
+    Raised for an invalid interface expression, or one matching no interface.
+    """
+
+
+def _terms(expression: str) -> list:
+    return [term.strip() for term in expression.split(",") if term.strip()]
+
+
+def _is_expression_term(term: str) -> bool:
+    return bool(_RANGE.match(term) or _SELECTOR.match(term))
+
+
+def is_interface_expression(name) -> bool:
+    """
+    Returns True if the name is a range or selector expression, rather than a
+    plain interface name.
+    """
+    if not isinstance(name, str):
+        return False
+    terms = _terms(name)
+    return len(terms) > 1 or any(_is_expression_term(term) for term in terms)
+
+
+def _speed_name(speed: str, unit: str) -> str:
+    """
+    Returns the speed as named in the interface data, e.g. SPEED_100GB for 100G
+    and SPEED_2500MB for 2.5G.
+    """
+    value = float(speed)
+    if unit.upper() == "G" and value.is_integer():
+        return f"SPEED_{int(value)}GB"
+    megabits = value * 1000 if unit.upper() == "G" else value
+    return f"SPEED_{int(megabits)}MB"
+
+
+def _expand_term(term: str, interfaces: list) -> list:
+    if match := _SELECTOR.match(term):
+        ports = [intf for intf in interfaces if _NAME.match(str(intf.get("name", "")))]
+        if match.group("speed"):
+            speed = _speed_name(match.group("speed"), match.group("unit"))
+            ports = [intf for intf in ports if str(intf.get("speed", "")).upper() == speed]
+        return [intf["name"] for intf in ports]
+    if match := _RANGE.match(term):
+        prefix = match.group("prefix")
+        end_prefix = match.group("end_prefix")
+        if end_prefix and end_prefix.lower() != prefix.lower():
+            raise RangeExpressionError(f"Range {term} has different interface prefixes.")
+        start, end = int(match.group("start")), int(match.group("end"))
+        step = int(match.group("step") or 1)
+        if start > end:
+            raise RangeExpressionError(f"Range {term} has a start greater than its end.")
+        if step < 1:
+            raise RangeExpressionError(f"Range {term} has an invalid step.")
+        names = []
+        for intf in interfaces:
+            name_match = _NAME.match(str(intf.get("name", "")))
+            if not name_match or name_match.group("prefix").lower() != prefix.lower():
+                continue
+            number = int(name_match.group("number"))
+            if start <= number <= end and (number - start) % step == 0:
+                names.append(intf["name"])
+        return names
+    return [term]
+
+
+def expand_interface_expression(expression: str, interfaces: list) -> list:
+    """
+    Expands an interface expression against the interface list of a device.
+
+    Args:
+        expression (str): The expression, or a plain interface name.
+        interfaces (list): The interfaces of the device, each with name and speed.
+
+    Returns:
+        list: The interface names, without duplicates, in interface order.
+
+    Raises:
+        RangeExpressionError: If a range or selector of the expression matches
+        no interface.
+    """
+    if not is_interface_expression(expression):
+        return [expression]
+    names = []
+    for term in _terms(expression):
+        expanded = _expand_term(term, interfaces)
+        if not expanded:
+            raise RangeExpressionError(f"Interface expression {term} matches no interface.")
+        names.extend(expanded)
+    return sorted(dict.fromkeys(names), key=natural_key)
+
+
+class _DeviceInterfaces:
+    """
+    Fetches the interface list of each device at most once per request.
+    """
+
+    def __init__(self, get_interfaces):
+        self._get_interfaces = get_interfaces
+        self._interfaces = {}
+
+    def get(self, device_ip: str) -> list:
+        if device_ip not in self._interfaces:
+            self._interfaces[device_ip] = self._get_interfaces(device_ip) or []
+        return self._interfaces[device_ip]
+
+
+def expand_request_items(req_data_list: list, get_interfaces, field: str = "name") -> list:
+    """
+    Replaces every request item whose interface field holds an expression with
+    one copy of the item per matched interface.
+
+    Args:
+        req_data_list (list): The request items, each with mgt_ip.
+        get_interfaces (callable): Returns the interface list of a device IP.
+        field (str): The field holding the interface name.
+
+    Returns:
+        list: The expanded request items, in request order.
+
+    Raises:
+        RangeExpressionError: If an expression is invalid for its device.
+    """
+    devices = _DeviceInterfaces(get_interfaces)
+    expanded = []
+    for req_data in req_data_list:
+        name = req_data.get(field)
+        if not is_interface_expression(name):
+            expanded.append(req_data)
+            continue
+        device_ip = req_data.get("mgt_ip")
+        try:
+            names = expand_interface_expression(name, devices.get(device_ip))
+        except RangeExpressionError as err:
+            raise RangeExpressionError(f"{err} Device: {device_ip}.") from err
+        expanded.extend({**req_data, field: if_name} for if_name in names)
+    return expanded
+
+
+def expand_member_items(req_data_list: list, get_interfaces, field: str = "mem_ifs") -> list:
+    """
+    Expands the expressions in the keys of a member map, e.g. the interface to
+    tagging mode map of a VLAN, of every request item.
+
+    Args:
+        req_data_list (list): The request items, each with mgt_ip.
+        get_interfaces (callable): Returns the interface list of a device IP.
+        field (str): The field holding the member map.
+
+    Returns:
+        list: The request items, with the member maps expanded.
+
+    Raises:
+        RangeExpressionError: If an expression is invalid for its device.
+    """
+    devices = _DeviceInterfaces(get_interfaces)
+    expanded = []
+    for req_data in req_data_list:
+        members = req_data.get(field)
+        if not isinstance(members, dict) or not any(map(is_interface_expression, members)):
+            expanded.append(req_data)
+            continue
+        device_ip = req_data.get("mgt_ip")
+        expanded_members = {}
+        for name, value in members.items():
+            try:
+                names = expand_interface_expression(name, devices.get(device_ip))
+            except RangeExpressionError as err:
+                raise RangeExpressionError(f"{err} Device: {device_ip}.") from err
+            for if_name in names:
+                expanded_members[if_name] = value
+        expanded.append({**req_data, field: expanded_members})
+    return expanded
+
+
+def has_interface_expression(req_data_list: list, field: str = "name") -> bool:
+    """
+    Returns True if the interface field of any request item holds an expression.
+    """
+    return any(is_interface_expression(req_data.get(field)) for req_data in req_data_list)
@@ -1,56 +1,362 @@
+"""
+Rediscovery of the devices configured in ReDiscoveryConfig.
+
+Every process running the scheduler has a single job, rediscovery_tick, which
+runs every TICK seconds. Only the process holding the leader lease acts on a
+tick: it starts the discoveries of the devices whose interval has elapsed, at
+most MAX_CONCURRENT at a time. The schedules are read from the database on every
+tick, so that they survive restarts and are shared by all processes.
+
+The due time of a device is offset by a jitter derived from its IP address, so
+that devices configured together are not discovered at the same moment.
+
+A device with min_interval and max_interval is rediscovered at an adaptive
+interval: a checksum of its discovered data is compared after every
+rediscovery, the interval shrinks when the data changed and grows when it did
+not, within the bounds.
+
+With the "redis" backend the lease and the running discoveries are kept in
+redis, and the discoveries are enqueued as celery tasks. The "memory" backend
+is for a single process, which is always the leader and runs the discoveries
+on a local thread pool.
+"""
 import datetime
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
 from apscheduler.schedulers.background import BackgroundScheduler
+from django.conf import settings
+from django.db import connections
+from orca_nw_lib.bgp import get_bgp_neighbors
+from orca_nw_lib.interface import get_interface
+
 from log_manager.logger import get_backend_logger
-from orca_nw_lib.discovery import discover_device
+from network.bulk_db import get_port_chnl_members_map, get_vlan_members_map
+from network.cache import invalidate_device
+from network.discovery import discover_devices
+from network.interface import INTERFACE_COMPARED_FIELDS
 from network.models import ReDiscoveryConfig
 from state_manager.models import ORCABusyState, State
 
 _logger = get_backend_logger()
 scheduler = BackgroundScheduler()
 
+# Config fields of the discovered data covered by the checksum. Oper state and
+# counters change without a config change and are left out.
+CHECKSUM_BGP_NEIGHBOR_FIELDS = ("neighbor_ip", "vrf_name", "remote_asn", "local_asn", "admin_status")
+
+_RENEW_LEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class MemoryCoordinator:
+    """
+    Coordinator of a single process, always the leader.
+    """
+
+    def __init__(self, max_concurrent: int):
+        self._running = set()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_concurrent, thread_name_prefix="orca_rediscovery"
+        )
+
+    def is_leader(self) -> bool:
+        return True
+
+    def running(self) -> set:
+        with self._lock:
+            return set(self._running)
+
+    def start(self, device_ip: str) -> bool:
+        """
+        Starts the discovery of the device, unless it is running.
+
+        Returns:
+            bool: True if the discovery was started.
+        """
+        with self._lock:
+            if device_ip in self._running:
+                return False
+            self._running.add(device_ip)
+        self._pool.submit(self._run, device_ip)
+        return True
+
+    def _run(self, device_ip: str):
+        try:
+            scheduled_discovery(device_ip)
+        finally:
+            connections.close_all()
+            self.finish(device_ip)
+
+    def finish(self, device_ip: str):
+        with self._lock:
+            self._running.discard(device_ip)
+
+
+class RedisCoordinator:
+    """
+    Coordinator shared by all processes. The leader lease is renewed by its
+    holder on every tick and expires if the holder stops. A running discovery
+    is dropped from the running set when its task finishes, or after RUN_TTL.
+    """
+
+    def __init__(self, url: str, lease_ttl: int, run_ttl: int, prefix: str = "orca_rediscovery"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.lease_ttl = lease_ttl
+        self.run_ttl = run_ttl
+        self.leader_key = f"{prefix}:leader"
+        self.running_key = f"{prefix}:running"
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
 
-def add_scheduler(device_ip, interval):
-    """ Adds a new scheduler job for the given device.
+    def is_leader(self) -> bool:
+        if self.client.set(self.leader_key, self.owner, nx=True, ex=self.lease_ttl):
+            _logger.info("Rediscovery scheduler %s is the leader.", self.owner)
+            return True
+        return bool(self.client.eval(_RENEW_LEASE, 1, self.leader_key, self.owner, self.lease_ttl))
+
+    def running(self) -> set:
+        self.client.zremrangebyscore(self.running_key, "-inf", time.time())
+        return {device_ip.decode() for device_ip in self.client.zrange(self.running_key, 0, -1)}
+
+    def start(self, device_ip: str) -> bool:
+        """
+        Enqueues the discovery of the device, unless it is running.
+
+        Returns:
+            bool: True if the discovery was enqueued.
+        """
+        if not self.client.zadd(self.running_key, {device_ip: time.time() + self.run_ttl}, nx=True):
+            return False
+        from network.tasks import rediscovery_task
+
+        try:
+            rediscovery_task.apply_async(kwargs={"device_ip": device_ip})
+        except Exception:
+            self.finish(device_ip)
+            raise
+        return True
+
+    def finish(self, device_ip: str):
+        self.client.zrem(self.running_key, device_ip)
+
+
+_coordinator = None
+_coordinator_lock = threading.Lock()
+
+
+def get_coordinator():
+    """
+    Returns the coordinator configured by settings.ORCA_REDISCOVERY.
+    """
+    global _coordinator
+    if _coordinator is None:
+        with _coordinator_lock:
+            if _coordinator is None:
+                config = settings.ORCA_REDISCOVERY
+                if config["BACKEND"] == "redis":
+                    _coordinator = RedisCoordinator(
+                        config["REDIS_URL"], 3 * config["TICK"], config["RUN_TTL"]
+                    )
+                else:
+                    _coordinator = MemoryCoordinator(config["MAX_CONCURRENT"])
+    return _coordinator
+
+
+def get_interval(config) -> float:
+    """
+    Returns the rediscovery interval of the device in minutes, the adapted one
+    within the bounds if set, otherwise the configured one.
+    """
+    if config.min_interval is None or config.max_interval is None:
+        return config.interval
+    interval = config.effective_interval or config.interval
+    return min(max(interval, config.min_interval), config.max_interval)
+
+
+def get_device_checksum(device_ip: str) -> str:
+    """
+    Returns a checksum of the discovered config of the device in the graph DB:
+    the config fields of the interfaces and BGP neighbors, and the members of
+    the port channels and VLANs.
 
     Args:
         device_ip (str): Device IP address.
-        interval (int): Interval in minutes.
+
+    Returns:
+        str: The SHA-256 hex digest.
+    """
+    nbrs = get_bgp_neighbors(device_ip=device_ip) or []
+    data = {
+        "interface": _select(
+            get_interface(device_ip) or [], ("name", *INTERFACE_COMPARED_FIELDS)
+        ),
+        "port_chnl": get_port_chnl_members_map(device_ip),
+        "vlan": get_vlan_members_map(device_ip),
+        "bgp_neighbor": _select(
+            nbrs if isinstance(nbrs, list) else [nbrs], CHECKSUM_BGP_NEIGHBOR_FIELDS
+        ),
+    }
+    return hashlib.sha256(_dumps(_canonical(data)).encode()).hexdigest()
+
+
+def _select(items: list, fields: tuple) -> list:
+    return [{field: item.get(field) for field in fields} for item in items]
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _canonical(value):
+    # Graph DB results come in no particular order.
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return sorted((_canonical(item) for item in value), key=_dumps)
+    return value
+
+
+def adapt_interval(config, checksum: str):
+    """
+    Records the checksum of a rediscovery and adapts the interval of the device.
+
+    The interval is multiplied by SHRINK_FACTOR when the checksum changed and by
+    GROW_FACTOR when it did not, within min_interval and max_interval.
+
+    Args:
+        config (ReDiscoveryConfig): The rediscovery config of the device, not saved.
+        checksum (str): The checksum of the discovered data.
 
     Returns:
         None
     """
-    scheduler.add_job(
-        func=scheduled_discovery,
-        trigger='interval',
-        minutes=interval,
-        max_instances=1,
-        args=[device_ip],
-        id=f"job_{device_ip}",
-        replace_existing=True
-    )
-    if not scheduler.running:
-        scheduler.start()
+    if config.last_checksum is not None:
+        config.changed = checksum != config.last_checksum
+        if config.min_interval is not None and config.max_interval is not None:
+            factor = settings.ORCA_REDISCOVERY[
+                "SHRINK_FACTOR" if config.changed else "GROW_FACTOR"
+            ]
+            config.effective_interval = min(
+                max(get_interval(config) * factor, config.min_interval), config.max_interval
+            )
+            _logger.info(
+                "Rediscovery interval of device %s is %.1f minutes.",
+                config.device_ip, config.effective_interval,
+            )
+    config.last_checksum = checksum
 
 
-def remove_scheduler(device_ip):
+def get_jitter(device_ip: str, interval: int, max_jitter: int) -> float:
     """
-    Removes a scheduler job for the given device.
+    Returns the offset of the due time of the device, in seconds.
 
     Args:
         device_ip (str): Device IP address.
+        interval (int): Interval in minutes.
+        max_jitter (int): Maximum offset in seconds.
+
+    Returns:
+        float: The offset, the same for every call with the device, at most
+        max_jitter and a tenth of the interval.
+    """
+    bound = int(min(max_jitter, interval * 6) * 1000)
+    if bound <= 0:
+        return 0.0
+    return zlib.crc32(device_ip.encode()) % bound / 1000
+
+
+def get_due_devices(configs, now: datetime.datetime, max_jitter: int) -> list:
+    """
+    Returns the devices whose rediscovery is due.
+
+    Args:
+        configs (iterable): ReDiscoveryConfig objects.
+        now (datetime.datetime): The current time.
+        max_jitter (int): Maximum offset of the due times in seconds.
+
+    Returns:
+        list: The device IP addresses, the longest overdue first.
+    """
+    due = []
+    for config in configs:
+        if config.last_discovered is None:
+            due_time = now
+        else:
+            interval = get_interval(config)
+            due_time = config.last_discovered + datetime.timedelta(
+                minutes=interval,
+                seconds=get_jitter(config.device_ip, interval, max_jitter),
+            )
+        if due_time <= now:
+            due.append((due_time, config.device_ip))
+    return [device_ip for _, device_ip in sorted(due)]
+
+
+def rediscovery_tick():
+    """
+    Starts the due rediscoveries, if this process is the leader.
+
+    Returns:
+        None
+    """
+    config = settings.ORCA_REDISCOVERY
+    coordinator = get_coordinator()
+    try:
+        if not coordinator.is_leader():
+            return
+        running = coordinator.running()
+        slots = config["MAX_CONCURRENT"] - len(running)
+        if slots <= 0:
+            return
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        for device_ip in get_due_devices(ReDiscoveryConfig.objects.all(), now, config["JITTER"]):
+            if slots <= 0:
+                break
+            if device_ip not in running and coordinator.start(device_ip):
+                _logger.info("Started rediscovery of device %s.", device_ip)
+                slots -= 1
+    except Exception as e:
+        _logger.error(f"Failed to run rediscovery scheduler, Reason: {e}")
+
+
+def start_scheduler():
+    """
+    Starts the rediscovery scheduler of the process, if not running.
 
     Returns:
         None
     """
-    job_id = f"job_{device_ip}"
-    jobs = scheduler.get_jobs()
-    if job_id in [job.id for job in jobs]:
-        scheduler.remove_job(f"job_{device_ip}")
+    scheduler.add_job(
+        func=rediscovery_tick,
+        trigger='interval',
+        seconds=settings.ORCA_REDISCOVERY["TICK"],
+        max_instances=1,
+        coalesce=True,
+        id="rediscovery_tick",
+        replace_existing=True
+    )
+    if not scheduler.running:
+        scheduler.start()
 
 
 def scheduled_discovery(device_ip: str):
     """
-    Schedules discovery for the given device.
+    Discovers the given device, unless busy, and records the discovery time and
+    the checksum of the discovered data.
 
     Args:
         device_ip (str): Device IP address.
@@ -58,16 +364,33 @@ def scheduled_discovery(device_ip: str):
     Returns:
         None
     """
+    checksum = None
+    acquired = False
     try:
-        state_obj = ORCABusyState.objects.filter(device_ip=device_ip).first()
-        if state_obj is None:
-            ORCABusyState.update_state(device_ip, State.SCHEDULED_DISCOVERY_IN_PROGRESS)
-            discover_device(device_ips=[device_ip])
+        _, acquired = ORCABusyState.objects.get_or_create(
+            device_ip=device_ip,
+            defaults={
+                "state": str(State.SCHEDULED_DISCOVERY_IN_PROGRESS),
+                "last_updated_time": datetime.datetime.now(datetime.timezone.utc),
+            },
+        )
+        if acquired:
+            if not discover_devices([device_ip]):
+                checksum = get_device_checksum(device_ip)
+        else:
+            _logger.info("Skipped scheduled discovery of busy device %s.", device_ip)
     except Exception as e:
         _logger.error(f"Failed to schedule discovery on device {device_ip}, Reason: {e}")
     finally:
-        ORCABusyState.objects.filter(device_ip=device_ip).delete()
+        if acquired:
+            invalidate_device(device_ip)
+            # Only the busy state of this discovery is released.
+            ORCABusyState.objects.filter(
+                device_ip=device_ip, state=str(State.SCHEDULED_DISCOVERY_IN_PROGRESS)
+            ).delete()
         rediscovery_obj = ReDiscoveryConfig.objects.filter(device_ip=device_ip).first()
         if rediscovery_obj:
             rediscovery_obj.last_discovered = datetime.datetime.now(tz=datetime.timezone.utc)
+            if checksum is not None:
+                adapt_interval(rediscovery_obj, checksum)
             rediscovery_obj.save()
@@ -0,0 +1,253 @@
+"""
+Single-flight execution of discoveries.
+
+The UI, the rediscovery scheduler and the celery discovery tasks can start a
+discovery of the same device at the same time. Calls are keyed, e.g. by device
+and feature; while a call of a key runs, further calls of the key do not start
+another one but wait for it and get its result, or its error.
+
+A call can also hold several keys, e.g. a discovery of several devices at once
+holds the key of each device. Of the keys of a new call, the ones held by
+running calls are joined and only the others are run.
+
+The "memory" backend joins the calls of the process. The "redis" backend also
+joins the calls of all web and celery worker processes: the first caller takes a
+lease on the key and publishes the outcome under its flight id, which the other
+callers wait for.
+"""
+import json
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+from log_manager.logger import get_backend_logger
+
+_logger = get_backend_logger()
+
+# Deletes the leases still held by the flight, and not those taken by the next
+# leader after they expired.
+_RELEASE_LEASES = """
+for _, key in ipairs(KEYS) do
+    if redis.call('get', key) == ARGV[1] then
+        redis.call('del', key)
+    end
+end
+return 0
+"""
+
+
+class SingleFlightError(Exception):
+    """
+    Error of a call run by another process, re-raised in the joined callers.
+    """
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MemorySingleFlight:
+    """
+    Joins the concurrent calls of a key within the process.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn):
+        """
+        Runs fn, unless a call of the key is running, whose result is returned instead.
+
+        Args:
+            key (str): The key of the call.
+            fn (callable): The function to run, without arguments.
+
+        Returns:
+            The result of fn, or of the running call of the key.
+        """
+        return self.do_many([key], lambda keys: fn())[0]
+
+    def do_many(self, keys: list, fn) -> list:
+        """
+        Runs fn for the keys not held by a running call, and joins the running
+        calls of the other keys.
+
+        Args:
+            keys (list): The keys of the call.
+            fn (callable): The function to run, taking the list of keys it runs for.
+
+        Returns:
+            list: The result of fn if it ran, followed by the results of the
+            joined calls.
+        """
+        with self._lock:
+            joined = []
+            for key in keys:
+                call = self._calls.get(key)
+                if call is not None and call not in joined:
+                    joined.append(call)
+            free = [key for key in keys if key not in self._calls]
+            call = _Call() if free else None
+            for key in free:
+                self._calls[key] = call
+        results = []
+        if call is not None:
+            try:
+                call.result = fn(free)
+                results.append(call.result)
+            except Exception as err:
+                call.error = err
+                raise
+            finally:
+                with self._lock:
+                    for key in free:
+                        del self._calls[key]
+                call.done.set()
+        for other in joined:
+            _logger.info("Joined running call of %s.", keys)
+            results.append(self._wait(other))
+        return results
+
+    def join(self, key: str):
+        """
+        Waits for the running call of the key, without starting one.
+
+        Returns:
+            tuple: True and the result of the call, or False and None if no
+            call of the key is running.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+        if call is None:
+            return False, None
+        _logger.info("Joined running call of %s.", key)
+        return True, self._wait(call)
+
+    @staticmethod
+    def _wait(call: _Call):
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def is_running(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
+
+
+class RedisSingleFlight:
+    """
+    Joins the concurrent calls of a key across processes, with a redis lease
+    per key. Results have to be JSON serializable.
+    """
+
+    def __init__(self, url: str, lease_ttl: int, result_ttl: int, poll_interval: float,
+                 prefix: str = "orca_flight"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.lease_ttl = lease_ttl
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+
+    def _lease(self, key: str) -> str:
+        return f"{self.prefix}:lease:{key}"
+
+    def do(self, key: str, fn):
+        return self.do_many([key], lambda keys: fn())[0]
+
+    def do_many(self, keys: list, fn) -> list:
+        flight_id = uuid.uuid4().hex
+        led = [
+            key for key in keys
+            if self.client.set(self._lease(key), flight_id, nx=True, ex=self.lease_ttl)
+        ]
+        results = []
+        if led:
+            results.append(self._lead(led, flight_id, fn))
+        for key in keys:
+            if key in led:
+                continue
+            joined, result = self.join(key)
+            if joined:
+                results.append(result)
+            else:
+                # The call of the key ended in the meantime, or its leader died.
+                results.extend(self.do_many([key], fn))
+        return results
+
+    def join(self, key: str):
+        leader_id = self.client.get(self._lease(key))
+        if leader_id is None:
+            return False, None
+        _logger.info("Joined running call of %s.", key)
+        while self.client.get(self._lease(key)) == leader_id:
+            time.sleep(self.poll_interval)
+        record = self.client.get(f"{self.prefix}:result:{leader_id.decode()}")
+        if record is None:
+            return False, None
+        record = json.loads(record)
+        if "error" in record:
+            raise SingleFlightError(record["error"])
+        return True, record["result"]
+
+    def _lead(self, keys: list, flight_id: str, fn):
+        record = {}
+        try:
+            result = fn(keys)
+            record["result"] = result
+            return result
+        except Exception as err:
+            record["error"] = str(err)
+            raise
+        finally:
+            pipe = self.client.pipeline()
+            pipe.set(
+                f"{self.prefix}:result:{flight_id}",
+                json.dumps(record, default=str),
+                ex=self.result_ttl,
+            )
+            pipe.eval(_RELEASE_LEASES, len(keys), *[self._lease(key) for key in keys], flight_id)
+            pipe.execute()
+
+    def is_running(self, key: str) -> bool:
+        return bool(self.client.exists(self._lease(key)))
+
+
+_flight = None
+_flight_lock = threading.Lock()
+
+
+def get_single_flight():
+    """
+    Returns the single-flight backend configured by settings.ORCA_SINGLE_FLIGHT.
+    """
+    global _flight
+    if _flight is None:
+        with _flight_lock:
+            if _flight is None:
+                config = settings.ORCA_SINGLE_FLIGHT
+                if config["BACKEND"] == "redis":
+                    _flight = RedisSingleFlight(
+                        config["REDIS_URL"],
+                        config["LEASE_TTL"],
+                        config["RESULT_TTL"],
+                        config["POLL_INTERVAL"],
+                    )
+                else:
+                    _flight = MemorySingleFlight()
+    return _flight
+
+
+def single_flight(key: str, fn):
+    """
+    Runs fn with the configured single-flight backend, see MemorySingleFlight.do.
+    """
+    return get_single_flight().do(key, fn)
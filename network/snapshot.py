@@ -0,0 +1,116 @@
+""" Whole device snapshot view. """
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from grpc import RpcError
+from orca_nw_lib.bgp import get_bgp_neighbors
+from orca_nw_lib.interface import get_interface
+from orca_nw_lib.stp_port import get_stp_port_members
+from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+
+from log_manager.logger import get_backend_logger
+from network.bgp import get_bgp_global_cached
+from network.etag import conditional_get
+from network.mclag import get_mclag_snapshot
+from network.port_chnl import get_port_chnl_list
+from network.port_group import get_port_groups_cached
+from network.stp import get_stp_global_config_cached
+from network.vlan import get_vlan_list
+
+_logger = get_backend_logger()
+_pool = None
+_pool_lock = threading.Lock()
+
+# Snapshot sections, named after the endpoints returning the same data.
+SNAPSHOT_FEATURES = {
+    "interfaces": lambda ip: get_interface(ip, ""),
+    "port_chnls": lambda ip: get_port_chnl_list(ip, None),
+    "vlan": lambda ip: get_vlan_list(ip, None),
+    "mclags": lambda ip: get_mclag_snapshot(ip, None),
+    "bgp": lambda ip: get_bgp_global_cached(ip, None),
+    "nbrs": lambda ip: get_bgp_neighbors(device_ip=ip),
+    "stp": lambda ip: get_stp_global_config_cached(ip),
+    "stp_port": lambda ip: get_stp_port_members(ip, None),
+    "groups": lambda ip: get_port_groups_cached(ip, None),
+}
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """
+    Returns the worker pool of the snapshot reads. It is separate from the fleet
+    pool, so that snapshot reads never wait on slots held by fleet requests.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.ORCA_SNAPSHOT_MAX_WORKERS,
+                    thread_name_prefix="orca_snapshot",
+                )
+    return _pool
+
+
+def get_device_snapshot(device_ip: str, features: list) -> dict:
+    """
+    Reads the features of a device concurrently.
+
+    Args:
+        device_ip (str): The IP address of the device.
+        features (list): The names of the features, keys of SNAPSHOT_FEATURES.
+
+    Returns:
+        dict: A dictionary with feature name as key and a dictionary with either
+        "data" or "error", and "elapsed_ms" as value.
+    """
+
+    def _read(feature):
+        start = time.perf_counter()
+        try:
+            entry = {"data": SNAPSHOT_FEATURES[feature](device_ip)}
+        except Exception as err:
+            _logger.error("Failed to read %s of device %s: %s", feature, device_ip, err)
+            entry = {"error": err.details() if isinstance(err, RpcError) else str(err)}
+        entry["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return feature, entry
+
+    return dict(_get_pool().map(_read, features))
+
+
+@api_view(["GET"])
+@conditional_get
+def device_snapshot(request, mgt_ip):
+    """
+    This function handles the API view returning all features of a device in one document.
+
+    Parameters:
+    - request: The HTTP request object. features is an optional comma separated
+      list of sections, all sections by default.
+    - mgt_ip: The IP address of the device.
+
+    Returns:
+    - The HTTP response object with the sections of the device, each with its
+      data or error and its read time, and the total read time.
+    """
+    features = [f for f in request.GET.get("features", "").split(",") if f] or list(SNAPSHOT_FEATURES)
+    unknown = set(features) - SNAPSHOT_FEATURES.keys()
+    if unknown:
+        _logger.error("Invalid features: %s", unknown)
+        return Response(
+            {"status": f"Invalid features: {', '.join(sorted(unknown))}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    start = time.perf_counter()
+    sections = get_device_snapshot(mgt_ip, list(dict.fromkeys(features)))
+    return Response(
+        {
+            "mgt_ip": mgt_ip,
+            "sections": sections,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+        },
+        status=status.HTTP_200_OK,
+    )
@@ -13,13 +13,19 @@ from rest_framework.response import Response
 
 from log_manager.decorators import log_request
 from log_manager.logger import get_backend_logger
+from network.cache import cached_read
+from network.fleet import fleet_response, is_fleet_request
 from network.util import add_msg_to_list, get_failure_msg, get_success_msg
+from network.etag import conditional_get
 
 _logger = get_backend_logger()
 
+get_stp_global_config_cached = cached_read("stp")(get_stp_global_config)
+
 
 @api_view(["GET", "PUT", "DELETE"])
 @log_request
+@conditional_get
 def stp_global_config(request):
     """
     Generates the function comment for the given function body.
@@ -46,6 +52,8 @@ def stp_global_config(request):
     result = []
     http_status = True
     if request.method == "GET":
+        if is_fleet_request(request):
+            return fleet_response(request, get_stp_global_config_cached)
         device_ip = request.GET.get("mgt_ip", "")
         if not device_ip:
             _logger.error("Required field device mgt_ip not found.")
@@ -54,7 +62,7 @@ def stp_global_config(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        data = get_stp_global_config(device_ip)
+        data = get_stp_global_config_cached(device_ip)
         return (
             Response(
                 data if isinstance(data, list) else [data], status=status.HTTP_200_OK
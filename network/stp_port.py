@@ -5,6 +5,10 @@ from rest_framework.response import Response
 from log_manager.decorators import log_request
 from log_manager.logger import get_backend_logger
 from network.util import add_msg_to_list, get_success_msg, get_failure_msg
+from network.etag import conditional_get
+from network.executor import run_per_device
+from network.interface import get_device_interfaces
+from network.ranges import RangeExpressionError, expand_request_items
 from orca_nw_lib.common import STPPortEdgePort, STPPortLinkType, STPPortGuard
 from orca_nw_lib.stp import discover_stp
 from orca_nw_lib.stp_port import add_stp_port_members, get_stp_port_members, delete_stp_port_member, discover_stp_port
@@ -15,6 +19,7 @@ _logger = get_backend_logger()
 
 @api_view(["PUT", "GET", "DELETE"])
 @log_request
+@conditional_get
 def stp_port_config(request):
     """
 
@@ -26,7 +31,8 @@ def stp_port_config(request):
 
     Input put request body details:
     mgt_ip (str, Required): The IP address of the device.
-    if_name (str, Required): The name of the interface.
+    if_name (str, Required): The name of the interface, or an interface range or selector
+        expression, e.g. "Ethernet0-Ethernet124 step 4" or "all 100G ports".
     bpdu_guard (bool, Required): Enable/Disable BPDU guard. Valid Values: True, False.
     uplink_fast (bool, Required): Enable/Disable uplink fast. Valid Values: True, False.
     stp_enabled (bool, Required): Enable/Disable STP. Valid Values: True, False.
@@ -57,8 +63,13 @@ def stp_port_config(request):
             if data
             else Response({}, status=status.HTTP_204_NO_CONTENT)
         )
-    for req_data in (request.data if isinstance(request.data, list) else [request.data] if request.data else []):
-        if request.method == "PUT":
+    req_data_list = (
+        request.data
+        if isinstance(request.data, list)
+        else [request.data] if request.data else []
+    )
+    if request.method == "PUT":
+        for req_data in req_data_list:
             device_ip = req_data.get("mgt_ip", "")
             if not device_ip:
                 _logger.error("Required field device mgt_ip not found.")
@@ -75,59 +86,20 @@ def stp_port_config(request):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            bpdu_guard = req_data.get("bpdu_guard", None)
-            if bpdu_guard is None:
-                _logger.error("Required field bpdu_guard not found.")
-                return Response(
-                    {"status": "Required field bpdu_guard not found."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            uplink_fast = req_data.get("uplink_fast", None)
-            if uplink_fast is None:
-                _logger.error("Required field uplink_fast not found.")
-                return Response(
-                    {"status": "Required field uplink_fast not found."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-            stp_enabled = req_data.get("stp_enabled", None)
-            if stp_enabled is None:
-                _logger.error("Required field stp_enabled not found.")
-                return Response(
-                    {"status": "Required field stp_enabled not found."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            edge_port = req_data.get("edge_port", None)
-            link_type = req_data.get("link_type", None)
-            guard = req_data.get("guard", None)
-            bpdu_filter = req_data.get("bpdu_filter", None)
-            port_fast = req_data.get("portfast", None)
-            bpdu_guard_port_shutdown = req_data.get("bpdu_guard_port_shutdown", None)
-            cost = req_data.get("cost", None)
-            port_priority = req_data.get("port_priority", None)
-            try:
-                add_stp_port_members(
-                    device_ip=device_ip,
-                    if_name=if_name,
-                    edge_port=STPPortEdgePort.get_enum_from_str(edge_port) if edge_port else None,
-                    link_type=STPPortLinkType.get_enum_from_str(link_type)if link_type else None,
-                    guard=STPPortGuard.get_enum_from_str(guard) if guard else None,
-                    bpdu_guard=bpdu_guard,
-                    bpdu_filter=bpdu_filter,
-                    portfast=port_fast,
-                    uplink_fast=uplink_fast,
-                    bpdu_guard_port_shutdown=bpdu_guard_port_shutdown,
-                    cost=cost,
-                    port_priority=port_priority,
-                    stp_enabled=stp_enabled,
-                )
-                add_msg_to_list(result, get_success_msg(request))
-                _logger.info("Successfully added stp port members")
-            except Exception as err:
-                add_msg_to_list(result, get_failure_msg(err, request))
-                http_status = http_status and False
-                _logger.error("Failed to add stp port members")
+            for field in ("bpdu_guard", "uplink_fast", "stp_enabled"):
+                if req_data.get(field, None) is None:
+                    _logger.error(f"Required field {field} not found.")
+                    return Response(
+                        {"status": f"Required field {field} not found."},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+        try:
+            req_data_list = expand_request_items(req_data_list, get_device_interfaces, field="if_name")
+        except RangeExpressionError as err:
+            _logger.error(str(err))
+            return Response({"status": str(err)}, status=status.HTTP_400_BAD_REQUEST)
+        result, http_status = run_per_device(request, req_data_list, _config_stp_port)
+    for req_data in req_data_list:
         if request.method == "DELETE":
             device_ip = req_data.get("mgt_ip", "")
             if not device_ip:
@@ -151,6 +123,46 @@ def stp_port_config(request):
     )
 
 
+def _config_stp_port(request, req_data, result) -> bool:
+    """
+    Applies the STP port config of one validated PUT request item.
+
+    Args:
+        request (Request): The request object.
+        req_data (dict): The request item.
+        result (list): The list the messages of the item are added to.
+
+    Returns:
+        bool: True if the STP port was configured.
+    """
+    edge_port = req_data.get("edge_port", None)
+    link_type = req_data.get("link_type", None)
+    guard = req_data.get("guard", None)
+    try:
+        add_stp_port_members(
+            device_ip=req_data.get("mgt_ip"),
+            if_name=req_data.get("if_name"),
+            edge_port=STPPortEdgePort.get_enum_from_str(edge_port) if edge_port else None,
+            link_type=STPPortLinkType.get_enum_from_str(link_type)if link_type else None,
+            guard=STPPortGuard.get_enum_from_str(guard) if guard else None,
+            bpdu_guard=req_data.get("bpdu_guard"),
+            bpdu_filter=req_data.get("bpdu_filter", None),
+            portfast=req_data.get("portfast", None),
+            uplink_fast=req_data.get("uplink_fast"),
+            bpdu_guard_port_shutdown=req_data.get("bpdu_guard_port_shutdown", None),
+            cost=req_data.get("cost", None),
+            port_priority=req_data.get("port_priority", None),
+            stp_enabled=req_data.get("stp_enabled"),
+        )
+        add_msg_to_list(result, get_success_msg(request))
+        _logger.info("Successfully added stp port members")
+        return True
+    except Exception as err:
+        add_msg_to_list(result, get_failure_msg(err, request))
+        _logger.error("Failed to add stp port members")
+        return False
+
+
 @api_view(["PUT"])
 @log_request
 def stp_discovery(request):
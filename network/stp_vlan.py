@@ -5,6 +5,7 @@ from rest_framework.response import Response
 from log_manager.decorators import log_request
 from log_manager.logger import get_backend_logger
 from network.util import add_msg_to_list, get_success_msg, get_failure_msg
+from network.etag import conditional_get
 from orca_nw_lib.stp_vlan import config_stp_vlan, get_stp_vlan
 
 
@@ -13,6 +14,7 @@ _logger = get_backend_logger()
 
 @api_view(["GET", "PUT"])
 @log_request
+@conditional_get
 def stp_vlan_config(request):
     """
     Generates the function comment for the given function body.
@@ -0,0 +1,17 @@
+from celery import shared_task
+
+from network.scheduler import get_coordinator, scheduled_discovery
+
+
+@shared_task(ignore_result=True, acks_late=True)
+def rediscovery_task(device_ip, **kwargs):
+    """
+    Performs a rediscovery enqueued by the rediscovery scheduler. Its result is
+    not stored and it is not logged, see orca_backend.celery.INTERNAL_TASKS.
+    Args:
+        device_ip (str): The IP address of the device.
+    """
+    try:
+        scheduled_discovery(device_ip)
+    finally:
+        get_coordinator().finish(device_ip)
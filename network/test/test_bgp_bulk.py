@@ -0,0 +1,79 @@
+"""
+This module contains tests for the validation and batching of bulk BGP neighbor requests.
+"""
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from log_manager import decorators
+from network import bgp
+from network.bgp import make_bgp_neighbor_batches, validate_bgp_neighbors
+
+
+class TestBgpNeighborBulk(SimpleTestCase):
+    """
+    Tests for validate_bgp_neighbors, make_bgp_neighbor_batches and the batch helper.
+    """
+
+    def neighbors(self, device_ip, count):
+        return [
+            {"mgt_ip": device_ip, "neighbor_ip": f"10.1.{i // 256}.{i % 256}", "remote_asn": 65001,
+             "vrf_name": "default", "afi_safi": ["ipv4_unicast"]}
+            for i in range(count)
+        ]
+
+    def test_validate(self):
+        self.assertEqual(validate_bgp_neighbors(self.neighbors("10.0.0.1", 3)), [])
+        errors = validate_bgp_neighbors(
+            [
+                {"mgt_ip": "10.0.0.1", "neighbor_ip": "10.1.0.1", "remote_asn": 65001, "vrf_name": "default"},
+                {"mgt_ip": "10.0.0.1", "neighbor_ip": "10.1.0.1", "remote_asn": 65002, "vrf_name": "default"},
+                {"mgt_ip": "10.0.0.1", "neighbor_ip": "10.1.0", "remote_asn": "asn", "vrf_name": "default"},
+                {"mgt_ip": "10.0.0.1", "neighbor_ip": "10.1.0.3", "remote_asn": 65001},
+            ]
+        )
+        self.assertEqual(len(errors), 4)
+
+    def test_batches(self):
+        batches = make_bgp_neighbor_batches(
+            self.neighbors("10.0.0.1", 120) + self.neighbors("10.0.0.2", 10), batch_size=50
+        )
+        self.assertEqual(
+            [(b["mgt_ip"], len(b["neighbors"])) for b in batches],
+            [("10.0.0.1", 50), ("10.0.0.1", 50), ("10.0.0.1", 20), ("10.0.0.2", 10)],
+        )
+
+    def test_batch_skips_af_of_failed_neighbor(self):
+        neighbors = self.neighbors("10.0.0.1", 3)
+
+        def config_nbr(**kwargs):
+            if kwargs["neighbor_ip"] == neighbors[1]["neighbor_ip"]:
+                raise Exception("rejected")
+
+        result = []
+        with mock.patch.object(bgp, "config_bgp_neighbors", side_effect=config_nbr), \
+                mock.patch.object(bgp, "config_bgp_neighbor_af") as config_af:
+            succeeded = bgp._config_bgp_neighbor_batch(
+                RequestFactory().put("/nbrs_bulk"), {"mgt_ip": "10.0.0.1", "neighbors": neighbors}, result
+            )
+        self.assertFalse(succeeded)
+        self.assertEqual(config_af.call_count, 2)
+        self.assertEqual(result[0]["neighbors"], 2)
+        self.assertEqual(result[0]["address_families"], 2)
+        self.assertEqual([f["neighbor_ip"] for f in result[0]["failed"]], [neighbors[1]["neighbor_ip"]])
+
+    def test_view_with_several_batches(self):
+        neighbors = self.neighbors("10.0.0.1", 60) + self.neighbors("10.0.0.2", 5)
+        request = APIRequestFactory().put("/nbrs_bulk", neighbors, format="json")
+        force_authenticate(request, user=SimpleNamespace(is_authenticated=True, is_active=True))
+        with mock.patch.object(bgp, "config_bgp_neighbors"), \
+                mock.patch.object(bgp, "config_bgp_neighbor_af"), \
+                mock.patch.object(decorators, "LogSerializer"):
+            response = bgp.bgp_nbr_bulk_config(request)
+        self.assertEqual(response.status_code, 200)
+        summary = response.data["summary"]
+        self.assertEqual((summary["devices"], summary["batches"]), (2, 3))
+        self.assertEqual((summary["neighbors"], summary["address_families"]), (65, 65))
+        self.assertEqual(summary["failed"], [])
@@ -0,0 +1,59 @@
+"""
+This module contains tests for the joined BGP neighbor details.
+"""
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from network import bgp, bulk_db
+
+
+class TestBgpNeighborDetails(SimpleTestCase):
+    """
+    Tests for get_bgp_neighbor_details.
+    """
+
+    def test_join(self):
+        neighbors = [
+            {"neighbor_ip": "10.1.0.1", "remote_asn": 65001, "vrf_name": "default"},
+            {"neighbor_ip": "10.1.0.3", "remote_asn": 65002, "vrf_name": "default"},
+        ]
+        details = {
+            ("default", "10.1.0.1"): {
+                "afs": [{"afi_safi": "ipv4_unicast", "admin_status": True}],
+                "local_bgp": {"local_asn": 65000},
+                "remote_bgp": ["10.0.0.2", {"local_asn": 65001}],
+                "subinterfaces": [{"ip_address": "10.1.0.0"}],
+            },
+            # Same neighbor IP in another VRF, not joined to the default VRF neighbor.
+            ("Vrf1", "10.1.0.3"): {
+                "afs": [{"afi_safi": "ipv6_unicast", "admin_status": True}],
+                "local_bgp": {"local_asn": 65100},
+                "remote_bgp": None,
+                "subinterfaces": [],
+            },
+        }
+        with mock.patch.object(bgp, "get_bgp_neighbors", return_value=neighbors), \
+                mock.patch.object(bgp, "get_bgp_neighbor_details_map", return_value=details) as details_map:
+            data = bgp.get_bgp_neighbor_details("10.0.0.1")
+        details_map.assert_called_once_with("10.0.0.1", {"10.1.0.1", "10.1.0.3"})
+        self.assertEqual(data[0]["afs"], [{"afi_safi": "ipv4_unicast", "admin_status": True}])
+        self.assertEqual(data[0]["local_bgp"], {"local_asn": 65000})
+        self.assertEqual(data[0]["remote_bgp"], {"mgt_ip": "10.0.0.2", "local_asn": 65001})
+        self.assertEqual(data[0]["subinterface"], {"ip_address": "10.1.0.0"})
+        self.assertEqual(
+            [data[1][key] for key in ("afs", "local_bgp", "remote_bgp", "subinterface")],
+            [[], None, None, None],
+        )
+
+    def test_details_map_keyed_by_neighbor_node(self):
+        rows = [
+            ["default", "10.1.0.1", {"local_asn": 65000}, [], ["10.0.0.2", {"local_asn": 65001}], []],
+            ["Vrf1", "10.1.0.1", {"local_asn": 65100}, [], None, []],
+        ]
+        with mock.patch.object(bulk_db.db, "cypher_query", return_value=(rows, None)) as query:
+            details = bulk_db.get_bgp_neighbor_details_map("10.0.0.1", {"10.1.0.1"})
+        self.assertIn("-[:BGP_NEIGHBOR]->(nbr:BGPNeighbor)", query.call_args.args[0])
+        self.assertEqual(details[("default", "10.1.0.1")]["remote_bgp"], ["10.0.0.2", {"local_asn": 65001}])
+        self.assertEqual(details[("Vrf1", "10.1.0.1")]["local_bgp"], {"local_asn": 65100})
+        self.assertIsNone(details[("Vrf1", "10.1.0.1")]["remote_bgp"])
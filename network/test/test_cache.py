@@ -0,0 +1,96 @@
+"""
+This module contains tests for the network read cache.
+"""
+import time
+
+from django.test import SimpleTestCase, override_settings
+
+from network import cache
+from network.cache import MemoryCacheBackend, cached_read, invalidate_device
+
+
+class TestMemoryCacheBackend(SimpleTestCase):
+    """
+    Tests for the in-process cache backend.
+    """
+
+    def test_lru_eviction(self):
+        backend = MemoryCacheBackend(max_entries=2, ttl=60, settle_time=0)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        self.assertEqual(backend.get("a"), (True, 1))
+        backend.set("c", 3)
+        self.assertEqual(backend.get("b"), (False, None))
+        self.assertEqual(backend.get("a"), (True, 1))
+        self.assertEqual(backend.get("c"), (True, 3))
+
+    def test_ttl_eviction(self):
+        backend = MemoryCacheBackend(max_entries=10, ttl=0, settle_time=0)
+        backend.set("a", 1)
+        time.sleep(0.01)
+        self.assertEqual(backend.get("a"), (False, None))
+
+    def test_values_copied(self):
+        backend = MemoryCacheBackend(max_entries=10, ttl=60, settle_time=0)
+        value = [{"name": "Ethernet0"}]
+        backend.set("a", value)
+        value[0]["name"] = "Ethernet1"
+        _, cached = backend.get("a")
+        cached.append({"name": "Ethernet2"})
+        self.assertEqual(backend.get("a"), (True, [{"name": "Ethernet0"}]))
+
+    def test_invalidate_bumps_version_and_settles(self):
+        backend = MemoryCacheBackend(max_entries=10, ttl=60, settle_time=60)
+        version = backend.get_version("10.0.0.1")
+        backend.invalidate("10.0.0.1")
+        self.assertNotEqual(backend.get_version("10.0.0.1"), version)
+        self.assertTrue(backend.is_settling("10.0.0.1"))
+        self.assertFalse(backend.is_settling("10.0.0.2"))
+
+
+@override_settings(
+    ORCA_RESPONSE_CACHE={
+        "BACKEND": "memory",
+        "MAX_ENTRIES": 10,
+        "TTL": 60,
+        "SETTLE_TIME": 0,
+        "REDIS_URL": "",
+    }
+)
+class TestCachedRead(SimpleTestCase):
+    """
+    Tests for the cached_read decorator.
+    """
+
+    def setUp(self):
+        cache._backend = None
+        self.calls = []
+
+        @cached_read("test")
+        def read(device_ip, name=""):
+            self.calls.append((device_ip, name))
+            return [{"name": name}]
+
+        self.read = read
+
+    def tearDown(self):
+        cache._backend = None
+
+    def test_read_through(self):
+        self.assertEqual(self.read("10.0.0.1", "Ethernet0"), [{"name": "Ethernet0"}])
+        self.assertEqual(self.read("10.0.0.1", "Ethernet0"), [{"name": "Ethernet0"}])
+        self.assertEqual(len(self.calls), 1)
+        self.read("10.0.0.1", "Ethernet4")
+        self.read("10.0.0.2", "Ethernet0")
+        self.assertEqual(len(self.calls), 3)
+
+    def test_invalidate_device(self):
+        self.read("10.0.0.1")
+        self.read("10.0.0.2")
+        invalidate_device("10.0.0.1")
+        self.read("10.0.0.1")
+        self.read("10.0.0.2")
+        self.assertEqual(len(self.calls), 3)
+        invalidate_device()
+        self.read("10.0.0.2")
+        self.assertEqual(len(self.calls), 4)
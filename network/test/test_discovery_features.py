@@ -0,0 +1,99 @@
+"""
+This module contains tests for the concurrent discovery of several features of a device.
+"""
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from network import discovery, single_flight
+from network.discovery import (
+    FeatureError,
+    discover_device_features,
+    discover_feature,
+    plan_feature_waves,
+    resolve_features,
+)
+from network.single_flight import MemorySingleFlight
+
+
+class _Feature:
+    """
+    Stand-in for the DiscoveryFeature enum.
+    """
+
+    NAMES = {"interface", "port_channel", "vlan", "bgp", "bgp_neighbors", "mclag"}
+
+    @classmethod
+    def get_enum_from_str(cls, name):
+        return name if name in cls.NAMES else None
+
+
+@mock.patch.object(discovery, "DiscoveryFeature", _Feature)
+@override_settings(ORCA_SINGLE_FLIGHT={"BACKEND": "memory"})
+class TestDiscoveryFeatures(SimpleTestCase):
+    """
+    Tests for resolve_features, plan_feature_waves and discover_device_features.
+    """
+
+    def setUp(self):
+        single_flight._flight = None
+
+    def tearDown(self):
+        single_flight._flight = None
+
+    def test_resolve(self):
+        self.assertEqual(resolve_features("vlan"), ["vlan"])
+        self.assertEqual(
+            resolve_features(["l3", "vlan"]),
+            ["interface", "port_channel", "vlan", "bgp", "bgp_neighbors"],
+        )
+        with self.assertRaises(FeatureError):
+            resolve_features(["interface", "lldp_magic"])
+
+    def test_waves(self):
+        self.assertEqual(
+            plan_feature_waves(["bgp_neighbors", "vlan", "interface", "bgp", "port_channel"]),
+            [["interface", "bgp"], ["port_channel"], ["vlan"], ["bgp_neighbors"]],
+        )
+        self.assertEqual(plan_feature_waves(["vlan", "bgp"]), [["vlan", "bgp"]])
+
+    def test_concurrent_with_errors(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def discover(device_ip, feature):
+            # Both features of the wave have to run at the same time.
+            barrier.wait()
+            if feature == "bgp":
+                raise Exception("timeout")
+
+        with mock.patch.object(discovery, "discover_nw_features", side_effect=discover):
+            report = discover_device_features("10.0.0.1", ["vlan", "bgp"])
+        self.assertEqual(report["features"]["vlan"]["status"], "success")
+        self.assertEqual(report["features"]["bgp"], {"status": "failed", "error": "timeout",
+                                                     "elapsed_ms": mock.ANY})
+        self.assertIn("elapsed_ms", report)
+
+    def test_feature_joins_device_discovery(self):
+        flight = MemorySingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def discover_device():
+            started.set()
+            release.wait(1)
+            return None
+
+        thread = threading.Thread(target=flight.do, args=("discovery:10.0.0.1", discover_device))
+        thread.start()
+        started.wait(1)
+        threading.Timer(0.1, release.set).start()
+        with mock.patch.object(discovery, "get_single_flight", return_value=flight), \
+                mock.patch.object(discovery, "discover_nw_features") as discover_nw_features:
+            report = discover_feature("10.0.0.1", "vlan")
+            discover_nw_features.assert_not_called()
+            self.assertEqual(report["status"], "success")
+            thread.join(1)
+            with mock.patch.object(discovery, "single_flight", flight.do):
+                discover_feature("10.0.0.1", "vlan")
+            discover_nw_features.assert_called_once_with("10.0.0.1", "vlan")
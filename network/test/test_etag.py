@@ -0,0 +1,95 @@
+"""
+This module contains tests for the ETag handling of the network GET endpoints.
+"""
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from network import cache
+from network.cache import invalidate_device
+from network.etag import compute_etag, conditional_get, etag_matches
+
+
+@override_settings(
+    ORCA_RESPONSE_CACHE={
+        "BACKEND": "memory",
+        "MAX_ENTRIES": 10,
+        "TTL": 60,
+        "SETTLE_TIME": 0,
+        "REDIS_URL": "",
+    }
+)
+class TestConditionalGet(SimpleTestCase):
+    """
+    Tests for the conditional_get decorator.
+    """
+
+    def setUp(self):
+        cache._backend = None
+        self.factory = APIRequestFactory()
+        self.calls = []
+        self.data = [{"name": "Ethernet0", "oper_sts": "up"}]
+
+        @api_view(["GET"])
+        @conditional_get
+        def view(request):
+            self.calls.append(request.GET.get("mgt_ip"))
+            return Response(self.data, status=status.HTTP_200_OK)
+
+        self.view = view
+
+    def tearDown(self):
+        cache._backend = None
+
+    def get(self, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.view(self.factory.get("/interfaces", {"mgt_ip": "10.0.0.1"}, **headers))
+
+    def test_etag_and_not_modified(self):
+        response = self.get()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertEqual(etag, compute_etag(self.data))
+
+        response = self.get(etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        # Answered from the stored ETag, the view is not called again.
+        self.assertEqual(len(self.calls), 1)
+
+    def test_etag_changes_after_invalidation(self):
+        etag = self.get()["ETag"]
+        self.data = [{"name": "Ethernet0", "oper_sts": "down"}]
+        invalidate_device("10.0.0.1")
+        response = self.get(etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"a", "b"', '"b"'))
+        self.assertTrue(etag_matches('W/"b"', '"b"'))
+        self.assertTrue(etag_matches("*", '"b"'))
+        self.assertFalse(etag_matches('"a"', '"b"'))
+        self.assertFalse(etag_matches(None, '"b"'))
+
+    def test_unversioned_reads_current_data(self):
+        @api_view(["GET"])
+        @conditional_get(versioned=False)
+        def view(request):
+            self.calls.append(request.GET.get("mgt_ip"))
+            return Response(self.data, status=status.HTTP_200_OK)
+
+        request = lambda etag: self.factory.get(
+            "/interfaces", {"mgt_ip": "10.0.0.1"}, HTTP_IF_NONE_MATCH=etag
+        )
+        etag = compute_etag(self.data)
+        self.assertEqual(view(request(etag)).status_code, status.HTTP_304_NOT_MODIFIED)
+        # Oper state changed without a write or discovery.
+        self.data = [{"name": "Ethernet0", "oper_sts": "down"}]
+        response = view(request(etag))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], compute_etag(self.data))
+        self.assertEqual(len(self.calls), 2)
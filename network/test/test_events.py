@@ -0,0 +1,62 @@
+"""
+This module contains tests for the device state change events.
+"""
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from network import events
+from network.events import DeviceWatcher, EventBus, Subscription, diff_state, format_sse
+
+
+class TestEvents(SimpleTestCase):
+    """
+    Tests for the state diff and the in-process event dispatch.
+    """
+
+    def test_diff_state(self):
+        events = diff_state(
+            "10.0.0.1",
+            "interface",
+            {"Ethernet0": "UP", "Ethernet4": "UP", "Ethernet8": "DOWN"},
+            {"Ethernet0": "UP", "Ethernet4": "DOWN", "Ethernet12": "UP"},
+        )
+        self.assertEqual(
+            sorted((e["name"], e["change"], e["value"]) for e in events),
+            [
+                ("Ethernet12", "added", "UP"),
+                ("Ethernet4", "modified", "DOWN"),
+                ("Ethernet8", "removed", None),
+            ],
+        )
+
+    def test_dispatch_filters_by_device_and_feature(self):
+        bus = EventBus(
+            {"BACKEND": "memory", "CHANNEL": "test", "POLL_INTERVAL": 1, "KEEPALIVE": 1, "QUEUE_SIZE": 1}
+        )
+        subscription = Subscription({"10.0.0.1"}, {"interface"}, max_size=1)
+        bus.subscriptions.add(subscription)
+        event = {"mgt_ip": "10.0.0.1", "feature": "interface", "name": "Ethernet0",
+                 "change": "modified", "value": "DOWN"}
+        bus.publish({**event, "mgt_ip": "10.0.0.2"})
+        bus.publish({**event, "feature": "bgp_neighbor"})
+        bus.publish(event)
+        # Queue is full, the event is dropped instead of blocking.
+        bus.publish(event)
+        self.assertEqual(subscription.get(timeout=0), event)
+        self.assertIsNone(subscription.get(timeout=0))
+        self.assertTrue(format_sse(event, 1).startswith("id: 1\nevent: interface\ndata: "))
+
+    def test_change_invalidates_device(self):
+        bus = mock.Mock()
+        watcher = DeviceWatcher(bus, "10.0.0.1", 1)
+        state = {"Ethernet0": "UP"}
+        with mock.patch.dict(events.FEATURES, {"interface": lambda ip: dict(state)}, clear=True), \
+                mock.patch.object(events, "invalidate_device") as invalidate:
+            watcher.poll()
+            watcher.poll()
+            invalidate.assert_not_called()
+            state["Ethernet0"] = "DOWN"
+            watcher.poll()
+        bus.publish.assert_called_once()
+        invalidate.assert_called_once_with("10.0.0.1")
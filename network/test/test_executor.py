@@ -0,0 +1,59 @@
+"""
+This module contains tests for the per-device execution of write requests.
+"""
+import threading
+import time
+
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+
+from network.executor import run_per_device
+from network.util import add_msg_to_list, get_failure_msg, get_success_msg
+
+
+class TestRunPerDevice(SimpleTestCase):
+    """
+    Tests for run_per_device.
+    """
+
+    def setUp(self):
+        self.request = APIRequestFactory().put("/interfaces")
+        self.applied = []
+        self.lock = threading.Lock()
+
+    def apply(self, request, req_data, result):
+        time.sleep(0.05)
+        with self.lock:
+            self.applied.append((req_data["mgt_ip"], req_data["name"]))
+        if req_data["name"] == "fail":
+            add_msg_to_list(result, get_failure_msg(Exception("failed"), request))
+            return False
+        add_msg_to_list(result, get_success_msg(request))
+        return True
+
+    def test_order_and_parallelism(self):
+        req_data_list = [
+            {"mgt_ip": f"10.0.0.{i % 4}", "name": f"Ethernet{i}"} for i in range(8)
+        ]
+        start = time.perf_counter()
+        result, http_status = run_per_device(self.request, req_data_list, self.apply)
+        elapsed = time.perf_counter() - start
+
+        self.assertTrue(http_status)
+        self.assertEqual(len([i for i in result if i != "\n"]), 8)
+        # 4 devices with 2 items each run in parallel, 2 steps instead of 8.
+        self.assertLess(elapsed, 0.05 * 6)
+        for device in range(4):
+            self.assertEqual(
+                [name for ip, name in self.applied if ip == f"10.0.0.{device}"],
+                [f"Ethernet{device}", f"Ethernet{device + 4}"],
+            )
+
+    def test_failures_in_request_order(self):
+        req_data_list = [
+            {"mgt_ip": "10.0.0.1", "name": "fail"},
+            {"mgt_ip": "10.0.0.2", "name": "Ethernet0"},
+        ]
+        result, http_status = run_per_device(self.request, req_data_list, self.apply)
+        self.assertFalse(http_status)
+        self.assertEqual([i["status"] for i in result if i != "\n"], ["failed", "success"])
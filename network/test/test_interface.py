@@ -2,6 +2,7 @@
 This module contains tests for the Interface API.
 """
 
+from django.urls import reverse
 from rest_framework import status
 from network.test.test_common import TestORCA
 from orca_nw_lib.utils import get_if_alias
@@ -794,3 +795,45 @@ class TestInterface(TestORCA):
         response = self.get_req("ip_range")
         self.assertIn(response.status_code, [status.HTTP_204_NO_CONTENT, status.HTTP_200_OK])
         self.assertNotIn(ip_range, [i["range"] for i in response.data])
+
+    def test_interface_fleet_get(self):
+        """
+        Test GET of interfaces for several devices in one request.
+        """
+        device_ips = list(self.device_ips.keys())
+        response = self.get_req(
+            "device_interface_list", {"mgt_ip": device_ips + ["0.0.0.0"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for device_ip in device_ips:
+            self.assertIn("elapsed_ms", response.json()[device_ip])
+            self.assertTrue(response.json()[device_ip]["data"])
+        self.assertIn("elapsed_ms", response.json()["0.0.0.0"])
+        self.assertFalse(response.json()["0.0.0.0"].get("data"))
+
+        response = self.get_req("device_interface_list", {"mgt_ip": "all"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(set(device_ips).issubset(response.json().keys()))
+
+    def test_device_snapshot(self):
+        """
+        Test the snapshot of a device against the interfaces GET.
+        """
+        device_ip = list(self.device_ips.keys())[0]
+        response = self.client.get(
+            reverse("device_snapshot", kwargs={"mgt_ip": device_ip}),
+            {"features": "interfaces,port_chnls"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        sections = response.json()["sections"]
+        self.assertEqual(set(sections), {"interfaces", "port_chnls"})
+        self.assertIn("elapsed_ms", sections["interfaces"])
+        self.assertEqual(
+            sorted(i["name"] for i in sections["interfaces"]["data"]),
+            sorted(i["name"] for i in self.get_req("device_interface_list", {"mgt_ip": device_ip}).json()),
+        )
+
+        response = self.client.get(
+            reverse("device_snapshot", kwargs={"mgt_ip": device_ip}), {"features": "unknown"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
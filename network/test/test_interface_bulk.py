@@ -0,0 +1,65 @@
+"""
+This module contains tests for merging and validating bulk interface changes.
+"""
+from django.test import SimpleTestCase
+
+from network.interface import merge_interface_changes
+
+
+class TestMergeInterfaceChanges(SimpleTestCase):
+    """
+    Tests for merge_interface_changes.
+    """
+
+    def test_merge_per_interface(self):
+        changes, errors = merge_interface_changes(
+            [
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "mtu": 9000},
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet4", "mtu": 9000},
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "description": "uplink"},
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "enabled": "false"},
+                {"mgt_ip": "10.0.0.2", "name": "Ethernet0", "enabled": "true"},
+            ]
+        )
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            changes,
+            [
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "mtu": 9000,
+                 "description": "uplink", "enabled": "false"},
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet4", "mtu": 9000},
+                {"mgt_ip": "10.0.0.2", "name": "Ethernet0", "enabled": "true"},
+            ],
+        )
+
+    def test_validated_together(self):
+        _, errors = merge_interface_changes(
+            [
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "mtu": 9000},
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "mtu": 9100},
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet4", "mtu": "jumbo"},
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet8", "ip_address": "10.0.0.300/24"},
+                {"mgt_ip": "10.0.0.1", "mtu": 9000},
+            ]
+        )
+        self.assertEqual(len(errors), 4)
+
+    def test_several_ip_addresses_and_force(self):
+        changes, errors = merge_interface_changes(
+            [
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "ip_address": "10.1.0.1/24", "mtu": 9000},
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "ip_address": "10.2.0.1/24", "secondary": True,
+                 "force": "true"},
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "ip_address": "10.1.0.1/24"},
+            ]
+        )
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            changes,
+            [
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "mtu": 9000, "force": True,
+                 "ip_address": "10.1.0.1/24"},
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "ip_address": "10.2.0.1/24", "secondary": True,
+                 "force": True},
+            ],
+        )
@@ -0,0 +1,64 @@
+"""
+This module contains tests for filtering, field selection and paging of list responses.
+"""
+from django.http import QueryDict
+from django.test import SimpleTestCase
+
+from network.interface import INTERFACE_FILTERS
+from network.list_query import ListQueryError, apply_list_query, validate_list_query
+
+
+class TestListQuery(SimpleTestCase):
+    """
+    Tests for apply_list_query with the interface filters.
+    """
+
+    def setUp(self):
+        self.interfaces = [
+            {"name": f"Ethernet{i}", "enabled": i % 8 == 0, "oper_sts": "UP" if i % 8 == 0 else "DOWN",
+             "speed": "SPEED_100GB", "mtu": 9100}
+            for i in range(0, 128, 4)
+        ]
+        self.interfaces.reverse()
+
+    def query(self, params):
+        return apply_list_query(self.interfaces, QueryDict(params), INTERFACE_FILTERS)
+
+    def test_filters_and_fields(self):
+        data = self.query("name_prefix=Ethernet1&enabled=true&oper_sts=up&fields=name,oper_sts")
+        self.assertEqual(
+            sorted(i["name"] for i in data),
+            ["Ethernet104", "Ethernet112", "Ethernet120", "Ethernet16"],
+        )
+        self.assertTrue(all(set(i) == {"name", "oper_sts"} for i in data))
+        # The input data is not modified.
+        self.assertTrue(all("mtu" in i for i in self.interfaces))
+
+    def test_limit_offset(self):
+        page = self.query("limit=2&offset=1&fields=mtu")
+        self.assertEqual(page["count"], 32)
+        self.assertEqual(page["results"], [{"mtu": 9100}, {"mtu": 9100}])
+
+    def test_cursor(self):
+        names = []
+        params = "limit=10"
+        while True:
+            page = self.query(params)
+            names.extend(i["name"] for i in page["results"])
+            if not page["next"]:
+                break
+            params = f"limit=10&cursor={page['next']}"
+        self.assertEqual(names, [f"Ethernet{i}" for i in range(0, 128, 4)])
+
+    def test_invalid_params(self):
+        with self.assertRaises(ListQueryError):
+            self.query("limit=-1")
+        with self.assertRaises(ListQueryError):
+            self.query("offset=1&cursor=RXRoZXJuZXQw")
+
+    def test_validate_without_items(self):
+        validate_list_query(QueryDict("limit=10&name_prefix=Ethernet"))
+        with self.assertRaises(ListQueryError):
+            validate_list_query(QueryDict("cursor=A"))
+        with self.assertRaises(ListQueryError):
+            validate_list_query(QueryDict("offset=x"))
@@ -0,0 +1,101 @@
+"""
+This module contains tests for the suppression of unchanged configuration fields.
+"""
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+
+from network import interface
+from network.interface import INTERFACE_COMPARED_FIELDS, _InterfaceStates
+from network.noop import apply_changed_fields, diff_item
+
+
+class TestNoopSuppression(SimpleTestCase):
+    """
+    Tests for diff_item and apply_changed_fields.
+    """
+
+    def setUp(self):
+        self.state = {
+            "name": "Ethernet0",
+            "enabled": True,
+            "mtu": 9100,
+            "description": "uplink",
+            "speed": "SPEED_100GB",
+        }
+        self.applied_items = []
+
+    def apply(self, request, req_data, result):
+        self.applied_items.append(req_data)
+        result.append({"status": "success", "message": "PUT request successful"})
+        return True
+
+    def config(self, req_data, path="/interfaces"):
+        result = []
+        succeeded = apply_changed_fields(
+            RequestFactory().put(path),
+            req_data,
+            result,
+            lambda item: self.state,
+            INTERFACE_COMPARED_FIELDS,
+            self.apply,
+        )
+        return succeeded, result
+
+    def test_diff_item(self):
+        item, applied, skipped = diff_item(
+            {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "enabled": "true", "mtu": "9000",
+             "description": "uplink", "ip_address": "10.1.1.1/31"},
+            self.state,
+            INTERFACE_COMPARED_FIELDS,
+        )
+        self.assertEqual(
+            item, {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "mtu": "9000", "ip_address": "10.1.1.1/31"}
+        )
+        self.assertEqual(applied, ["mtu", "ip_address"])
+        self.assertEqual(skipped, ["enabled", "description"])
+
+    def test_unchanged_item_skipped(self):
+        succeeded, result = self.config(
+            {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "mtu": 9100, "speed": "SPEED_100GB"}
+        )
+        self.assertTrue(succeeded)
+        self.assertEqual(self.applied_items, [])
+        self.assertEqual(result[0]["applied"], [])
+        self.assertEqual(result[0]["skipped"], ["mtu", "speed"])
+
+    def test_changed_fields_applied(self):
+        succeeded, result = self.config(
+            {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "mtu": 9100, "enabled": False}
+        )
+        self.assertTrue(succeeded)
+        self.assertEqual(self.applied_items, [{"mgt_ip": "10.0.0.1", "name": "Ethernet0", "enabled": False}])
+        self.assertEqual(result[0]["applied"], ["enabled"])
+        self.assertEqual(result[0]["skipped"], ["mtu"])
+
+    def test_force(self):
+        req_data = {"mgt_ip": "10.0.0.1", "name": "Ethernet0", "mtu": 9100}
+        self.config(req_data, "/interfaces?force=true")
+        self.config({**req_data, "force": True})
+        self.assertEqual(self.applied_items, [req_data, req_data])
+
+    def test_interface_states_read_once_per_device(self):
+        interfaces = {
+            "10.0.0.1": [{"name": f"Ethernet{i}", "mtu": 9100} for i in range(4)],
+            "10.0.0.2": [{"name": "Ethernet0", "mtu": 1500}],
+        }
+
+        def get_interface(device_ip, name=None):
+            if name is None:
+                return interfaces[device_ip]
+            return next(intf for intf in interfaces[device_ip] if intf["name"] == name)
+
+        states = _InterfaceStates()
+        with mock.patch.object(interface, "get_interface", side_effect=get_interface) as read:
+            for i in range(4):
+                self.assertEqual(states.get({"mgt_ip": "10.0.0.1", "name": f"Ethernet{i}"})["mtu"], 9100)
+            self.assertEqual(states.get({"mgt_ip": "10.0.0.2", "name": "Ethernet0"})["mtu"], 1500)
+            self.assertEqual(read.call_count, 2)
+            # A second change of an interface reads it again.
+            states.get({"mgt_ip": "10.0.0.1", "name": "Ethernet0"})
+            read.assert_called_with("10.0.0.1", "Ethernet0")
@@ -1404,3 +1404,22 @@ class TestPortChnl(TestORCA):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         response = self.get_req("vlan_config", {"mgt_ip": device_ip, "name": vlan_3_name})
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_port_chnl_list_members_match_single_get(self):
+        """
+        Test that the port channel list, which reads members of all port channels
+        in bulk, returns the same members as the GET for a single port channel.
+        """
+        device_ip = list(self.device_ips.keys())[0]
+        response = self.get_req("device_port_chnl", {"mgt_ip": device_ip})
+        self.assert_response_status(
+            response, [status.HTTP_200_OK, status.HTTP_204_NO_CONTENT]
+        )
+        for chnl in response.json() if response.status_code == status.HTTP_200_OK else []:
+            single = self.get_req(
+                "device_port_chnl", {"mgt_ip": device_ip, "lag_name": chnl["lag_name"]}
+            )
+            self.assertEqual(single.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                sorted(single.json()["members"]), sorted(chnl["members"])
+            )
@@ -0,0 +1,86 @@
+"""
+This module contains tests for the expansion of interface range and selector expressions.
+"""
+from django.test import SimpleTestCase
+
+from network.ranges import (
+    RangeExpressionError,
+    expand_interface_expression,
+    expand_member_items,
+    expand_request_items,
+    is_interface_expression,
+)
+
+
+class TestInterfaceRanges(SimpleTestCase):
+    """
+    Tests for expand_interface_expression and the expansion of request items.
+    """
+
+    def setUp(self):
+        self.interfaces = [
+            {"name": f"Ethernet{i}", "speed": "SPEED_100GB" if i < 64 else "SPEED_25GB"}
+            for i in range(128)
+        ]
+        self.interfaces.append({"name": "Ethernet0.10", "speed": "SPEED_100GB"})
+        self.interfaces.reverse()
+
+    def test_is_expression(self):
+        self.assertTrue(is_interface_expression("Ethernet0-Ethernet124 step 4"))
+        self.assertTrue(is_interface_expression("all 100G ports"))
+        self.assertTrue(is_interface_expression("Ethernet0, Ethernet4"))
+        self.assertFalse(is_interface_expression("Ethernet0"))
+        self.assertFalse(is_interface_expression("Ethernet0.10"))
+        self.assertFalse(is_interface_expression(None))
+
+    def test_range(self):
+        self.assertEqual(
+            expand_interface_expression("Ethernet0-Ethernet124 step 4", self.interfaces),
+            [f"Ethernet{i}" for i in range(0, 125, 4)],
+        )
+        self.assertEqual(
+            expand_interface_expression("Ethernet2-5", self.interfaces),
+            ["Ethernet2", "Ethernet3", "Ethernet4", "Ethernet5"],
+        )
+        self.assertEqual(
+            expand_interface_expression("Ethernet8, Ethernet0-Ethernet8 step 4", self.interfaces),
+            ["Ethernet0", "Ethernet4", "Ethernet8"],
+        )
+
+    def test_selector(self):
+        self.assertEqual(
+            expand_interface_expression("all 25G ports", self.interfaces),
+            [f"Ethernet{i}" for i in range(64, 128)],
+        )
+        self.assertEqual(len(expand_interface_expression("all", self.interfaces)), 128)
+
+    def test_invalid(self):
+        for expression in ("Ethernet8-Ethernet0", "Ethernet0-PortChannel4", "Ethernet200-Ethernet300",
+                           "all 400G ports"):
+            with self.assertRaises(RangeExpressionError):
+                expand_interface_expression(expression, self.interfaces)
+
+    def test_expand_items(self):
+        calls = []
+
+        def get_interfaces(device_ip):
+            calls.append(device_ip)
+            return self.interfaces
+
+        items = expand_request_items(
+            [
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet0-Ethernet8 step 4", "mtu": 9000},
+                {"mgt_ip": "10.0.0.1", "name": "Ethernet64", "mtu": 9100},
+                {"mgt_ip": "10.0.0.1", "name": "all 25G", "enabled": False},
+            ],
+            get_interfaces,
+        )
+        self.assertEqual(len(items), 3 + 1 + 64)
+        self.assertEqual(items[1], {"mgt_ip": "10.0.0.1", "name": "Ethernet4", "mtu": 9000})
+        self.assertEqual(calls, ["10.0.0.1"])
+
+        members = expand_member_items(
+            [{"mgt_ip": "10.0.0.1", "name": "Vlan10", "mem_ifs": {"Ethernet0-1": "TRUNK"}}],
+            get_interfaces,
+        )
+        self.assertEqual(members[0]["mem_ifs"], {"Ethernet0": "TRUNK", "Ethernet1": "TRUNK"})
@@ -0,0 +1,166 @@
+import datetime
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from network import scheduler
+from network.scheduler import (
+    adapt_interval,
+    get_device_checksum,
+    get_due_devices,
+    get_interval,
+    get_jitter,
+    rediscovery_tick,
+    scheduled_discovery,
+)
+
+NOW = datetime.datetime(2026, 1, 1, 12, 0, tzinfo=datetime.timezone.utc)
+
+
+def make_config(device_ip, interval, minutes_ago):
+    return SimpleNamespace(
+        device_ip=device_ip,
+        interval=interval,
+        last_discovered=NOW - datetime.timedelta(minutes=minutes_ago) if minutes_ago is not None else None,
+        min_interval=None,
+        max_interval=None,
+        effective_interval=None,
+    )
+
+
+class FakeCoordinator:
+
+    def __init__(self, leader=True, running=()):
+        self.leader = leader
+        self._running = set(running)
+        self.started = []
+
+    def is_leader(self):
+        return self.leader
+
+    def running(self):
+        return set(self._running)
+
+    def start(self, device_ip):
+        self.started.append(device_ip)
+        return True
+
+
+class TestScheduler(SimpleTestCase):
+    """
+    Tests for the rediscovery scheduler.
+    """
+
+    def test_jitter(self):
+        self.assertEqual(get_jitter("10.0.0.1", 10, 60), get_jitter("10.0.0.1", 10, 60))
+        self.assertLess(get_jitter("10.0.0.1", 10, 60), 60)
+        self.assertLess(get_jitter("10.0.0.1", 1, 60), 6)
+        self.assertEqual(get_jitter("10.0.0.1", 10, 0), 0)
+
+    def test_due_devices(self):
+        configs = [
+            make_config("10.0.0.1", 10, 12),
+            make_config("10.0.0.2", 10, 5),
+            make_config("10.0.0.3", 10, 30),
+            make_config("10.0.0.4", 10, None),
+        ]
+        self.assertEqual(get_due_devices(configs, NOW, 60), ["10.0.0.3", "10.0.0.1", "10.0.0.4"])
+
+    def run_tick(self, coordinator, configs, max_concurrent=2):
+        config = {"MAX_CONCURRENT": max_concurrent, "JITTER": 60}
+        with mock.patch.object(scheduler, "get_coordinator", return_value=coordinator), \
+                mock.patch.object(scheduler.ReDiscoveryConfig, "objects") as objects, \
+                self.settings(ORCA_REDISCOVERY=config):
+            objects.all.return_value = configs
+            rediscovery_tick()
+
+    def test_tick_caps_concurrent(self):
+        configs = [make_config(f"10.0.0.{i}", 10, 20 + i) for i in range(1, 5)]
+        coordinator = FakeCoordinator(running=["10.0.0.4"])
+        self.run_tick(coordinator, configs, max_concurrent=2)
+        self.assertEqual(coordinator.started, ["10.0.0.3"])
+
+    def test_tick_not_leader(self):
+        coordinator = FakeCoordinator(leader=False)
+        self.run_tick(coordinator, [make_config("10.0.0.1", 10, 20)])
+        self.assertEqual(coordinator.started, [])
+
+    def run_scheduled_discovery(self, acquired):
+        with mock.patch.object(scheduler.ORCABusyState, "objects") as busy, \
+                mock.patch.object(scheduler.ReDiscoveryConfig, "objects") as configs, \
+                mock.patch.object(scheduler, "discover_devices", return_value=["failed"]) as discover, \
+                mock.patch.object(scheduler, "invalidate_device"):
+            busy.get_or_create.return_value = (None, acquired)
+            configs.filter.return_value.first.return_value = None
+            scheduled_discovery("10.0.0.1")
+        return busy, discover
+
+    def test_scheduled_discovery_releases_own_state(self):
+        busy, discover = self.run_scheduled_discovery(acquired=True)
+        discover.assert_called_once_with(["10.0.0.1"])
+        busy.filter.assert_called_once_with(device_ip="10.0.0.1", state="SCHEDULED_DISCOVERY_IN_PROGRESS")
+
+    def test_scheduled_discovery_skips_busy_device(self):
+        busy, discover = self.run_scheduled_discovery(acquired=False)
+        discover.assert_not_called()
+        busy.filter.assert_not_called()
+
+
+class TestAdaptiveInterval(SimpleTestCase):
+    """
+    Tests for the adaptive rediscovery interval.
+    """
+
+    def make_config(self, min_interval=5, max_interval=60):
+        config = make_config("10.0.0.1", 10, 0)
+        config.min_interval = min_interval
+        config.max_interval = max_interval
+        config.last_checksum = None
+        config.changed = None
+        return config
+
+    def adapt(self, config, checksum):
+        with self.settings(ORCA_REDISCOVERY={"SHRINK_FACTOR": 0.5, "GROW_FACTOR": 2}):
+            adapt_interval(config, checksum)
+
+    def test_adapt_within_bounds(self):
+        config = self.make_config()
+        self.adapt(config, "a")
+        self.assertIsNone(config.changed)
+        self.assertEqual(get_interval(config), 10)
+        for expected in (20, 40, 60, 60):
+            self.adapt(config, "a")
+            self.assertFalse(config.changed)
+            self.assertEqual(get_interval(config), expected)
+        for expected in (30, 15, 7.5, 5):
+            self.adapt(config, str(expected))
+            self.assertTrue(config.changed)
+            self.assertEqual(get_interval(config), expected)
+
+    def test_fixed_without_bounds(self):
+        config = self.make_config(None, None)
+        self.adapt(config, "a")
+        self.adapt(config, "b")
+        self.assertTrue(config.changed)
+        self.assertEqual(get_interval(config), 10)
+        self.assertIsNone(config.effective_interval)
+
+    def test_due_with_adapted_interval(self):
+        config = self.make_config()
+        config.last_discovered = NOW - datetime.timedelta(minutes=12)
+        self.assertEqual(get_due_devices([config], NOW, 0), ["10.0.0.1"])
+        config.effective_interval = 20
+        self.assertEqual(get_due_devices([config], NOW, 0), [])
+
+    def test_checksum_ignores_oper_state(self):
+        def checksum(oper_sts, state):
+            intfs = [{"name": "Ethernet0", "mtu": 9100, "oper_sts": oper_sts}]
+            nbrs = [{"neighbor_ip": "10.1.0.1", "remote_asn": 65001, "state": state}]
+            with mock.patch.object(scheduler, "get_interface", return_value=intfs), \
+                    mock.patch.object(scheduler, "get_bgp_neighbors", return_value=nbrs), \
+                    mock.patch.object(scheduler, "get_port_chnl_members_map", return_value={}), \
+                    mock.patch.object(scheduler, "get_vlan_members_map", return_value={}):
+                return get_device_checksum("10.0.0.1")
+
+        self.assertEqual(checksum("up", "Established"), checksum("down", "Active"))
@@ -0,0 +1,108 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from network import single_flight
+from network.single_flight import MemorySingleFlight, RedisSingleFlight
+
+
+class TestSingleFlight(SimpleTestCase):
+    """
+    Tests for MemorySingleFlight.
+    """
+
+    def setUp(self):
+        self.flight = MemorySingleFlight()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def discover(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(1)
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+    def run_concurrently(self, count=3):
+        results = []
+
+        def call():
+            try:
+                results.append(self.flight.do("discovery:10.0.0.1", self.discover))
+            except Exception as err:
+                results.append(err)
+
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        threads[0].start()
+        self.started.wait(1)
+        for thread in threads[1:]:
+            thread.start()
+        # Lets the other calls join the running one.
+        time.sleep(0.1)
+        self.assertTrue(self.flight.is_running("discovery:10.0.0.1"))
+        self.release.set()
+        for thread in threads:
+            thread.join(1)
+        return results
+
+    def test_joined_result(self):
+        self.outcome = ["report"]
+        results = self.run_concurrently()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [["report"]] * 3)
+        self.assertFalse(self.flight.is_running("discovery:10.0.0.1"))
+        self.assertEqual(self.flight.do("discovery:10.0.0.1", self.discover), ["report"])
+        self.assertEqual(self.calls, 2)
+
+    def test_joined_error(self):
+        self.outcome = RuntimeError("unreachable")
+        results = self.run_concurrently()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual([str(err) for err in results], ["unreachable"] * 3)
+
+    def test_keys_independent(self):
+        self.outcome = []
+        self.release.set()
+        self.flight.do("discovery:10.0.0.1", self.discover)
+        self.flight.do("discovery:10.0.0.1:vlan", self.discover)
+        self.assertEqual(self.calls, 2)
+
+    def test_do_many_joins_running_keys(self):
+        self.outcome = "first"
+        thread = threading.Thread(target=self.flight.do, args=("discovery:10.0.0.1", self.discover))
+        thread.start()
+        self.started.wait(1)
+        ran = []
+
+        def discover_many(keys):
+            ran.append(keys)
+            self.release.set()
+            return "second"
+
+        results = self.flight.do_many(["discovery:10.0.0.1", "discovery:10.0.0.2"], discover_many)
+        thread.join(1)
+        self.assertEqual(ran, [["discovery:10.0.0.2"]])
+        self.assertEqual(results, ["second", "first"])
+
+
+class TestRedisSingleFlight(SimpleTestCase):
+    """
+    Tests for RedisSingleFlight, with a mocked redis client.
+    """
+
+    def test_release_only_own_leases(self):
+        with mock.patch("redis.Redis.from_url") as from_url:
+            flight = RedisSingleFlight("redis://", lease_ttl=60, result_ttl=60, poll_interval=0)
+        client = from_url.return_value
+        client.set.return_value = True
+        self.assertEqual(flight.do_many(["discovery:10.0.0.1"], lambda keys: "ok"), ["ok"])
+        pipe = client.pipeline.return_value
+        pipe.delete.assert_not_called()
+        flight_id = client.set.call_args_list[0].args[1]
+        pipe.eval.assert_called_once_with(
+            single_flight._RELEASE_LEASES, 1, "orca_flight:lease:discovery:10.0.0.1", flight_id
+        )
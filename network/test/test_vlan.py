@@ -561,3 +561,26 @@ class TestVlan(TestORCA):
 
         # Cleanup
         self.cleanup_vlan_mem_and_config(request_body)
+
+    def test_vlan_get_without_members(self):
+        device_ip = list(self.device_ips.keys())[0]
+        request_body = self.get_req_body()
+        self.create_sample_vlan_and_member_config(request_body)
+
+        response = self.get_req(
+            "vlan_config",
+            {"mgt_ip": device_ip, "name": self.vlan_name, "include_members": "false"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["name"], self.vlan_name)
+        self.assertNotIn("mem_ifs", response.json())
+
+        response = self.get_req("vlan_config", {"mgt_ip": device_ip})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        vlan = next(i for i in response.json() if i["name"] == self.vlan_name)
+        self.assertEqual(
+            set(vlan["mem_ifs"].keys()), set(request_body["mem_ifs"].keys())
+        )
+
+        # Cleanup
+        self.cleanup_vlan_mem_and_config(request_body)
@@ -1,8 +1,11 @@
 """ Network URL Configuration """
 
+from django.conf import settings
 from django.urls import re_path, path
 
-from . import views, stp_vlan, stp_port, vlan, interface, port_chnl, mclag, bgp, port_group, stp, ip_polling
+from orca_backend.async_views import async_urlpatterns
+
+from . import views, stp_vlan, stp_port, vlan, interface, port_chnl, mclag, bgp, port_group, stp, ip_polling, snapshot
 
 urlpatterns = [
     path("ip/range", ip_polling.ip_range, name="ip_range"),
@@ -14,10 +17,13 @@ urlpatterns = [
     path("stp_discovery", stp_port.stp_discovery, name="stp_discovery"),
     path("stp_vlan", stp_vlan.stp_vlan_config, name="stp_vlan_config"),
     path("breakout", interface.interface_breakout, name="breakout"),
+    path("interfaces/bulk", interface.interface_bulk_config, name="interface_bulk_config"),
     re_path("del_db", views.delete_db, name="del_db"),
     # path("discover", views.discover, name="discover"),
     path("discover/feature", views.discover_by_feature, name="discover_by_feature"),
     path("discover/schedule", views.discover_scheduler, name="discover_scheduler"),
+    path("events", views.device_events, name="device_events"),
+    path("device/<str:mgt_ip>/snapshot", snapshot.device_snapshot, name="device_snapshot"),
     re_path("devices", views.device_list, name="device"),
     path("subinterface", interface.interface_subinterface_config, name="subinterface"),
     re_path("interface_pg", interface.interface_pg, name="interface_pg"),
@@ -60,6 +66,8 @@ urlpatterns = [
     path("bgp_af_aggregate_addr", bgp.bgp_af_aggregate_addr, name="bgp_af_aggregate_addr"),
     path("nbrs_af", bgp.bgp_neighbor_af, name="bgp_nbr_af"),
     path("nbrs", bgp.bgp_nbr_config, name="bgp_nbr"),
+    path("nbrs_bulk", bgp.bgp_nbr_bulk_config, name="bgp_nbr_bulk"),
+    path("nbrs_details", bgp.bgp_nbr_details, name="bgp_nbr_details"),
     path("nbrs_remote_bgp", bgp.bgp_neighbor_remote_bgp, name="bgp_nbr_remote_bgp"),
     path("nbrs_local_bgp", bgp.bgp_neighbor_local_bgp, name="bgp_nbr_local_bgp"),
     path("nbrs_subinterface", bgp.bgp_neighbor_sub_interface, name="bgp_nbr_subinterface"),
@@ -76,3 +84,6 @@ urlpatterns = [
     re_path("vlan_mem_delete", vlan.vlan_mem_config, name="vlan_mem_delete"),
     re_path("vlan", vlan.vlan_config, name="vlan_config"),
 ]
+
+if settings.ORCA_ASYNC_VIEWS:
+    urlpatterns = async_urlpatterns(urlpatterns)
@@ -3,16 +3,28 @@ import datetime
 from django.forms import model_to_dict
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.decorators import api_view
+from django.conf import settings
+from rest_framework.decorators import api_view, renderer_classes
 
+from network.cache import invalidate_device
 from network.models import ReDiscoveryConfig
-from network.scheduler import add_scheduler, remove_scheduler
-from orca_nw_lib.common import DiscoveryFeature
+from network.scheduler import start_scheduler
 from orca_nw_lib.device import get_device_details
-from orca_nw_lib.discovery import discover_device, discover_nw_features
 from log_manager.decorators import log_request
 from log_manager.logger import get_backend_logger
 from network.util import add_msg_to_list, get_failure_msg, get_success_msg
+from network.discovery import FeatureError, discover_device_features, discover_devices, resolve_features
+from network.etag import conditional_get
+from network.events import FEATURES, iter_sse
+from network.executor import run_per_device
+from network.fleet import get_device_ips
+from orca_backend.streaming import (
+    STREAMING_RENDERERS,
+    EventStreamRenderer,
+    event_stream_response,
+    ndjson_response,
+    wants_ndjson,
+)
 from state_manager.models import ORCABusyState
 
 _logger = get_backend_logger()
@@ -91,7 +103,7 @@ def discover(request):
             addresses = req_data.get("address") if isinstance(req_data.get("address"), list) else [
                 req_data.get("address")]
             if addresses:
-                discover_device(device_ips=addresses)
+                discover_devices(addresses)
 
         if not result:
             # Because orca_nw_lib returns report for errors in discovery.
@@ -108,6 +120,8 @@ def discover(request):
         "GET",
     ]
 )
+@renderer_classes(STREAMING_RENDERERS)
+@conditional_get
 def device_list(request):
     """
     A view function that handles the GET request for the device_list endpoint.
@@ -118,9 +132,13 @@ def device_list(request):
     Returns:
     - If successful, returns a JSON response with the device details.
     - If no data is found, returns a JSON response with an empty object and HTTP status code 204.
+    - If all devices are requested with "Accept: application/x-ndjson", streams one device per line.
     """
     if request.method == "GET":
-        data = get_device_details(request.GET.get("mgt_ip", None))
+        mgt_ip = request.GET.get("mgt_ip", None)
+        if not mgt_ip and wants_ndjson(request):
+            return ndjson_response(get_device_details() or [])
+        data = get_device_details(mgt_ip)
         _logger.debug(data)
         return (
             Response(data, status=status.HTTP_200_OK)
@@ -134,9 +152,14 @@ def device_list(request):
 def discover_by_feature(request):
     """
     This function is an API view that handles the HTTP PUT request for the 'discover_by_feature' endpoint.
+
+    Every request item has the mgt_ip of a device and its "feature" (or
+    "features"): a feature name, a preset such as "l2" or "l3", or a list of
+    them. Devices are discovered in parallel, and the independent features of a
+    device concurrently. The message of every item has the status, error and
+    elapsed time of each feature.
     """
     if request.method == "PUT":
-        result = []
         req_data_list = (
             request.data if isinstance(request.data, list) else [request.data]
         )
@@ -148,7 +171,7 @@ def discover_by_feature(request):
                     {"result": "Required field device mgt_ip not found."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            feature = req_data.get("feature")
+            feature = req_data.get("features", req_data.get("feature"))
             if not feature:
                 _logger.error("Required field feature not found.")
                 return Response(
@@ -156,15 +179,80 @@ def discover_by_feature(request):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             try:
-                discover_nw_features(device_ip, DiscoveryFeature.get_enum_from_str(feature))
-                add_msg_to_list(result, get_success_msg(request))
-                _logger.info("Rediscovered device: %s", device_ip)
-            except Exception as e:
-                add_msg_to_list(result, get_failure_msg(e, request))
-                _logger.error("Failed to rediscover device: %s", device_ip)
+                resolve_features(feature)
+            except FeatureError as err:
+                _logger.error(str(err))
+                return Response({"result": str(err)}, status=status.HTTP_400_BAD_REQUEST)
+        result, _ = run_per_device(request, req_data_list, _discover_features)
         return Response({"result": result}, status=status.HTTP_200_OK)
 
 
+def _discover_features(request, req_data, result) -> bool:
+    """
+    Discovers the features of one validated discover_by_feature request item.
+
+    Args:
+        request (Request): The request object.
+        req_data (dict): The request item.
+        result (list): The list the messages of the item are added to.
+
+    Returns:
+        bool: True if all features were discovered.
+    """
+    device_ip = req_data.get("mgt_ip")
+    try:
+        report = discover_device_features(
+            device_ip, resolve_features(req_data.get("features", req_data.get("feature")))
+        )
+    finally:
+        invalidate_device(device_ip)
+    failed = [name for name, feature in report["features"].items() if feature["status"] != "success"]
+    if failed:
+        msg = get_failure_msg(Exception(f"Failed to discover {', '.join(failed)}."), request)
+        _logger.error("Failed to rediscover %s of device: %s", failed, device_ip)
+    else:
+        msg = get_success_msg(request)
+        _logger.info("Rediscovered device: %s", device_ip)
+    msg.update(mgt_ip=device_ip, **report)
+    add_msg_to_list(result, msg)
+    return not failed
+
+
+@api_view(["GET"])
+@renderer_classes([*STREAMING_RENDERERS, EventStreamRenderer])
+def device_events(request):
+    """
+    A view function that streams the state change events of devices as server-sent events.
+
+    Parameters:
+    - request: The Django request object. mgt_ip selects the devices, as for the
+      fleet GET requests. features is an optional comma separated list of
+      interface, port_chnl and bgp_neighbor, all by default.
+
+    Returns:
+    - A text/event-stream response with one event per change of interface oper
+      status, port channel members or BGP neighbor, until the client disconnects.
+    """
+    device_ips = get_device_ips(request)
+    if not device_ips:
+        _logger.error("Required field device mgt_ip not found.")
+        return Response(
+            {"status": "Required field device mgt_ip not found."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    features = [f for f in request.GET.get("features", "").split(",") if f] or list(FEATURES)
+    unknown = set(features) - FEATURES.keys()
+    if unknown:
+        _logger.error("Invalid features: %s", unknown)
+        return Response(
+            {"status": f"Invalid features: {', '.join(sorted(unknown))}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return event_stream_response(
+        iter_sse(device_ips, features, settings.ORCA_EVENTS["KEEPALIVE"])
+    )
+
+
 @api_view(["GET", "PUT", "DELETE"])
 @log_request
 def discover_scheduler(request):
@@ -208,13 +296,27 @@ def discover_scheduler(request):
                     {"result": "Required field interval not found."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
+            min_interval = req_data.get("min_interval", None)
+            max_interval = req_data.get("max_interval", None)
+            bounds = (min_interval, max_interval)
+            if bounds != (None, None) and not (
+                all(isinstance(bound, int) for bound in bounds) and 0 < min_interval <= max_interval
+            ):
+                _logger.error("Invalid min_interval and max_interval.")
+                return Response(
+                    {"result": "min_interval and max_interval must be given together, with 0 < min_interval <= max_interval."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
             ReDiscoveryConfig.objects.update_or_create(
                 device_ip=device_ip, defaults={
                     "interval": interval,
+                    "min_interval": min_interval,
+                    "max_interval": max_interval,
+                    "effective_interval": None,
                     "last_discovered": datetime.datetime.now(tz=datetime.timezone.utc)
                 }
             )
-            add_scheduler(device_ip, interval)
+            start_scheduler()
             _logger.info("scheduler created for device: %s", device_ip)
             add_msg_to_list(result, get_success_msg(request))
         return Response({"result": result}, status=status.HTTP_200_OK)
@@ -233,7 +335,6 @@ def discover_scheduler(request):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             ReDiscoveryConfig.objects.filter(device_ip=device_ip).delete()
-            remove_scheduler(device_ip)
             add_msg_to_list(result, get_success_msg(request))
             _logger.info("scheduler deleted for device: %s", device_ip)
         return Response({"result": result}, status=status.HTTP_200_OK)
@@ -252,7 +353,6 @@ def remove_schedular_and_state(device_ip: str):
     if device_ip:
         # Removing scheduler
         ReDiscoveryConfig.objects.filter(device_ip=device_ip).delete()
-        remove_scheduler(device_ip)
 
         # Removing state
         ORCABusyState.objects.filter(device_ip=device_ip).delete()
@@ -7,7 +7,6 @@ from orca_nw_lib.vlan import (
     get_vlan,
     del_vlan,
     config_vlan,
-    get_vlan_members,
     del_vlan_mem,
     remove_ip_from_vlan,
     remove_anycast_ip_from_vlan,
@@ -16,22 +15,70 @@ from orca_nw_lib.common import IFMode, VlanAutoState
 
 from log_manager.decorators import log_request
 from log_manager.logger import get_backend_logger
+from network.bulk_db import get_vlan_members_map
+from network.cache import cached_read
+from network.executor import run_per_device
+from network.fleet import fleet_response, is_fleet_request
+from network.interface import get_device_interfaces
+from network.noop import apply_changed_fields
+from network.ranges import RangeExpressionError, expand_member_items
 from network.util import (
     add_msg_to_list,
     get_failure_msg,
     get_success_msg,
 )
 from network.models import IPAvailability
+from network.etag import conditional_get
 
 
 _logger = get_backend_logger()
 
+# Config fields compared with the VLAN state before a PUT is applied.
+VLAN_COMPARED_FIELDS = (
+    "vlanid",
+    "enabled",
+    "description",
+    "mtu",
+    "autostate",
+    "ip_address",
+    "sag_ip_address",
+    "mem_ifs",
+)
+
+
+@cached_read("vlan")
+def get_vlan_list(device_ip: str, vlan_name: str = None, include_members: bool = True):
+    """
+    Returns the VLANs of a device, optionally with their member interfaces.
+
+    Members of all VLANs are fetched in one graph DB query and joined in memory,
+    instead of one members query per VLAN.
+
+    Args:
+        device_ip (str): The IP address of the device.
+        vlan_name (str, optional): The name of the VLAN.
+        include_members (bool, optional): Whether to add "mem_ifs" to each VLAN. Defaults to True.
+
+    Returns:
+        list or dict: VLAN details, same shape as returned by get_vlan.
+    """
+    data = get_vlan(device_ip, vlan_name)
+    if not data or not include_members:
+        return data
+    members = get_vlan_members_map(device_ip, vlan_name)
+    for vlan_data in data if isinstance(data, list) else [data]:
+        vlan_data["mem_ifs"] = members.get(vlan_data["name"], {})
+    return data
+
 
 @api_view(["GET", "PUT", "DELETE"])
 @log_request
+@conditional_get
 def vlan_config(request):
     """
     Generates the function comment for the given function body.
+    The keys of mem_ifs in PUT requests may be interface range or selector
+    expressions, e.g. "Ethernet0-Ethernet16 step 4", see network.ranges.
 
     Args:
         request (Request): The request object.
@@ -42,6 +89,12 @@ def vlan_config(request):
     result = []
     http_status = True
     if request.method == "GET":
+        vlan_name = request.GET.get("name", "")
+        include_members = request.GET.get("include_members", "true").lower() != "false"
+        if is_fleet_request(request):
+            return fleet_response(
+                request, lambda ip: get_vlan_list(ip, vlan_name, include_members)
+            )
         device_ip = request.GET.get("mgt_ip", "")
         if not device_ip:
             _logger.error("Required field device mgt_ip not found.")
@@ -49,32 +102,27 @@ def vlan_config(request):
                 {"status": "Required field device mgt_ip not found."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        vlan_name = request.GET.get("name", "")
-        data = get_vlan(device_ip, vlan_name)
-        for vlan_data in data if isinstance(data, list) else [data] if data else []:
-            vlan_data["mem_ifs"] = get_vlan_members(device_ip, vlan_data["name"])
-            for mem_if in vlan_data["mem_ifs"]:
-                vlan_data["mem_ifs"][mem_if] = str(vlan_data["mem_ifs"][mem_if])
-
+        data = get_vlan_list(device_ip, vlan_name, include_members)
         return (
             Response(data, status=status.HTTP_200_OK)
             if data
             else Response({}, status=status.HTTP_204_NO_CONTENT)
         )
 
-    for req_data in (
+    req_data_list = (
         request.data
         if isinstance(request.data, list)
         else [request.data] if request.data else []
-    ):
+    )
+    for req_data in req_data_list:
+        device_ip = req_data.get("mgt_ip", "")
+        if not device_ip:
+            _logger.error("Required field device mgt_ip not found.")
+            return Response(
+                {"status": "Required field device mgt_ip not found."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         if request.method == "PUT":
-            device_ip = req_data.get("mgt_ip", "")
-            if not device_ip:
-                _logger.error("Required field device mgt_ip not found.")
-                return Response(
-                    {"status": "Required field device mgt_ip not found."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
             vlan_name = req_data.get("name", "")
             if not vlan_name:
                 _logger.error("Required field device vlan_name not found.")
@@ -82,12 +130,6 @@ def vlan_config(request):
                     {"status": "Required field device vlan_name not found."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-
-            members = {}
-            if mem := req_data.get("mem_ifs"):
-                ## Update members dictionary with tagging mode Enum
-                for mem_if, tagging_mode in mem.items():
-                    members[mem_if] = IFMode.get_enum_from_str(tagging_mode)
             ip_addr_with_prefix = req_data.get("ip_address", None)
             anycast_ip_addr_with_prefix = req_data.get("sag_ip_address", None)
             if ip_addr_with_prefix:
@@ -109,76 +151,16 @@ def vlan_config(request):
                             {"status": str(e)},
                             status=status.HTTP_400_BAD_REQUEST,
                         )
-            try:
-                config_vlan(
-                    device_ip,
-                    vlan_name,
-                    enabled=req_data.get("enabled", None),
-                    descr=req_data.get("description", None),
-                    mtu=req_data.get("mtu", None),
-                    ip_addr_with_prefix=ip_addr_with_prefix,
-                    autostate=(
-                        auto_st
-                        if (
-                            auto_st := VlanAutoState.get_enum_from_str(
-                                req_data.get("autostate")
-                            )
-                        )
-                        else None
-                    ),
-                    anycast_addr=req_data.get("sag_ip_address", None),
-                    mem_ifs=members if members else None,
-                )
-                if ip_addr_with_prefix:
-                    # removing ip usage for vlan if usage for vlan exits
-                    IPAvailability.remove_usage_by_device_ip_and_used_in(device_ip, vlan_name)
-                    # adding ip usage
-                    IPAvailability.add_ip_usage(ip=ip_addr_with_prefix, device_ip=device_ip, used_in=vlan_name)
-                if anycast_ip_addr_with_prefix:
-                    # anycast ip is list so can be updated without removing ip usage.
-                    for ip in anycast_ip_addr_with_prefix:
-                        IPAvailability.add_ip_usage(ip=ip, device_ip=device_ip, used_in=vlan_name)
-                add_msg_to_list(result, get_success_msg(request))
-                _logger.info("Successfully configured VLAN: %s", vlan_name)
-            except Exception as err:
-                add_msg_to_list(result, get_failure_msg(err, request))
-                http_status = http_status and False
-                _logger.error("Failed to configure VLAN: %s", vlan_name)
-
-        elif request.method == "DELETE":
-            device_ip = req_data.get("mgt_ip", "")
-            if not device_ip:
-                _logger.error("Required field device mgt_ip not found.")
-                return Response(
-                    {"status": "Required field device mgt_ip not found."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-            vlan_name = req_data.get("name", "")
-            if vlan_name:
-                if members := req_data.get("mem_ifs"):
-                    ## Update members dictionary with tagging mode Enum
-                    for mem_if, tagging_mode in members.items():
-                        try:
-                            del_vlan_mem(
-                                device_ip,
-                                vlan_name,
-                                mem_if,
-                            )
-                            add_msg_to_list(result, get_success_msg(request))
-                            _logger.info("Successfully deleted VLAN member: %s", mem_if)
-                        except Exception as err:
-                            add_msg_to_list(result, get_failure_msg(err, request))
-                            http_status = http_status and False
-                            _logger.error("Failed to delete VLAN member: %s", mem_if)
-            try:
-                del_vlan(device_ip, vlan_name)
-                IPAvailability.remove_usage_by_device_ip_and_used_in(device_ip, vlan_name)
-                add_msg_to_list(result, get_success_msg(request))
-                _logger.info("Successfully deleted VLAN: %s", vlan_name)
-            except Exception as err:
-                add_msg_to_list(result, get_failure_msg(err, request))
-                http_status = http_status and False
-                _logger.error("Failed to delete VLAN: %s", vlan_name)
+
+    if request.method == "PUT":
+        try:
+            req_data_list = expand_member_items(req_data_list, get_device_interfaces)
+        except RangeExpressionError as err:
+            _logger.error(str(err))
+            return Response({"status": str(err)}, status=status.HTTP_400_BAD_REQUEST)
+        result, http_status = run_per_device(request, req_data_list, _config_vlan)
+    elif request.method == "DELETE":
+        result, http_status = run_per_device(request, req_data_list, _delete_vlan)
 
     return Response(
         {"result": result},
@@ -188,6 +170,132 @@ def vlan_config(request):
     )
 
 
+def _config_vlan(request, req_data, result) -> bool:
+    """
+    Applies the VLAN config of one validated PUT request item, without the
+    fields the VLAN already has.
+
+    Args:
+        request (Request): The request object.
+        req_data (dict): The request item.
+        result (list): The list the messages of the item are added to.
+
+    Returns:
+        bool: True if the VLAN was configured or had no changes.
+    """
+    return apply_changed_fields(
+        request,
+        req_data,
+        result,
+        # The graph DB state, not the cached response.
+        lambda item: get_vlan_list.__wrapped__(item.get("mgt_ip"), item.get("name")),
+        VLAN_COMPARED_FIELDS,
+        _set_vlan_config,
+    )
+
+
+def _set_vlan_config(request, req_data, result) -> bool:
+    """
+    Applies the VLAN config of one request item.
+
+    Args:
+        request (Request): The request object.
+        req_data (dict): The request item.
+        result (list): The list the messages of the item are added to.
+
+    Returns:
+        bool: True if the VLAN was configured.
+    """
+    device_ip = req_data.get("mgt_ip")
+    vlan_name = req_data.get("name")
+    members = {}
+    if mem := req_data.get("mem_ifs"):
+        ## Update members dictionary with tagging mode Enum
+        for mem_if, tagging_mode in mem.items():
+            members[mem_if] = IFMode.get_enum_from_str(tagging_mode)
+    ip_addr_with_prefix = req_data.get("ip_address", None)
+    anycast_ip_addr_with_prefix = req_data.get("sag_ip_address", None)
+    try:
+        config_vlan(
+            device_ip,
+            vlan_name,
+            enabled=req_data.get("enabled", None),
+            descr=req_data.get("description", None),
+            mtu=req_data.get("mtu", None),
+            ip_addr_with_prefix=ip_addr_with_prefix,
+            autostate=(
+                auto_st
+                if (
+                    auto_st := VlanAutoState.get_enum_from_str(
+                        req_data.get("autostate")
+                    )
+                )
+                else None
+            ),
+            anycast_addr=req_data.get("sag_ip_address", None),
+            mem_ifs=members if members else None,
+        )
+        if ip_addr_with_prefix:
+            # removing ip usage for vlan if usage for vlan exits
+            IPAvailability.remove_usage_by_device_ip_and_used_in(device_ip, vlan_name)
+            # adding ip usage
+            IPAvailability.add_ip_usage(ip=ip_addr_with_prefix, device_ip=device_ip, used_in=vlan_name)
+        if anycast_ip_addr_with_prefix:
+            # anycast ip is list so can be updated without removing ip usage.
+            for ip in anycast_ip_addr_with_prefix:
+                IPAvailability.add_ip_usage(ip=ip, device_ip=device_ip, used_in=vlan_name)
+        add_msg_to_list(result, get_success_msg(request))
+        _logger.info("Successfully configured VLAN: %s", vlan_name)
+        return True
+    except Exception as err:
+        add_msg_to_list(result, get_failure_msg(err, request))
+        _logger.error("Failed to configure VLAN: %s", vlan_name)
+        return False
+
+
+def _delete_vlan(request, req_data, result) -> bool:
+    """
+    Deletes the VLAN members and the VLAN of one validated DELETE request item.
+
+    Args:
+        request (Request): The request object.
+        req_data (dict): The request item.
+        result (list): The list the messages of the item are added to.
+
+    Returns:
+        bool: True if the VLAN and its members were deleted.
+    """
+    device_ip = req_data.get("mgt_ip")
+    vlan_name = req_data.get("name", "")
+    succeeded = True
+    if vlan_name:
+        if members := req_data.get("mem_ifs"):
+            ## Update members dictionary with tagging mode Enum
+            for mem_if, tagging_mode in members.items():
+                try:
+                    del_vlan_mem(
+                        device_ip,
+                        vlan_name,
+                        mem_if,
+                    )
+                    add_msg_to_list(result, get_success_msg(request))
+                    _logger.info("Successfully deleted VLAN member: %s", mem_if)
+                except Exception as err:
+                    add_msg_to_list(result, get_failure_msg(err, request))
+                    succeeded = False
+                    _logger.error("Failed to delete VLAN member: %s", mem_if)
+    try:
+        del_vlan(device_ip, vlan_name)
+        IPAvailability.remove_usage_by_device_ip_and_used_in(device_ip, vlan_name)
+        add_msg_to_list(result, get_success_msg(request))
+        _logger.info("Successfully deleted VLAN: %s", vlan_name)
+    except Exception as err:
+        add_msg_to_list(result, get_failure_msg(err, request))
+        succeeded = False
+        _logger.error("Failed to delete VLAN: %s", vlan_name)
+    return succeeded
+
+
 @api_view(["DELETE"])
 @log_request
 def remove_vlan_ip_address(request):
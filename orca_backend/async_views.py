@@ -0,0 +1,127 @@
+"""
+Async adapters of the sync DRF views for the ASGI deployment.
+
+The views call orca_nw_lib, which blocks on gNMI and graph DB round trips. With
+settings.ORCA_ASYNC_VIEWS enabled, every view is wrapped in an async view that
+runs it on a bounded, managed thread pool, so that the event loop keeps serving
+other requests while slow switches answer, and the number of threads blocked on
+devices is bounded for the whole process.
+
+Streaming responses are iterated on a separate pool, as a server-sent events
+client holds its thread for the lifetime of the connection.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.urls import URLPattern, URLResolver
+
+_pools = {}
+_pools_lock = threading.Lock()
+_DONE = object()
+
+
+def _get_pool(name: str, max_workers: int) -> ThreadPoolExecutor:
+    if name not in _pools:
+        with _pools_lock:
+            if name not in _pools:
+                _pools[name] = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix=f"orca_{name}"
+                )
+    return _pools[name]
+
+
+def get_view_pool() -> ThreadPoolExecutor:
+    return _get_pool("async_view", settings.ORCA_ASYNC_VIEW_MAX_WORKERS)
+
+
+def get_stream_pool() -> ThreadPoolExecutor:
+    return _get_pool("async_stream", settings.ORCA_ASYNC_STREAM_MAX_WORKERS)
+
+
+def _run_view(view, request, args, kwargs):
+    # Pool threads are not part of the request cycle, which closes stale DB
+    # connections of the request thread only.
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if callable(getattr(response, "render", None)) and not getattr(response, "is_rendered", True):
+            response = response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_view(view):
+    """
+    Wraps a sync view in an async view running it on the managed view pool.
+    The attributes of the view, e.g. csrf_exempt set by DRF, are kept.
+
+    Args:
+        view (callable): The sync view.
+
+    Returns:
+        callable: The async view.
+    """
+
+    @functools.wraps(view)
+    async def _view(request, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            get_view_pool(),
+            functools.partial(context.run, _run_view, view, request, args, kwargs),
+        )
+
+    return _view
+
+
+def async_urlpatterns(urlpatterns: list) -> list:
+    """
+    Replaces the views of the URL patterns, including included URL confs,
+    with async_view wrappers.
+
+    Args:
+        urlpatterns (list): The URL patterns.
+
+    Returns:
+        list: The same URL patterns.
+    """
+    for pattern in urlpatterns:
+        if isinstance(pattern, URLResolver):
+            async_urlpatterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and not asyncio.iscoroutinefunction(pattern.callback):
+            pattern.callback = async_view(pattern.callback)
+    return urlpatterns
+
+
+async def iterate_in_pool(iterable):
+    """
+    Async iterator over a sync iterable, fetching every item on the stream pool.
+    Closes the sync iterator when the client disconnects.
+    """
+    iterator = iter(iterable)
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            item = await loop.run_in_executor(get_stream_pool(), next, iterator, _DONE)
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await loop.run_in_executor(get_stream_pool(), close)
+
+
+def streaming_content(iterable):
+    """
+    Returns the iterable as content of a StreamingHttpResponse for the
+    deployment mode: unchanged for WSGI, as async iterator for ASGI, as Django
+    would otherwise consume a sync iterator entirely before sending it.
+    """
+    return iterate_in_pool(iterable) if settings.ORCA_ASYNC_VIEWS else iterable
@@ -16,6 +16,15 @@ app.config_from_object(f'django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 
+# Tasks started by other tasks or by the rediscovery scheduler, not recorded as
+# PENDING when sent and not listed with the celery tasks in the logs.
+INTERNAL_TASKS = (
+    "orca_setup.tasks.discovery_shard_task",
+    "orca_setup.tasks.aggregate_discovery_task",
+    "network.tasks.rediscovery_task",
+)
+
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
@@ -29,6 +38,11 @@ def cancel_task(task_id):
         task_id: The ID of the task to be cancelled.
     """
     app.control.revoke(task_id, terminate=True, signal="SIGKILL")
+    # Subtasks of a discovery_task, see orca_setup.tasks.
+    from celery.result import GroupResult
+    shards = GroupResult.restore(f"{task_id}:shards", app=app)
+    if shards is not None:
+        shards.revoke(terminate=True, signal="SIGKILL")
 
 
 @signals.worker_init.connect
@@ -0,0 +1,103 @@
+"""
+Fast JSON encoding and decoding for DRF, using orjson when it is installed and
+the standard library json module otherwise.
+
+The request body is parsed at most once: parse_request_body stores the parsed
+body on the Django request, and FastJSONParser returns it instead of parsing
+the stream again. Middlewares reading the body before the view use it too.
+"""
+import json
+
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_BODY_ATTR = "_orca_json_body"
+_encoder = JSONEncoder()
+
+
+def dumps(data, sort_keys: bool = False) -> bytes:
+    """
+    Serializes data to JSON bytes. Types unknown to orjson, e.g. Decimal or
+    QuerySet, and datetimes, whose format differs in orjson, are converted as by
+    the DRF JSON encoder.
+    """
+    if orjson is not None:
+        option = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        )
+        return orjson.dumps(data, default=_encoder.default, option=option)
+    return json.dumps(
+        data, cls=JSONEncoder, ensure_ascii=False, sort_keys=sort_keys, separators=(",", ":")
+    ).encode()
+
+
+def loads(content):
+    """
+    Deserializes JSON bytes or str. Raises ValueError if the content is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def parse_request_body(request):
+    """
+    Returns the parsed JSON body of a Django request, parsing it on first use only.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+
+    Returns:
+        The parsed body, or None if the body is empty.
+
+    Raises:
+        ValueError: If the body is not valid JSON.
+    """
+    if not hasattr(request, _BODY_ATTR):
+        try:
+            setattr(request, _BODY_ATTR, loads(request.body) if request.body else None)
+        except ValueError as err:
+            setattr(request, _BODY_ATTR, err)
+    body = getattr(request, _BODY_ATTR)
+    if isinstance(body, ValueError):
+        raise body
+    return body
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSON renderer using orjson. Indented output, as requested by the browsable
+    API, is left to the DRF renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSON parser using orjson, reusing the body parsed by parse_request_body.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = (parser_context or {}).get("request")
+        http_request = getattr(request, "_request", None)
+        try:
+            if http_request is not None and hasattr(http_request, _BODY_ATTR):
+                return parse_request_body(http_request)
+            return loads(stream.read())
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
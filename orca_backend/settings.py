@@ -13,6 +13,8 @@ import os
 
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -67,11 +69,14 @@ MIDDLEWARE = [
     ##Added
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'state_manager.middleware.BlockPutMiddleware'
+    'state_manager.middleware.IdempotencyMiddleware',
+    'state_manager.middleware.BlockPutMiddleware',
+    'network.middleware.CacheInvalidationMiddleware',
 ]
 
 #Added
 CORS_ORIGIN_ALLOW_ALL = True
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
 
 
 ROOT_URLCONF = "orca_backend.urls"
@@ -93,6 +98,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "orca_backend.wsgi.application"
+ASGI_APPLICATION = "orca_backend.asgi.application"
 
 
 # Database
@@ -154,6 +160,15 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'orca_backend.fast_json.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'orca_backend.fast_json.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
@@ -168,3 +183,136 @@ CELERY_TASK_STORE_EAGER_RESULT = False
 CELERY_TASK_EAGER_PROPAGATES_EXCEPTIONS = False
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 CELERY_BROKER_CONNECTION_RETRY = True
+
+# Devices discovered by one subtask of orca_setup.tasks.discovery_task. The
+# subtasks run as a celery chord, spread over the workers. The links between
+# devices are only discovered within a subtask, so 0, the default, discovers
+# all devices of a request in one subtask.
+ORCA_DISCOVERY_SHARD_SIZE = int(os.environ.get("ORCA_DISCOVERY_SHARD_SIZE", 0))
+
+# Rediscovery of the devices configured with the discover/schedule endpoint.
+# The scheduler runs in every web process started with runserver, or with
+# AUTOSTART; only the process holding the leader lease starts discoveries.
+# BACKEND "redis" enqueues the discoveries as celery tasks and is safe with
+# several processes; "memory" runs them in the process and is for a single one.
+ORCA_REDISCOVERY = {
+    "BACKEND": os.environ.get("ORCA_REDISCOVERY_BACKEND", "redis"),
+    "REDIS_URL": os.environ.get("ORCA_REDISCOVERY_REDIS_URL", CELERY_BROKER_URL),
+    "AUTOSTART": os.environ.get("ORCA_REDISCOVERY_AUTOSTART", "false").lower() == "true",
+    # Seconds between two checks for due devices.
+    "TICK": int(os.environ.get("ORCA_REDISCOVERY_TICK", 15)),
+    # Maximum number of rediscoveries running at the same time.
+    "MAX_CONCURRENT": int(os.environ.get("ORCA_REDISCOVERY_MAX_CONCURRENT", 4)),
+    # Maximum offset of the due time of a device, in seconds.
+    "JITTER": int(os.environ.get("ORCA_REDISCOVERY_JITTER", 60)),
+    # Seconds after which a rediscovery is no longer considered running.
+    "RUN_TTL": 60 * 60,
+    # Factors applied to the adaptive interval of a device with min_interval and
+    # max_interval, after a rediscovery which changed its data, or did not.
+    "SHRINK_FACTOR": float(os.environ.get("ORCA_REDISCOVERY_SHRINK_FACTOR", 0.5)),
+    "GROW_FACTOR": float(os.environ.get("ORCA_REDISCOVERY_GROW_FACTOR", 1.5)),
+}
+
+# Maximum number of devices read concurrently when a GET request asks for
+# several devices (mgt_ip given more than once, comma separated or "all").
+ORCA_FLEET_MAX_WORKERS = int(os.environ.get("ORCA_FLEET_MAX_WORKERS", 16))
+
+# Read-through cache of the per-device network GET endpoints.
+# BACKEND is one of "redis", "memory" or "none". "redis" is shared by the web
+# processes and the celery workers, so that the invalidations of discoveries and
+# writes reach every process. "memory" is only for a single web process without
+# celery workers.
+# SETTLE_TIME is the number of seconds the cache is bypassed for a device after
+# a write or discovery, while gNMI subscription updates reach the graph DB.
+ORCA_RESPONSE_CACHE = {
+    "BACKEND": os.environ.get("ORCA_RESPONSE_CACHE_BACKEND", "redis"),
+    "MAX_ENTRIES": int(os.environ.get("ORCA_RESPONSE_CACHE_MAX_ENTRIES", 1024)),
+    "TTL": int(os.environ.get("ORCA_RESPONSE_CACHE_TTL", 60)),
+    "SETTLE_TIME": int(os.environ.get("ORCA_RESPONSE_CACHE_SETTLE_TIME", 30)),
+    "REDIS_URL": os.environ.get("ORCA_RESPONSE_CACHE_REDIS_URL", CELERY_BROKER_URL),
+}
+
+# Server-sent state change events of devices.
+ORCA_EVENTS = {
+    # "memory" dispatches events within the process, "redis" over redis pubsub
+    # to all web processes. Use redis when running more than one web process.
+    "BACKEND": os.environ.get("ORCA_EVENTS_BACKEND", "memory"),
+    "REDIS_URL": os.environ.get("ORCA_EVENTS_REDIS_URL", CELERY_BROKER_URL),
+    "CHANNEL": "orca_events",
+    # Seconds between two reads of the watched features of a device.
+    "POLL_INTERVAL": float(os.environ.get("ORCA_EVENTS_POLL_INTERVAL", 2)),
+    # Seconds without events after which a keepalive comment is sent.
+    "KEEPALIVE": float(os.environ.get("ORCA_EVENTS_KEEPALIVE", 15)),
+    # Events buffered per client before events are dropped.
+    "QUEUE_SIZE": 1000,
+}
+
+# Maximum number of concurrent feature reads of the device snapshot endpoint,
+# shared by all snapshot requests of the process.
+ORCA_SNAPSHOT_MAX_WORKERS = int(os.environ.get("ORCA_SNAPSHOT_MAX_WORKERS", 32))
+
+# Maximum number of devices configured concurrently by list-bodied PUT/DELETE
+# requests, shared by all requests of the process. Items of the same device
+# are always applied one after the other.
+ORCA_WRITE_MAX_WORKERS = int(os.environ.get("ORCA_WRITE_MAX_WORKERS", 8))
+
+# Maximum number of concurrent feature discoveries of discover_by_feature,
+# shared by all requests of the process.
+ORCA_DISCOVERY_MAX_WORKERS = int(os.environ.get("ORCA_DISCOVERY_MAX_WORKERS", 16))
+
+# Single-flight of discoveries: a discovery of a device, or of a feature of a
+# device, started while the same one is running waits for it and gets its
+# result. BACKEND is "redis", joining the discoveries of all web processes and
+# celery workers, e.g. of the UI, the rediscovery tasks and the discovery tasks,
+# or "memory", only joining the discoveries of the process.
+# LEASE_TTL bounds the seconds a discovery is considered running, RESULT_TTL
+# the seconds its result is kept for the waiting processes.
+ORCA_SINGLE_FLIGHT = {
+    "BACKEND": os.environ.get("ORCA_SINGLE_FLIGHT_BACKEND", "redis"),
+    "REDIS_URL": os.environ.get("ORCA_SINGLE_FLIGHT_REDIS_URL", CELERY_BROKER_URL),
+    "LEASE_TTL": int(os.environ.get("ORCA_SINGLE_FLIGHT_LEASE_TTL", 60 * 60)),
+    "RESULT_TTL": 5 * 60,
+    "POLL_INTERVAL": 0.5,
+}
+
+# Serve the network views as async views running on a managed thread pool.
+# Enable only when served by an ASGI server, e.g.
+#   uvicorn orca_backend.asgi:application --host 0.0.0.0 --port 8000
+ORCA_ASYNC_VIEWS = os.environ.get("ORCA_ASYNC_VIEWS", "false").lower() == "true"
+# Maximum number of views blocked on devices at the same time.
+ORCA_ASYNC_VIEW_MAX_WORKERS = int(os.environ.get("ORCA_ASYNC_VIEW_MAX_WORKERS", 64))
+# Maximum number of concurrent streamed responses (NDJSON, server-sent events).
+ORCA_ASYNC_STREAM_MAX_WORKERS = int(os.environ.get("ORCA_ASYNC_STREAM_MAX_WORKERS", 256))
+
+# Recorded responses of mutating requests with an Idempotency-Key header.
+# BACKEND is one of "memory", "redis" or "none". Use "redis" when running more
+# than one web process. TTL is the number of seconds a response is kept,
+# LOCK_TTL the number of seconds a key stays reserved by a request in progress.
+ORCA_IDEMPOTENCY = {
+    "BACKEND": os.environ.get("ORCA_IDEMPOTENCY_BACKEND", "memory"),
+    "MAX_ENTRIES": int(os.environ.get("ORCA_IDEMPOTENCY_MAX_ENTRIES", 10000)),
+    "TTL": int(os.environ.get("ORCA_IDEMPOTENCY_TTL", 24 * 60 * 60)),
+    "LOCK_TTL": int(os.environ.get("ORCA_IDEMPOTENCY_LOCK_TTL", 10 * 60)),
+    "REDIS_URL": os.environ.get("ORCA_IDEMPOTENCY_REDIS_URL", CELERY_BROKER_URL),
+}
+
+# Queued mode of state_manager.middleware.BlockPutMiddleware. When ENABLED, a
+# PUT to a busy device waits in the FIFO write queue of the device instead of
+# being rejected with 409.
+ORCA_WRITE_QUEUE = {
+    "ENABLED": os.environ.get("ORCA_WRITE_QUEUE_ENABLED", "false").lower() == "true",
+    # Requests queued per device, further requests get 429.
+    "MAX_DEPTH": int(os.environ.get("ORCA_WRITE_QUEUE_MAX_DEPTH", 32)),
+    # Seconds a request waits for its response before getting 202 with a ticket.
+    "WAIT_TIMEOUT": float(os.environ.get("ORCA_WRITE_QUEUE_WAIT_TIMEOUT", 30)),
+    # Seconds between checks of a device busy with a discovery or another process.
+    "POLL_INTERVAL": 0.5,
+    # Seconds a request waits for a device busy with a discovery or another
+    # process, e.g. left busy by a crashed process, before getting 409.
+    "BUSY_TIMEOUT": float(os.environ.get("ORCA_WRITE_QUEUE_BUSY_TIMEOUT", 300)),
+    # Retry-After of the 429 response, in seconds.
+    "RETRY_AFTER": 5,
+    # Seconds and number of finished tickets kept for the ticket status endpoint.
+    "TICKET_TTL": 60 * 60,
+    "MAX_TICKETS": 10000,
+}
@@ -0,0 +1,106 @@
+"""
+Streaming responses: lists as newline delimited JSON (NDJSON), and server-sent events.
+
+A list GET view opts in with renderer_classes(STREAMING_RENDERERS). When the
+client sends "Accept: application/x-ndjson", the view returns ndjson_response
+with a generator of rows, which are serialized and sent one at a time instead
+of building and serializing the whole list in memory.
+"""
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+
+from orca_backend.async_views import streaming_content
+from orca_backend.fast_json import dumps
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _dump_row(row) -> bytes:
+    return dumps(row) + b"\n"
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renders non-streamed responses of NDJSON requests, e.g. errors,
+    as one JSON object per line.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        return b"".join(_dump_row(row) for row in rows)
+
+
+STREAMING_RENDERERS = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+
+
+def wants_ndjson(request) -> bool:
+    """
+    Checks if the client negotiated a streamed NDJSON response.
+
+    Args:
+        request (Request): The request object.
+
+    Returns:
+        bool: True if the accepted renderer is the NDJSON renderer.
+    """
+    renderer = getattr(request, "accepted_renderer", None)
+    return renderer is not None and renderer.media_type == NDJSON_MEDIA_TYPE
+
+
+def ndjson_response(rows) -> StreamingHttpResponse:
+    """
+    Returns a streaming response serializing the rows lazily, one per line.
+
+    Args:
+        rows (iterable): The rows, each one JSON serializable.
+
+    Returns:
+        StreamingHttpResponse: The response.
+    """
+    response = StreamingHttpResponse(
+        streaming_content(_dump_row(row) for row in rows), content_type=NDJSON_MEDIA_TYPE
+    )
+    # Disable proxy buffering, so that rows reach the client as they are produced.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Renders non-streamed responses of server-sent event requests, e.g. errors,
+    as a single event.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return b"event: error\ndata: " + dumps(data) + b"\n\n"
+
+
+def event_stream_response(messages) -> StreamingHttpResponse:
+    """
+    Returns a streaming response of server-sent event messages.
+
+    Args:
+        messages (iterable): The formatted event messages.
+
+    Returns:
+        StreamingHttpResponse: The response.
+    """
+    response = StreamingHttpResponse(
+        streaming_content(messages), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
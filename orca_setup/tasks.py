@@ -1,10 +1,14 @@
 import ipaddress
 
-from celery import signals, shared_task, states, chain
+from celery import signals, shared_task, states, chain, chord, uuid
+from celery.result import GroupResult
+from django.conf import settings
 from django_celery_results.models import TaskResult
-from orca_nw_lib.discovery import discover_device
 
 from log_manager.logger import get_backend_logger
+from orca_backend.celery import INTERNAL_TASKS
+from network.cache import invalidate_device
+from network.discovery import discover_devices
 from orca_nw_lib.setup import switch_image_on_device, install_image_on_device, scan_networks
 import multiprocessing
 
@@ -62,10 +66,17 @@ def switch_image_task(device_ip, image_name, **kwargs):
     return result
 
 
-@shared_task(track_started=True, trail=True, acks_late=True)
-def discovery_task(device_ips, **kwargs):
+@shared_task(bind=True, track_started=True, trail=True, acks_late=True)
+def discovery_task(self, device_ips, **kwargs):
     """
     Performs discovery on a device.
+
+    The devices are discovered by a chord of discovery_shard_task subtasks, of
+    settings.ORCA_DISCOVERY_SHARD_SIZE devices each, so that they are spread
+    over the workers. By default a single subtask discovers all devices
+    together, with the links between them. The task is replaced by the chord, whose callback,
+    aggregate_discovery_task, sets the result of the task. The subtasks are
+    saved as the group "<task id>:shards", which cancel_task revokes as well.
     Args:
         device_ips (list): A list of device IPs.
     """
@@ -79,16 +90,93 @@ def discovery_task(device_ips, **kwargs):
         except Exception as err:
             result.append({"message": "failed", "details": f"Failed to discover devices from config. Error: {err}"})
             _logger.error("Failed to discover devices from config. Error: %s", err)
+        finally:
+            invalidate_device()
+    shards = make_discovery_shards(device_ips, settings.ORCA_DISCOVERY_SHARD_SIZE)
+    if not shards:
+        return aggregate_discovery_task([discover_shard(device_ips)], result=result)
+    subtasks = [discovery_shard_task.si(device_ips=shard).set(task_id=uuid()) for shard in shards]
+    GroupResult(
+        get_shards_group_id(self.request.id),
+        [self.app.AsyncResult(subtask.id) for subtask in subtasks],
+        app=self.app,
+    ).save()
+    return self.replace(chord(subtasks, aggregate_discovery_task.s(result=result)))
+
+
+@shared_task(track_started=True, trail=True, acks_late=True)
+def discovery_shard_task(device_ips, **kwargs):
+    """
+    Discovers a shard of the devices of a discovery_task.
+    Args:
+        device_ips (list): A list of device IPs.
+    Returns:
+        list: The reports of the failed discoveries, see discover_shard.
+    """
+    return discover_shard(device_ips)
+
+
+@shared_task(track_started=True, trail=True, acks_late=True)
+def aggregate_discovery_task(shard_results, result=None, **kwargs):
+    """
+    Chord callback of a discovery_task, combining the results of its shards.
+    Args:
+        shard_results (list): The results of the discovery_shard_task subtasks.
+        result (list): The result of the discovery from config, if any.
+    Returns:
+        list: The result of the discovery_task.
+    """
+    result = list(result or [])
+    reports = [report for shard_result in shard_results for report in shard_result]
+    if reports:
+        result.append({"message": "failed", "details": reports})
+    else:
+        result.append({"message": "success", "details": "Discovery successful."})
+    return result
+
+
+def get_shards_group_id(task_id: str) -> str:
+    """
+    Returns the id of the group of the discovery_shard_task subtasks of a discovery_task.
+    """
+    return f"{task_id}:shards"
+
+
+def make_discovery_shards(device_ips, shard_size: int) -> list:
+    """
+    Splits the devices into shards of at most shard_size devices. The links
+    between devices of different shards are not discovered.
+    Args:
+        device_ips (list): A list of device IPs.
+        shard_size (int): The maximum number of devices of a shard, 0 for a
+            single shard of all devices.
+    Returns:
+        list: The shards, empty if the devices are not given by address.
+    """
+    if not device_ips or not all(device_ips):
+        return []
+    device_ips = list(dict.fromkeys(device_ips))
+    if shard_size <= 0:
+        return [device_ips]
+    return [device_ips[i:i + shard_size] for i in range(0, len(device_ips), shard_size)]
+
+
+def discover_shard(device_ips) -> list:
+    """
+    Discovers the devices of a shard together.
+    Args:
+        device_ips (list): A list of device IPs.
+    Returns:
+        list: The reports of the failed discoveries, empty if all succeeded.
+    """
     try:
-        discovery_result = discover_device(device_ips=device_ips)
-        if discovery_result:
-            result.append({"message": "failed", "details": discovery_result})
-        else:
-            result.append({"message": "success", "details": "Discovery successful."})
+        return discover_devices(device_ips)
     except Exception as err:
-        result.append({"message": "failed", "details": str(err)})
-        _logger.error("Failed to discover devices. Error: %s", err)
-    return result
+        _logger.error("Failed to discover devices %s. Error: %s", device_ips, err)
+        return [str(err)]
+    finally:
+        for device_ip in device_ips or []:
+            invalidate_device(device_ip)
 
 
 @shared_task(track_started=True, trail=True, acks_late=True)
@@ -124,12 +212,15 @@ def task_sent(**kwargs):
     dispatch. Celery's task state transitions are typically tracked only after
     task execution begins, so this manual entry of `PENDING` allows the system
     to recognize that the task is awaiting processing right from dispatch.
+    Internal subtasks, see orca_backend.celery.INTERNAL_TASKS, are not recorded.
 
     Args:
         kwargs (dict): The keyword arguments passed to the signal handler,
                        containing details about the dispatched task, such as
                        task_id and task arguments.
     """
+    if kwargs.get("sender") in INTERNAL_TASKS:
+        return
     task_kwargs = kwargs["kwargs"]
     TaskResult.objects.store_result(
         task_id=kwargs["task_id"],
@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from orca_setup import tasks
+from orca_setup.tasks import aggregate_discovery_task, discover_shard, make_discovery_shards, task_sent
+
+
+class TestDiscoveryShards(SimpleTestCase):
+
+    def test_make_discovery_shards(self):
+        ips = ["10.0.0.1", "10.0.0.2", "10.0.0.1", "10.0.0.3"]
+        self.assertEqual(make_discovery_shards(ips, 1), [["10.0.0.1"], ["10.0.0.2"], ["10.0.0.3"]])
+        self.assertEqual(make_discovery_shards(ips, 2), [["10.0.0.1", "10.0.0.2"], ["10.0.0.3"]])
+        self.assertEqual(make_discovery_shards(ips, 0), [["10.0.0.1", "10.0.0.2", "10.0.0.3"]])
+        self.assertEqual(make_discovery_shards([], 1), [])
+        self.assertEqual(make_discovery_shards([None], 1), [])
+
+    def test_discover_shard(self):
+        with mock.patch.object(tasks, "discover_devices", return_value=["unreachable"]) as discover, \
+                mock.patch.object(tasks, "invalidate_device") as invalidate:
+            reports = discover_shard(["10.0.0.1", "10.0.0.2"])
+        discover.assert_called_once_with(["10.0.0.1", "10.0.0.2"])
+        self.assertEqual(reports, ["unreachable"])
+        self.assertEqual(invalidate.call_count, 2)
+
+    def test_default_shard_keeps_links(self):
+        # The links between devices are discovered by discover_devices only
+        # among the devices of one call, i.e. one shard.
+        ips = ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+        shards = make_discovery_shards(ips, settings.ORCA_DISCOVERY_SHARD_SIZE)
+        with mock.patch.object(tasks, "discover_devices", return_value=[]) as discover, \
+                mock.patch.object(tasks, "invalidate_device"):
+            for shard in shards:
+                discover_shard(shard)
+        discover.assert_called_once_with(ips)
+
+    def test_aggregate_keeps_result_shape(self):
+        config = [{"message": "success", "details": "Discovery from config successful."}]
+        self.assertEqual(
+            aggregate_discovery_task([[], []], result=config),
+            config + [{"message": "success", "details": "Discovery successful."}],
+        )
+        self.assertEqual(
+            aggregate_discovery_task([["unreachable"], []]),
+            [{"message": "failed", "details": ["unreachable"]}],
+        )
+
+    def test_internal_tasks_not_recorded(self):
+        with mock.patch.object(tasks.TaskResult, "objects") as objects:
+            task_sent(sender="orca_setup.tasks.discovery_shard_task", task_id="a", kwargs={})
+            objects.store_result.assert_not_called()
+            task_sent(sender="orca_setup.tasks.discovery_task", task_id="b", kwargs={})
+            objects.store_result.assert_called_once()
@@ -7,7 +7,7 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from log_manager.logger import get_backend_logger
-from orca_backend.celery import cancel_task
+from orca_backend.celery import INTERNAL_TASKS, cancel_task
 from orca_setup.tasks import discovery_task, create_tasks
 
 _logger = get_backend_logger()
@@ -24,7 +24,10 @@ def celery_task(request):
         if task_id:
             data = _modify_celery_results(TaskResult.objects.get_task(task_id=task_id))
         else:
-            data = [_modify_celery_results(i) for i in TaskResult.objects.all()]
+            data = [
+                _modify_celery_results(i)
+                for i in TaskResult.objects.exclude(task_name__in=INTERNAL_TASKS)
+            ]
         return (
             Response(data, status=status.HTTP_200_OK)
             if data
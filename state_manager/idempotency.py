@@ -0,0 +1,202 @@
+"""
+Stored outcomes of mutating requests sent with an Idempotency-Key header.
+
+Keys are scoped by the authenticated user, and requests which are not
+authenticated are neither recorded nor replayed. A key is reserved when its
+first request starts and the response is recorded
+when it completes. A retry with the same key gets the recorded response without
+running the view again, so that the config is not applied to the device twice.
+Records expire after a TTL; the memory store also holds at most MAX_ENTRIES
+records and drops the least recently used ones.
+"""
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+MUTATING_METHODS = ("PUT", "POST", "PATCH", "DELETE")
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def make_key(request, key: str, user) -> str:
+    """
+    Returns the store key of an idempotency key, scoped by user, method and path.
+    """
+    return f"{user.pk}:{request.method}:{request.path}:{key}"
+
+
+def authenticate(request):
+    """
+    Authenticates the request with the authentication classes of the REST
+    framework, as the view will, since the middleware runs before them.
+
+    Returns:
+        The user, or None if the request is not authenticated.
+    """
+    from rest_framework.exceptions import APIException
+    from rest_framework.request import Request
+    from rest_framework.settings import api_settings
+
+    drf_request = Request(request)
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            user_auth = authentication_class().authenticate(drf_request)
+        except APIException:
+            return None
+        if user_auth is not None:
+            return user_auth[0]
+    return None
+
+
+def fingerprint(request) -> str:
+    return hashlib.sha256(request.body).hexdigest()
+
+
+class MemoryIdempotencyStore:
+    """
+    In-process store with LRU and TTL eviction.
+    """
+
+    def __init__(self, max_entries: int, ttl: int, lock_ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str, request_fingerprint: str):
+        """
+        Reserves the key for a request.
+
+        Returns:
+            dict: None if the key was reserved, otherwise the record of the key,
+            which has no status while its request is in progress.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= now:
+                self._entries.move_to_end(key)
+                return entry[1]
+            self._entries[key] = (now + self.lock_ttl, {"fingerprint": request_fingerprint})
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return None
+
+    def save(self, key: str, record: dict):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, record)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def release(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisIdempotencyStore:
+    """
+    Redis store, shared by all web processes. Records expire after the TTL.
+    """
+
+    def __init__(self, url: str, ttl: int, lock_ttl: int, prefix: str = "orca_idempotency"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.prefix = prefix
+
+    def _encode(self, record: dict) -> str:
+        record = dict(record)
+        if "content" in record:
+            record["content"] = base64.b64encode(record["content"]).decode()
+        return json.dumps(record)
+
+    @staticmethod
+    def _decode(value) -> dict:
+        record = json.loads(value)
+        if "content" in record:
+            record["content"] = base64.b64decode(record["content"])
+        return record
+
+    def reserve(self, key: str, request_fingerprint: str):
+        name = f"{self.prefix}:{key}"
+        value = self._encode({"fingerprint": request_fingerprint})
+        if self.client.set(name, value, nx=True, ex=self.lock_ttl):
+            return None
+        existing = self.client.get(name)
+        if existing is None:
+            # Expired in between, reserve again.
+            return self.reserve(key, request_fingerprint)
+        return self._decode(existing)
+
+    def save(self, key: str, record: dict):
+        self.client.set(f"{self.prefix}:{key}", self._encode(record), ex=self.ttl)
+
+    def release(self, key: str):
+        self.client.delete(f"{self.prefix}:{key}")
+
+    def clear(self):
+        for name in self.client.scan_iter(f"{self.prefix}:*"):
+            self.client.delete(name)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_idempotency_store():
+    """
+    Returns the store configured by settings.ORCA_IDEMPOTENCY, or None if
+    idempotency keys are disabled.
+    """
+    global _store
+    config = settings.ORCA_IDEMPOTENCY
+    if config["BACKEND"] == "none":
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if config["BACKEND"] == "redis":
+                    _store = RedisIdempotencyStore(
+                        config["REDIS_URL"], config["TTL"], config["LOCK_TTL"]
+                    )
+                else:
+                    _store = MemoryIdempotencyStore(
+                        config["MAX_ENTRIES"], config["TTL"], config["LOCK_TTL"]
+                    )
+    return _store
+
+
+def is_recordable(response) -> bool:
+    """
+    Returns True if the response is the outcome of the request. Busy devices
+    (409), rejections for load (429) and server errors are not recorded, so
+    that a retry with the same key runs the request again.
+    """
+    return (
+        not getattr(response, "streaming", False)
+        and response.status_code < 500
+        and response.status_code not in (409, 429)
+    )
+
+
+def make_record(request_fingerprint: str, response) -> dict:
+    return {
+        "fingerprint": request_fingerprint,
+        "status": response.status_code,
+        "content": bytes(response.content),
+        "content_type": response.get("Content-Type", "application/json"),
+    }
@@ -1,48 +1,328 @@
-import json
+import threading
+import time
 
-from django.http import JsonResponse
-from django.urls import resolve
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, JsonResponse
+from django.urls import resolve, reverse
 from rest_framework import status
+
+from log_manager.logger import get_backend_logger
+from orca_backend.fast_json import parse_request_body
+from state_manager.idempotency import (
+    IDEMPOTENCY_HEADER,
+    MUTATING_METHODS,
+    REPLAYED_HEADER,
+    authenticate,
+    fingerprint,
+    get_idempotency_store,
+    is_recordable,
+    make_key,
+    make_record,
+)
 from state_manager.models import ORCABusyState, State
+from state_manager.write_queue import (
+    WriteQueueFullError,
+    get_write_queue,
+    prefers_async,
+)
+
+_logger = get_backend_logger()
+
+
+class IdempotencyMiddleware:
+    """
+    Middleware returning the recorded response of a mutating request sent again
+    with the same Idempotency-Key header, without running the view again.
+    Placed before BlockPutMiddleware, so that a replay does not lock the device.
+    Only authenticated requests are replayed, with keys scoped by the user.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        store, key = self._get_key(request)
+        if key is None:
+            return self.get_response(request)
+        request_fingerprint = fingerprint(request)
+        replay = self._reserve(store, key, request_fingerprint)
+        if replay is not None:
+            return replay
+        try:
+            response = self.get_response(request)
+        except Exception:
+            store.release(key)
+            raise
+        self._finish(store, key, request_fingerprint, response)
+        return response
+
+    async def __acall__(self, request):
+        store, key = await sync_to_async(self._get_key)(request)
+        if key is None:
+            return await self.get_response(request)
+        request_fingerprint = fingerprint(request)
+        replay = await sync_to_async(self._reserve)(store, key, request_fingerprint)
+        if replay is not None:
+            return replay
+        try:
+            response = await self.get_response(request)
+        except Exception:
+            await sync_to_async(store.release)(key)
+            raise
+        await sync_to_async(self._finish)(store, key, request_fingerprint, response)
+        return response
+
+    @staticmethod
+    def _get_key(request):
+        """
+        Returns the idempotency store and the store key of the request, or None
+        as key if the request is not mutating, has no Idempotency-Key header or
+        is not authenticated.
+        """
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if request.method not in MUTATING_METHODS or not key:
+            return None, None
+        store = get_idempotency_store()
+        if store is None:
+            return None, None
+        user = authenticate(request)
+        if user is None:
+            return None, None
+        return store, make_key(request, key, user)
+
+    @staticmethod
+    def _reserve(store, key, request_fingerprint):
+        """
+        Reserves the key for the request.
+
+        Returns:
+            HttpResponse: The recorded response if the key was already used,
+            or an error response if the key was used with another body or its
+            request is still in progress. None if the key was reserved.
+        """
+        try:
+            record = store.reserve(key, request_fingerprint)
+        except Exception as err:
+            # Without the store the request runs as without the header.
+            _logger.error("Failed to reserve idempotency key %s: %s", key, err)
+            return None
+        if record is None:
+            return None
+        if record.get("fingerprint") != request_fingerprint:
+            return JsonResponse(
+                {"result": f"{IDEMPOTENCY_HEADER} was used with a different request body."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        if "status" not in record:
+            return JsonResponse(
+                {"result": f"A request with the same {IDEMPOTENCY_HEADER} is in progress."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        response = HttpResponse(
+            record["content"], status=record["status"], content_type=record["content_type"]
+        )
+        response[REPLAYED_HEADER] = "true"
+        return response
+
+    @staticmethod
+    def _finish(store, key, request_fingerprint, response):
+        try:
+            if is_recordable(response):
+                store.save(key, make_record(request_fingerprint, response))
+            else:
+                store.release(key)
+        except Exception as err:
+            _logger.error("Failed to record idempotency key %s: %s", key, err)
 
 
 class BlockPutMiddleware:
     """
     Middleware to block PUT operations when device discovery or feature discovery is in progress.
+
+    With settings.ORCA_WRITE_QUEUE enabled, a PUT to a busy device is not
+    rejected with 409 but waits in the FIFO write queue of the device, see
+    state_manager.write_queue. The request gets its response if it completes
+    within WAIT_TIMEOUT seconds, or right away with "Prefer: respond-async",
+    and a 202 with a ticket otherwise. A full queue is rejected with 429.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.method == 'PUT' and settings.ORCA_WRITE_QUEUE["ENABLED"]:
+            return self._call_queued(request, self.get_response)
         # Check if it's a PUT request and if discovery is in progress
         if request.method == 'PUT':
-            ip_next_state = self._get_device_state(request)
-            for ip, next_state in ip_next_state.items():
-                state_obj = ORCABusyState.objects.filter(device_ip=ip).first()
-                if state_obj:
-                    return JsonResponse(
-                        {"result": State.get_enum_from_str(state_obj.state).value},
-                        status=status.HTTP_409_CONFLICT,
-                    )
-
-                self._update_state(device_ip=ip, state=next_state)
+            ip_next_state, conflict = self._acquire(request)
+            if conflict:
+                return conflict
             try:
                 response = self.get_response(request)
             except Exception as e:
                 response = JsonResponse(
                     {"result": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
-
-            # Reset state to AVAILABLE after processing
-            for ip in ip_next_state.keys():
-                ORCABusyState.objects.filter(device_ip=ip).delete()
+            self._release(ip_next_state)
         else:
             # Continue processing the request if not PUT
             response = self.get_response(request)
 
         return response
 
+    async def __acall__(self, request):
+        if request.method != 'PUT':
+            return await self.get_response(request)
+        if settings.ORCA_WRITE_QUEUE["ENABLED"]:
+            # Created on the event loop, the ticket thread runs the rest of the
+            # middleware chain on it.
+            get_response = async_to_sync(self.get_response)
+            return await sync_to_async(self._call_queued, thread_sensitive=False)(
+                request, get_response
+            )
+        ip_next_state, conflict = await sync_to_async(self._acquire)(request)
+        if conflict:
+            return conflict
+        try:
+            response = await self.get_response(request)
+        except Exception as e:
+            response = JsonResponse(
+                {"result": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        await sync_to_async(self._release)(ip_next_state)
+        return response
+
+    def _acquire(self, request):
+        """
+        Marks the devices of the request busy.
+
+        Parameters:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            tuple: The dictionary of device_ip and next state, and a 409 response
+            if one of the devices is busy, None otherwise.
+        """
+        ip_next_state = self._get_device_state(request)
+        state_obj = self._try_acquire(ip_next_state)
+        if state_obj:
+            return ip_next_state, JsonResponse(
+                {"result": State.get_enum_from_str(state_obj.state).value},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return ip_next_state, None
+
+    def _try_acquire(self, ip_next_state):
+        """
+        Marks the devices busy if none of them is busy.
+
+        Parameters:
+            ip_next_state (dict): The dictionary of device_ip and next state.
+
+        Returns:
+            ORCABusyState: The state of a busy device, None if the devices were marked busy.
+        """
+        for ip in ip_next_state.keys():
+            state_obj = ORCABusyState.objects.filter(device_ip=ip).first()
+            if state_obj:
+                return state_obj
+        for ip, next_state in ip_next_state.items():
+            self._update_state(device_ip=ip, state=next_state)
+        return None
+
+    def _call_queued(self, request, get_response):
+        """
+        Queues the request in the write queues of its devices and runs it on a
+        ticket thread when it is its turn.
+
+        Parameters:
+            request (HttpRequest): The HTTP request object.
+            get_response (callable): The sync rest of the middleware chain.
+
+        Returns:
+            HttpResponse: The response of the request, 202 with the ticket if
+            the request has not completed in time, or 429 if a queue is full.
+        """
+        config = settings.ORCA_WRITE_QUEUE
+        ip_next_state = self._get_device_state(request)
+        queue = get_write_queue()
+        try:
+            ticket = queue.enqueue(ip_next_state)
+        except WriteQueueFullError as err:
+            _logger.error(str(err))
+            response = JsonResponse({"result": str(err)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+            response["Retry-After"] = str(config["RETRY_AFTER"])
+            return response
+        threading.Thread(
+            target=self._run_ticket,
+            args=(request, get_response, ticket, ip_next_state),
+            name=f"orca_write_queue_{ticket.id}",
+            daemon=True,
+        ).start()
+        if ticket.done.wait(0 if prefers_async(request) else config["WAIT_TIMEOUT"]):
+            if ticket.response is None:
+                return JsonResponse(
+                    {"result": "Failed to run the queued request."},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+            return ticket.response
+        response = JsonResponse(queue.ticket_status(ticket), status=status.HTTP_202_ACCEPTED)
+        response["Location"] = reverse("write_ticket", args=[ticket.id])
+        return response
+
+    def _run_ticket(self, request, get_response, ticket, ip_next_state):
+        config = settings.ORCA_WRITE_QUEUE
+        queue = get_write_queue()
+        response = None
+        try:
+            queue.wait_turn(ticket)
+            # Devices can still be busy with a discovery or a write of another process.
+            deadline = time.monotonic() + config["BUSY_TIMEOUT"]
+            while state_obj := self._try_acquire(ip_next_state):
+                if time.monotonic() >= deadline:
+                    _logger.error("Queued request %s timed out on busy devices.", ticket.id)
+                    response = JsonResponse(
+                        {"result": State.get_enum_from_str(state_obj.state).value},
+                        status=status.HTTP_409_CONFLICT,
+                    )
+                    return
+                time.sleep(config["POLL_INTERVAL"])
+            try:
+                response = get_response(request)
+            except Exception as e:
+                response = JsonResponse(
+                    {"result": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+            finally:
+                self._release(ip_next_state)
+        except Exception as err:
+            _logger.error("Failed to run queued request %s: %s", ticket.id, err)
+        finally:
+            queue.finish(ticket, response)
+            connections.close_all()
+
+    @staticmethod
+    def _release(ip_next_state):
+        # Reset state to AVAILABLE after processing
+        for ip in ip_next_state.keys():
+            ORCABusyState.objects.filter(device_ip=ip).delete()
+
     @staticmethod
     def _update_state(device_ip, state):
         """
@@ -72,7 +352,7 @@ class BlockPutMiddleware:
             dict: A dictionary with device_ip as key and next state as value
         """
         url_name = resolve(request.path_info).url_name
-        body = json.loads(request.body)
+        body = parse_request_body(request)
         data = body if isinstance(body, list) else [body]
         result = {}
         if url_name == "discover":
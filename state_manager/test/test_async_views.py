@@ -0,0 +1,45 @@
+import asyncio
+import threading
+
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import path
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+
+from orca_backend.async_views import async_urlpatterns, async_view, iterate_in_pool
+
+
+class TestAsyncViews(SimpleTestCase):
+
+    def test_async_view_runs_on_pool(self):
+        @api_view(["GET"])
+        def view(request):
+            return Response({"thread": threading.current_thread().name})
+
+        wrapped = async_view(view)
+        self.assertTrue(asyncio.iscoroutinefunction(wrapped))
+        self.assertTrue(wrapped.csrf_exempt)
+        response = asyncio.run(wrapped(RequestFactory().get("/")))
+        self.assertEqual(response.status_code, 200)
+        # Rendered on the pool, not on the event loop.
+        self.assertTrue(response.is_rendered)
+        self.assertTrue(response.data["thread"].startswith("orca_async_view"))
+
+    def test_async_urlpatterns(self):
+        patterns = async_urlpatterns([path("a", lambda request: None)])
+        self.assertTrue(asyncio.iscoroutinefunction(patterns[0].callback))
+
+    def test_iterate_in_pool(self):
+        closed = []
+
+        def rows():
+            try:
+                yield from range(3)
+            finally:
+                closed.append(True)
+
+        async def consume():
+            return [i async for i in iterate_in_pool(rows())]
+
+        self.assertEqual(asyncio.run(consume()), [0, 1, 2])
+        self.assertEqual(closed, [True])
@@ -0,0 +1,54 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from orca_backend import fast_json
+from orca_backend.fast_json import FastJSONParser, FastJSONRenderer, parse_request_body
+
+
+class TestFastJson(SimpleTestCase):
+
+    def test_body_parsed_once(self):
+        request = RequestFactory().put(
+            "/interfaces", b'[{"mgt_ip": "10.10.10.10"}]', content_type="application/json"
+        )
+        with mock.patch.object(fast_json, "loads", wraps=fast_json.loads) as loads:
+            body = parse_request_body(request)
+            self.assertIs(parse_request_body(request), body)
+            data = FastJSONParser().parse(
+                io.BytesIO(request.body), parser_context={"request": Request(request)}
+            )
+        self.assertIs(data, body)
+        self.assertEqual(loads.call_count, 1)
+
+    def test_invalid_body(self):
+        request = RequestFactory().put("/interfaces", b"{", content_type="application/json")
+        with self.assertRaises(ValueError):
+            parse_request_body(request)
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(
+                io.BytesIO(request.body), parser_context={"request": Request(request)}
+            )
+
+    def test_render(self):
+        self.assertEqual(
+            fast_json.loads(FastJSONRenderer().render({"mtu": 9100, "speed": Decimal("1.5"), 1: None})),
+            {"mtu": 9100, "speed": 1.5, "1": None},
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_render_as_drf(self):
+        data = {
+            "last_discovered": datetime.datetime(2026, 1, 1, 12, 0, 0, 123456, tzinfo=datetime.timezone.utc),
+            "date": datetime.date(2026, 1, 1),
+            "speed": Decimal("1.5"),
+            "task_id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
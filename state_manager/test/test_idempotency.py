@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.http import JsonResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from state_manager import middleware
+from state_manager.idempotency import MemoryIdempotencyStore
+from state_manager.middleware import IdempotencyMiddleware
+
+
+class TestIdempotency(SimpleTestCase):
+
+    def setUp(self):
+        self.store = MemoryIdempotencyStore(max_entries=2, ttl=60, lock_ttl=60)
+        patcher = mock.patch.object(middleware, "get_idempotency_store", return_value=self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = SimpleNamespace(pk=1)
+        patcher = mock.patch.object(middleware, "authenticate", side_effect=lambda request: self.user)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.calls = []
+
+    def view(self, request):
+        self.calls.append(request)
+        return JsonResponse({"result": len(self.calls)}, status=self.status)
+
+    def put(self, key, body=b'[{"mgt_ip": "10.10.10.10", "mtu": 9100}]'):
+        request = RequestFactory().put(
+            "/interfaces", body, content_type="application/json", HTTP_IDEMPOTENCY_KEY=key
+        )
+        return IdempotencyMiddleware(self.view)(request)
+
+    def test_replay(self):
+        self.status = 200
+        first = self.put("a")
+        second = self.put("a")
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(self.put("a", b"[]").status_code, 422)
+        self.put("b")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_busy_not_recorded(self):
+        self.status = 409
+        self.put("a")
+        self.put("a")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_in_progress(self):
+        self.status = 200
+        self.store.reserve("1:PUT:/interfaces:a", "other")
+        self.assertEqual(self.put("a").status_code, 422)
+        with mock.patch.object(middleware, "fingerprint", return_value="other"):
+            self.assertEqual(self.put("a").status_code, 409)
+        self.assertEqual(self.calls, [])
+
+    def test_bounded_retention(self):
+        self.status = 200
+        for key in ("a", "b", "c"):
+            self.put(key)
+        self.put("a")
+        self.assertEqual(len(self.calls), 4)
+
+    def test_scoped_by_user(self):
+        self.status = 200
+        self.put("a")
+        self.user = SimpleNamespace(pk=2)
+        self.assertNotIn("Idempotent-Replayed", self.put("a"))
+        self.user = None
+        self.assertNotIn("Idempotent-Replayed", self.put("a"))
+        self.assertNotIn("Idempotent-Replayed", self.put("a"))
+        self.assertEqual(len(self.calls), 4)
@@ -0,0 +1,70 @@
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from django.http import JsonResponse
+from django.test import SimpleTestCase, override_settings
+
+from state_manager import middleware
+from state_manager.middleware import BlockPutMiddleware
+from state_manager.models import State
+from state_manager.write_queue import DeviceWriteQueue, WriteQueueFullError, WriteTicket
+
+
+class TestWriteQueue(SimpleTestCase):
+
+    def setUp(self):
+        self.queue = DeviceWriteQueue(max_depth=2, ticket_ttl=60, max_tickets=10)
+
+    def test_fifo_per_device(self):
+        first = self.queue.enqueue(["10.0.0.1", "10.0.0.2"])
+        second = self.queue.enqueue(["10.0.0.2"])
+        third = self.queue.enqueue(["10.0.0.3"])
+        self.assertEqual(
+            [self.queue.position(t) for t in (first, second, third)], [0, 1, 0]
+        )
+        with self.assertRaises(WriteQueueFullError):
+            self.queue.enqueue(["10.0.0.2"])
+
+        order = []
+
+        def run(ticket):
+            self.queue.wait_turn(ticket)
+            order.append(ticket)
+            self.queue.finish(ticket, JsonResponse({"result": []}))
+
+        thread = threading.Thread(target=run, args=(second,))
+        thread.start()
+        thread.join(0.1)
+        self.assertTrue(thread.is_alive())
+        run(first)
+        thread.join(1)
+        self.assertEqual(order, [first, second])
+        self.assertEqual(self.queue.depth("10.0.0.2"), 0)
+        self.assertEqual(self.queue.depth("10.0.0.3"), 1)
+
+    def test_ticket_status(self):
+        ticket = self.queue.enqueue(["10.0.0.1"])
+        self.assertEqual(self.queue.ticket_status(ticket)["status"], WriteTicket.QUEUED)
+        self.queue.wait_turn(ticket)
+        self.queue.finish(ticket, JsonResponse({"result": ["ok"]}))
+        data = self.queue.ticket_status(self.queue.get_ticket(ticket.id))
+        self.assertEqual(data["status"], WriteTicket.DONE)
+        self.assertEqual(data["response"], {"status": 200, "body": {"result": ["ok"]}})
+
+    @override_settings(ORCA_WRITE_QUEUE={"POLL_INTERVAL": 0, "BUSY_TIMEOUT": 0})
+    def test_busy_timeout(self):
+        ticket = self.queue.enqueue(["10.0.0.1"])
+        busy = SimpleNamespace(state=str(State.DISCOVERY_IN_PROGRESS))
+        get_response = mock.Mock()
+        with mock.patch.object(middleware, "get_write_queue", return_value=self.queue), \
+                mock.patch.object(BlockPutMiddleware, "_try_acquire", return_value=busy), \
+                mock.patch.object(BlockPutMiddleware, "_release") as release:
+            BlockPutMiddleware(get_response)._run_ticket(
+                None, get_response, ticket, {"10.0.0.1": State.CONFIG_IN_PROGRESS}
+            )
+        get_response.assert_not_called()
+        release.assert_not_called()
+        self.assertEqual(ticket.status, WriteTicket.DONE)
+        self.assertEqual(ticket.response.status_code, 409)
+        self.assertEqual(self.queue.depth("10.0.0.1"), 0)
@@ -2,5 +2,6 @@ from django.urls import path
 from state_manager import views
 
 urlpatterns = [
+    path("queue/<str:ticket_id>", views.get_write_ticket, name="write_ticket"),
     path("<device_ip>", views.get_orca_state, name="orca_state"),
 ]
@@ -5,6 +5,7 @@ from rest_framework.response import Response
 
 from log_manager.logger import get_backend_logger
 from state_manager.models import ORCABusyState
+from state_manager.write_queue import get_write_queue
 
 _logger = get_backend_logger()
 
@@ -34,3 +35,27 @@ def get_orca_state(request, device_ip):
             if data
             else Response({}, status=status.HTTP_204_NO_CONTENT)
         )
+
+
+@api_view(["GET"])
+def get_write_ticket(request, ticket_id):
+    """
+    A function that returns the status of a queued PUT request, with its
+    position in the write queues of its devices, and its response once done.
+
+    Parameters:
+        request (HttpRequest): The HTTP request object.
+        ticket_id (str): The ticket of the request.
+
+    Returns:
+        Response: The HTTP response object with the ticket status, or 404 if the
+        ticket is unknown or expired.
+    """
+    queue = get_write_queue()
+    ticket = queue.get_ticket(ticket_id)
+    if ticket is None:
+        return Response(
+            {"result": f"Ticket {ticket_id} not found."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    return Response(queue.ticket_status(ticket), status=status.HTTP_200_OK)
@@ -0,0 +1,192 @@
+"""
+Per-device FIFO queues of the PUT requests, for the queued mode of
+BlockPutMiddleware.
+
+Every PUT request gets a ticket, which is appended to the queue of each device
+of the request at once. A ticket runs when it is first in the queues of all its
+devices, so requests of a device run in arrival order, and requests spanning
+several devices cannot deadlock. A queue holds at most MAX_DEPTH tickets; a
+request to a device with a full queue is rejected.
+
+The queues are per web process. Devices busy with a discovery, or a write of
+another process, are still detected with ORCABusyState; a ticket waits at most
+BUSY_TIMEOUT seconds for them.
+
+The times of the tickets are wall clock times, as returned by the ticket status.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+from django.conf import settings
+
+from orca_backend.fast_json import loads
+
+
+class WriteQueueFullError(Exception):
+    """
+    Raised when the write queue of a device of the request is full.
+    """
+
+    def __init__(self, device_ip: str):
+        super().__init__(f"Write queue of device {device_ip} is full.")
+        self.device_ip = device_ip
+
+
+class WriteTicket:
+    """
+    A queued PUT request.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+
+    def __init__(self, devices: list):
+        self.id = uuid.uuid4().hex
+        self.devices = devices
+        self.created = time.time()
+        self.finished = None
+        self.status = self.QUEUED
+        self.response = None
+        self.done = threading.Event()
+
+
+class DeviceWriteQueue:
+    """
+    The write queues of all devices, and the tickets of the recent requests.
+    """
+
+    def __init__(self, max_depth: int, ticket_ttl: int, max_tickets: int):
+        self.max_depth = max_depth
+        self.ticket_ttl = ticket_ttl
+        self.max_tickets = max_tickets
+        self._queues = {}
+        self._tickets = OrderedDict()
+        self._cond = threading.Condition()
+
+    def enqueue(self, devices) -> WriteTicket:
+        """
+        Appends a new ticket to the queues of the devices.
+
+        Raises:
+            WriteQueueFullError: If the queue of one of the devices is full.
+        """
+        ticket = WriteTicket(sorted(devices))
+        with self._cond:
+            for device_ip in ticket.devices:
+                if len(self._queues.get(device_ip, ())) >= self.max_depth:
+                    raise WriteQueueFullError(device_ip)
+            for device_ip in ticket.devices:
+                self._queues.setdefault(device_ip, deque()).append(ticket)
+            self._tickets[ticket.id] = ticket
+            self._prune_tickets()
+        return ticket
+
+    def _is_first(self, ticket: WriteTicket) -> bool:
+        return all(self._queues[device_ip][0] is ticket for device_ip in ticket.devices)
+
+    def wait_turn(self, ticket: WriteTicket):
+        """
+        Blocks until the ticket is first in the queues of all its devices.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._is_first(ticket))
+            ticket.status = WriteTicket.RUNNING
+
+    def finish(self, ticket: WriteTicket, response=None):
+        """
+        Removes the ticket from the queues and records the response.
+        """
+        with self._cond:
+            for device_ip in ticket.devices:
+                queue = self._queues.get(device_ip)
+                if queue is not None:
+                    try:
+                        queue.remove(ticket)
+                    except ValueError:
+                        pass
+                    if not queue:
+                        del self._queues[device_ip]
+            ticket.response = response
+            ticket.status = WriteTicket.DONE
+            ticket.finished = time.time()
+            self._cond.notify_all()
+        ticket.done.set()
+
+    def position(self, ticket: WriteTicket) -> int:
+        """
+        Returns the number of tickets before the ticket in the longest of its
+        queues, 0 for a running or finished ticket.
+        """
+        with self._cond:
+            positions = [
+                self._queues[device_ip].index(ticket)
+                for device_ip in ticket.devices
+                if ticket in self._queues.get(device_ip, ())
+            ]
+        return max(positions, default=0)
+
+    def get_ticket(self, ticket_id: str):
+        with self._cond:
+            self._prune_tickets()
+            return self._tickets.get(ticket_id)
+
+    def depth(self, device_ip: str) -> int:
+        with self._cond:
+            return len(self._queues.get(device_ip, ()))
+
+    def _prune_tickets(self):
+        expired = time.time() - self.ticket_ttl
+        for ticket_id, ticket in list(self._tickets.items()):
+            if len(self._tickets) <= self.max_tickets and (
+                ticket.finished is None or ticket.finished > expired
+            ):
+                continue
+            if ticket.status == WriteTicket.DONE:
+                del self._tickets[ticket_id]
+
+    def ticket_status(self, ticket: WriteTicket) -> dict:
+        """
+        Returns the status of the ticket, with the response of a finished ticket.
+        """
+        data = {
+            "ticket": ticket.id,
+            "status": ticket.status,
+            "devices": ticket.devices,
+            "position": self.position(ticket),
+            "created": ticket.created,
+        }
+        if ticket.status == WriteTicket.DONE and ticket.response is not None:
+            content = bytes(getattr(ticket.response, "content", b""))
+            try:
+                body = loads(content) if content else None
+            except ValueError:
+                body = content.decode(errors="replace")
+            data["response"] = {"status": ticket.response.status_code, "body": body}
+        return data
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_write_queue() -> DeviceWriteQueue:
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                config = settings.ORCA_WRITE_QUEUE
+                _queue = DeviceWriteQueue(
+                    config["MAX_DEPTH"], config["TICKET_TTL"], config["MAX_TICKETS"]
+                )
+    return _queue
+
+
+def prefers_async(request) -> bool:
+    """
+    Returns True if the client asked for an immediate 202 with a ticket, with
+    the header "Prefer: respond-async".
+    """
+    return "respond-async" in request.headers.get("Prefer", "").lower()